@@ -0,0 +1,329 @@
+#!/usr/bin/env python
+
+# Benchmarks parcelgen itself: generates synthetic descriptions of varying width
+# (props per class) and breadth (number of classes) in both json and yaml form,
+# then times each stage of generation separately, and whole batch_generate runs
+# over the scenario's directory without a cache and against an up to date one.
+#
+#   $ python benchmarks/bench_parcelgen.py -o results.json
+#   $ python benchmarks/bench_parcelgen.py --baseline results.json
+#
+# Each scenario runs in its own process so its peak memory can be measured.
+# The chain scenarios link their classes into a long chain of references with
+# small cycles along it, and fail the run unless whole batches scale linearly.
+
+import sys, os.path, json
+import argparse
+import multiprocessing
+import platform
+import resource
+import shutil
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+import parcelgen
+
+# Java type of each family parcelgen supports, with the yaml spelling if it differs
+TYPE_FAMILIES = [
+    ("boolean", "Boolean"),
+    ("byte", "byte"),
+    ("int", "Integer"),
+    ("long", "Long"),
+    ("float", "Float"),
+    ("double", "Double"),
+    ("String", "String"),
+    ("Date", "Date"),
+    ("Uri", "Url"),
+    ("int[]", "Integer[]"),
+    ("String[]", "String[]"),
+    ("List<String>", "List<String>"),
+    ("List<Nested>", "List<Nested>"),
+    ("ArrayList<Nested>", "Nested[]"),
+    ("Nested", "Nested"),
+    ("Money", "Money"),
+]
+SERIALIZABLES = ["Money"]
+
+WIDE_SIZES = [10, 100, 1000, 10000]
+MANY_SIZES = [1, 50, 500, 5000]
+MANY_PROPS = 20
+CHAIN_SIZES = [50, 500, 2000]
+# Classes per cycle in the chain scenarios: the last class of each block refers back to its first
+CHAIN_CYCLE = 10
+BATCH_STAGES = ["batch_generate", "batch_generate_cached"]
+STAGES = ["read_json", "read_yaml", "print_gen", "generate_json_reader", "generate_json_writer",
+          "batch_generate", "batch_generate_cached"]
+
+
+def synthetic_members(props):
+    """ Returns a list of (java type, yaml type, member name) spread over every type family. """
+    members = []
+    for i in xrange(props):
+        java_type, yaml_type = TYPE_FAMILIES[i % len(TYPE_FAMILIES)]
+        members.append((java_type, yaml_type, "field%d" % i))
+    return members
+
+def chain_members(index, classes):
+    """ Returns the members linking class index of a chain scenario to the next class and its block's first. """
+    members = []
+    if index + 1 < classes:
+        members.append(("Bench%d" % (index + 1), "Bench%d" % (index + 1), "next"))
+    if index % CHAIN_CYCLE == CHAIN_CYCLE - 1:
+        first = "Bench%d" % (index - CHAIN_CYCLE + 1)
+        members.append((first, first, "blockStart"))
+    return members
+
+def write_json_description(path, members):
+    props = {}
+    for java_type, _, name in members:
+        props.setdefault(java_type, []).append(name)
+    description = {
+        "package": "com.example.bench",
+        "do_json": True,
+        "do_json_writer": True,
+        "props": props,
+        "serializables": SERIALIZABLES,
+        "json_map": dict((name, "json_" + name) for _, _, name in members[::7]),
+        "json_blacklist": [name for _, _, name in members[3::11]],
+        "default_values": dict((name, "-1") for java_type, _, name in members if java_type == "int"),
+        "transient": [name for _, _, name in members[5::13]],
+    }
+    with open(path, 'w') as description_file:
+        json.dump(description, description_file, indent=2)
+
+def write_yaml_description(path, members):
+    lines = []
+    by_type = {}
+    for _, yaml_type, name in members:
+        by_type.setdefault(yaml_type, []).append(name)
+    for yaml_type in sorted(by_type):
+        lines.append("%s:" % yaml_type)
+        for name in by_type[yaml_type]:
+            lines.append("  - %s:" % parcelgen.camel_to_under(name))
+            lines.append("      desc: Synthetic property %s" % name)
+            lines.append("      ex: %s" % name)
+    with open(path, 'w') as description_file:
+        description_file.write("\n".join(lines) + "\n")
+
+def write_yaml_config(path, class_members):
+    config = {
+        "Target": {"default_package": "com.example.bench"},
+        "Config": {}
+    }
+    for class_name, members in class_members.iteritems():
+        config["Config"][class_name] = {
+            "do_json_writer": True,
+            "serializables": SERIALIZABLES,
+            "default_values": dict((name, "-1") for java_type, _, name in members
+                                   if java_type == "int"),
+        }
+    with open(path, 'w') as config_file:
+        json.dump(config, config_file) # json is a subset of yaml
+
+def timed(function, *args):
+    start = time.time()
+    result = function(*args)
+    return time.time() - start, result
+
+def run_scenario(scenario):
+    """ Generates and times one scenario. Runs in a child process. """
+    name, fmt, classes, props, repeat, linked = scenario
+    workdir = tempfile.mkdtemp(prefix="parcelgen-bench-")
+    try:
+        class_members = {}
+        paths = []
+        for i in xrange(classes):
+            class_name = "Bench%d" % i
+            members = synthetic_members(props)
+            if linked:
+                members += chain_members(i, classes)
+            class_members[class_name] = members
+            path = os.path.join(workdir, "%s.%s" % (class_name, fmt))
+            if fmt == "json":
+                write_json_description(path, members)
+            else:
+                write_yaml_description(path, members)
+            paths.append((class_name, path))
+        project = None
+        config_file = None
+        if fmt == "yaml":
+            config_file = os.path.join(workdir, "parcelgen.yaml.conf")
+            write_yaml_config(config_file, class_members)
+            project = parcelgen.Project(config_file, workdir)
+        output = os.path.join(workdir, "out")
+        os.makedirs(os.path.join(output, "com", "example", "bench"))
+        cache_file = os.path.join(workdir, "cache")
+
+        timings = dict((stage, None) for stage in STAGES)
+        read_stage = "read_" + fmt
+        for _ in xrange(repeat):
+            totals = dict((stage, 0.0) for stage in STAGES)
+            for class_name, path in paths:
+                if fmt == "json":
+                    elapsed, generator = timed(parcelgen.read_json, path)
+                else:
+                    elapsed, generator = timed(parcelgen.read_yaml, path, None, project)
+                totals[read_stage] += elapsed
+                elapsed, _ = timed(parcelgen.render, generator, 'print_gen', "_" + class_name)
+                totals["print_gen"] += elapsed
+                generator.tablevel = 1
+                elapsed, _ = timed(generator.generate_json_reader, generator.props)
+                totals["generate_json_reader"] += elapsed
+                generator.tablevel = 1
+                elapsed, _ = timed(generator.generate_json_writer, generator.props)
+                totals["generate_json_writer"] += elapsed
+            # Whole runs, which also resolve types, check diagnostics and write files
+            elapsed, _ = timed(lambda: parcelgen.batch_generate(workdir, output, config_file))
+            totals["batch_generate"] += elapsed
+            # Like --cache, which also keeps the type index; the first run fills both
+            cache = parcelgen.BuildCache(cache_file)
+            parcelgen.batch_generate(workdir, output, config_file, cache=cache, index=cache_file + ".types")
+            cache.save()
+            cache = parcelgen.BuildCache(cache_file)
+            elapsed, _ = timed(lambda: parcelgen.batch_generate(workdir, output, config_file, cache=cache,
+                                                                index=cache_file + ".types"))
+            totals["batch_generate_cached"] += elapsed
+            for stage in STAGES:
+                if stage.startswith("read_") and stage != read_stage:
+                    continue
+                if timings[stage] is None or totals[stage] < timings[stage]:
+                    timings[stage] = totals[stage]
+        return {
+            "scenario": name,
+            "format": fmt,
+            "classes": classes,
+            "props": props,
+            "timings": dict((stage, value) for stage, value in timings.iteritems()
+                            if value is not None),
+            "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
+    finally:
+        shutil.rmtree(workdir)
+
+def scenarios(wide_sizes, many_sizes, chain_sizes, repeat):
+    result = []
+    for fmt in ("json", "yaml"):
+        for props in wide_sizes:
+            result.append(("wide-%s-%d" % (fmt, props), fmt, 1, props, repeat, False))
+        for classes in many_sizes:
+            result.append(("many-%s-%d" % (fmt, classes), fmt, classes, MANY_PROPS, repeat, False))
+        for classes in chain_sizes:
+            result.append(("chain-%s-%d" % (fmt, classes), fmt, classes, MANY_PROPS, repeat, True))
+    return result
+
+def nonlinear(results, max_growth):
+    """
+    Returns a list of descriptions of every batch stage whose time per class in
+    the largest chain scenario of a format is more than max_growth times that
+    in the smallest, meaning whole batches don't scale linearly with classes.
+    """
+    chains = {}
+    for entry in results:
+        if entry["scenario"].startswith("chain-"):
+            chains.setdefault(entry["format"], []).append(entry)
+    problems = []
+    for fmt, entries in sorted(chains.iteritems()):
+        entries.sort(key=lambda entry: entry["classes"])
+        smallest, largest = entries[0], entries[-1]
+        if smallest is largest:
+            continue
+        for stage in BATCH_STAGES:
+            before = smallest["timings"][stage] / smallest["classes"]
+            after = largest["timings"][stage] / largest["classes"]
+            growth = after / max(before, 1e-9)
+            if growth > max_growth:
+                problems.append("%s %s: %.5fs per class with %d classes, %.5fs with %d (%.2fx)" % (
+                    fmt, stage, before, smallest["classes"], after, largest["classes"], growth))
+    return problems
+
+def compare(results, baseline, threshold, floor):
+    """
+    Returns a list of descriptions of every stage which got slower than
+    baseline by more than threshold (a ratio), ignoring timings below floor seconds.
+    """
+    previous = dict((entry["scenario"], entry) for entry in baseline["results"])
+    regressions = []
+    for entry in results:
+        old = previous.get(entry["scenario"])
+        if not old:
+            continue
+        for stage, elapsed in sorted(entry["timings"].iteritems()):
+            old_elapsed = old["timings"].get(stage)
+            if old_elapsed is None or max(elapsed, old_elapsed) < floor:
+                continue
+            ratio = elapsed / max(old_elapsed, 1e-9)
+            if ratio > threshold:
+                regressions.append("%s %s: %.4fs -> %.4fs (%.2fx)" % (
+                    entry["scenario"], stage, old_elapsed, elapsed, ratio))
+    return regressions
+
+def parse_sizes(value):
+    return [int(size) for size in value.split(",") if size]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks parcelgen's code generation.")
+    parser.add_argument('-o', '--output', help='Write results as json to this file')
+    parser.add_argument('--baseline', help='Compare results against a previous results file ' +
+        'and exit non-zero if any stage regressed')
+    parser.add_argument('--threshold', type=float, default=1.25, help='Slowdown ratio ' +
+        'counted as a regression (default 1.25)')
+    parser.add_argument('--floor', type=float, default=0.005, help='Ignore timings shorter ' +
+        'than this many seconds when comparing (default 0.005)')
+    parser.add_argument('--wide', type=parse_sizes, default=WIDE_SIZES, help='Comma separated ' +
+        'props per class for the single class scenarios')
+    parser.add_argument('--many', type=parse_sizes, default=MANY_SIZES, help='Comma separated ' +
+        'class counts for the many class scenarios')
+    parser.add_argument('--chain', type=parse_sizes, default=CHAIN_SIZES, help='Comma separated ' +
+        'class counts for the linked chain scenarios')
+    parser.add_argument('--max-growth', type=float, default=2.0, help='Growth in batch time ' +
+        'per class from the smallest to the largest chain scenario counted as nonlinear (default 2.0)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per scenario, the ' +
+        'fastest is reported')
+    parser.add_argument('--quick', action='store_true', help='Only run the small scenarios')
+    args = parser.parse_args()
+
+    wide_sizes, many_sizes, chain_sizes = args.wide, args.many, args.chain
+    if args.quick:
+        wide_sizes = [size for size in wide_sizes if size <= 1000]
+        many_sizes = [size for size in many_sizes if size <= 500]
+        chain_sizes = [size for size in chain_sizes if size <= 500]
+
+    pool = multiprocessing.Pool(1, maxtasksperchild=1)
+    results = []
+    try:
+        for result in pool.imap(run_scenario, scenarios(wide_sizes, many_sizes, chain_sizes, args.repeat)):
+            timings = " ".join("%s=%.4fs" % (stage, result["timings"][stage])
+                               for stage in STAGES if stage in result["timings"])
+            print "%-16s %s peak=%dKB" % (result["scenario"], timings, result["peak_rss_kb"])
+            sys.stdout.flush()
+            results.append(result)
+    finally:
+        pool.close()
+        pool.join()
+
+    document = {
+        "generator_version": parcelgen.GENERATOR_VERSION,
+        "python": platform.python_version(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(document, output, indent=1, sort_keys=True)
+
+    problems = nonlinear(results, args.max_growth)
+    for problem in problems:
+        print "NONLINEAR", problem
+
+    if args.baseline:
+        with open(args.baseline, 'rU') as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline, args.threshold, args.floor)
+        for regression in regressions:
+            print "REGRESSION", regression
+        if regressions:
+            sys.exit(1)
+        print "no regressions against %s" % args.baseline
+    if problems:
+        sys.exit(1)
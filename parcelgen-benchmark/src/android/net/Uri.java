@@ -0,0 +1,55 @@
+package android.net;
+
+import android.os.Parcel;
+import android.os.Parcelable;
+
+/**
+ * Plain JVM stand-in for Android's Uri, for running benchmarks of generated
+ * classes off device. It only holds the string it was parsed from.
+ */
+public final class Uri implements Parcelable {
+
+	private final String mUri;
+
+	private Uri(String uri) {
+		mUri = uri;
+	}
+
+	public static Uri parse(String uri) {
+		return new Uri(uri);
+	}
+
+	@Override
+	public String toString() {
+		return mUri;
+	}
+
+	@Override
+	public boolean equals(Object object) {
+		return object instanceof Uri && mUri.equals(((Uri) object).mUri);
+	}
+
+	@Override
+	public int hashCode() {
+		return mUri.hashCode();
+	}
+
+	public int describeContents() {
+		return 0;
+	}
+
+	public void writeToParcel(Parcel dest, int flags) {
+		dest.writeString(mUri);
+	}
+
+	public static final Parcelable.Creator<Uri> CREATOR = new Parcelable.Creator<Uri>() {
+
+		public Uri createFromParcel(Parcel source) {
+			return new Uri(source.readString());
+		}
+
+		public Uri[] newArray(int size) {
+			return new Uri[size];
+		}
+	};
+}
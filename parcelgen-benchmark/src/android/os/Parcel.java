@@ -0,0 +1,420 @@
+package android.os;
+
+import java.io.ByteArrayInputStream;
+import java.io.ByteArrayOutputStream;
+import java.io.IOException;
+import java.io.ObjectInputStream;
+import java.io.ObjectOutputStream;
+import java.io.Serializable;
+import java.lang.reflect.Field;
+import java.nio.ByteBuffer;
+import java.nio.ByteOrder;
+import java.util.ArrayList;
+import java.util.List;
+
+/**
+ * Plain JVM stand-in for Android's Parcel, for running benchmarks of generated
+ * classes off device. Values are laid out the way the native Parcel lays them
+ * out: little endian and padded to 4 bytes, with strings as UTF-16 preceded by
+ * their length, so sizes and copying costs are comparable. Only the methods
+ * generated code and the parcelgen runtime use are implemented.
+ */
+public final class Parcel {
+
+	private ByteBuffer mBuffer = ByteBuffer.allocate(256).order(ByteOrder.LITTLE_ENDIAN);
+	private int mDataSize;
+
+	private Parcel() {}
+
+	public static Parcel obtain() {
+		return new Parcel();
+	}
+
+	public void recycle() {
+		mBuffer.clear();
+		mDataSize = 0;
+	}
+
+	public int dataSize() {
+		return mDataSize;
+	}
+
+	public int dataPosition() {
+		return mBuffer.position();
+	}
+
+	public void setDataPosition(int position) {
+		mBuffer.position(position);
+	}
+
+	public byte[] marshall() {
+		byte[] bytes = new byte[mDataSize];
+		System.arraycopy(mBuffer.array(), 0, bytes, 0, mDataSize);
+		return bytes;
+	}
+
+	private void ensure(int bytes) {
+		int needed = mBuffer.position() + bytes;
+		if (needed > mBuffer.capacity()) {
+			ByteBuffer grown = ByteBuffer.allocate(Math.max(needed, mBuffer.capacity() * 2)).order(ByteOrder.LITTLE_ENDIAN);
+			System.arraycopy(mBuffer.array(), 0, grown.array(), 0, mDataSize);
+			grown.position(mBuffer.position());
+			mBuffer = grown;
+		}
+	}
+
+	private void wrote() {
+		mDataSize = Math.max(mDataSize, mBuffer.position());
+	}
+
+	public void writeInt(int value) {
+		ensure(4);
+		mBuffer.putInt(value);
+		wrote();
+	}
+
+	public int readInt() {
+		return mBuffer.position() + 4 <= mDataSize ? mBuffer.getInt() : 0;
+	}
+
+	public void writeLong(long value) {
+		ensure(8);
+		mBuffer.putLong(value);
+		wrote();
+	}
+
+	public long readLong() {
+		return mBuffer.position() + 8 <= mDataSize ? mBuffer.getLong() : 0;
+	}
+
+	public void writeFloat(float value) {
+		ensure(4);
+		mBuffer.putFloat(value);
+		wrote();
+	}
+
+	public float readFloat() {
+		return mBuffer.position() + 4 <= mDataSize ? mBuffer.getFloat() : 0;
+	}
+
+	public void writeDouble(double value) {
+		ensure(8);
+		mBuffer.putDouble(value);
+		wrote();
+	}
+
+	public double readDouble() {
+		return mBuffer.position() + 8 <= mDataSize ? mBuffer.getDouble() : 0;
+	}
+
+	public void writeByte(byte value) {
+		writeInt(value);
+	}
+
+	public byte readByte() {
+		return (byte) readInt();
+	}
+
+	public void writeString(String value) {
+		if (value == null) {
+			writeInt(-1);
+			return;
+		}
+		int length = value.length();
+		ensure(4 + ((length + 1) * 2 + 3 & ~3));
+		mBuffer.putInt(length);
+		for (int i = 0; i < length; i++) {
+			mBuffer.putChar(value.charAt(i));
+		}
+		mBuffer.putChar('\0');
+		if ((length & 1) == 0) {
+			mBuffer.putChar('\0');
+		}
+		wrote();
+	}
+
+	public String readString() {
+		int length = readInt();
+		if (length < 0) {
+			return null;
+		}
+		char[] chars = new char[length];
+		for (int i = 0; i < length; i++) {
+			chars[i] = mBuffer.getChar();
+		}
+		mBuffer.getChar();
+		if ((length & 1) == 0) {
+			mBuffer.getChar();
+		}
+		return new String(chars);
+	}
+
+	public void writeBooleanArray(boolean[] array) {
+		if (array == null) {
+			writeInt(-1);
+			return;
+		}
+		writeInt(array.length);
+		for (boolean value : array) {
+			writeInt(value ? 1 : 0);
+		}
+	}
+
+	public boolean[] createBooleanArray() {
+		int length = readInt();
+		if (length < 0) {
+			return null;
+		}
+		boolean[] array = new boolean[length];
+		for (int i = 0; i < length; i++) {
+			array[i] = readInt() != 0;
+		}
+		return array;
+	}
+
+	public void writeByteArray(byte[] array) {
+		if (array == null) {
+			writeInt(-1);
+			return;
+		}
+		writeInt(array.length);
+		ensure(array.length + 3 & ~3);
+		mBuffer.put(array);
+		mBuffer.position(mBuffer.position() + (-array.length & 3));
+		wrote();
+	}
+
+	public byte[] createByteArray() {
+		int length = readInt();
+		if (length < 0) {
+			return null;
+		}
+		byte[] array = new byte[length];
+		mBuffer.get(array);
+		mBuffer.position(mBuffer.position() + (-length & 3));
+		return array;
+	}
+
+	public void writeIntArray(int[] array) {
+		if (array == null) {
+			writeInt(-1);
+			return;
+		}
+		writeInt(array.length);
+		for (int value : array) {
+			writeInt(value);
+		}
+	}
+
+	public int[] createIntArray() {
+		int length = readInt();
+		if (length < 0) {
+			return null;
+		}
+		int[] array = new int[length];
+		for (int i = 0; i < length; i++) {
+			array[i] = readInt();
+		}
+		return array;
+	}
+
+	public void writeLongArray(long[] array) {
+		if (array == null) {
+			writeInt(-1);
+			return;
+		}
+		writeInt(array.length);
+		for (long value : array) {
+			writeLong(value);
+		}
+	}
+
+	public long[] createLongArray() {
+		int length = readInt();
+		if (length < 0) {
+			return null;
+		}
+		long[] array = new long[length];
+		for (int i = 0; i < length; i++) {
+			array[i] = readLong();
+		}
+		return array;
+	}
+
+	public void writeFloatArray(float[] array) {
+		if (array == null) {
+			writeInt(-1);
+			return;
+		}
+		writeInt(array.length);
+		for (float value : array) {
+			writeFloat(value);
+		}
+	}
+
+	public float[] createFloatArray() {
+		int length = readInt();
+		if (length < 0) {
+			return null;
+		}
+		float[] array = new float[length];
+		for (int i = 0; i < length; i++) {
+			array[i] = readFloat();
+		}
+		return array;
+	}
+
+	public void writeDoubleArray(double[] array) {
+		if (array == null) {
+			writeInt(-1);
+			return;
+		}
+		writeInt(array.length);
+		for (double value : array) {
+			writeDouble(value);
+		}
+	}
+
+	public double[] createDoubleArray() {
+		int length = readInt();
+		if (length < 0) {
+			return null;
+		}
+		double[] array = new double[length];
+		for (int i = 0; i < length; i++) {
+			array[i] = readDouble();
+		}
+		return array;
+	}
+
+	public void writeStringArray(String[] array) {
+		if (array == null) {
+			writeInt(-1);
+			return;
+		}
+		writeInt(array.length);
+		for (String value : array) {
+			writeString(value);
+		}
+	}
+
+	public String[] createStringArray() {
+		int length = readInt();
+		if (length < 0) {
+			return null;
+		}
+		String[] array = new String[length];
+		for (int i = 0; i < length; i++) {
+			array[i] = readString();
+		}
+		return array;
+	}
+
+	public void writeStringList(List<String> list) {
+		if (list == null) {
+			writeInt(-1);
+			return;
+		}
+		int size = list.size();
+		writeInt(size);
+		for (int i = 0; i < size; i++) {
+			writeString(list.get(i));
+		}
+	}
+
+	public ArrayList<String> createStringArrayList() {
+		int size = readInt();
+		if (size < 0) {
+			return null;
+		}
+		ArrayList<String> list = new ArrayList<String>(size);
+		for (int i = 0; i < size; i++) {
+			list.add(readString());
+		}
+		return list;
+	}
+
+	public <T extends Parcelable> void writeTypedList(List<T> list) {
+		if (list == null) {
+			writeInt(-1);
+			return;
+		}
+		int size = list.size();
+		writeInt(size);
+		for (int i = 0; i < size; i++) {
+			T element = list.get(i);
+			if (element == null) {
+				writeInt(0);
+			} else {
+				writeInt(1);
+				element.writeToParcel(this, 0);
+			}
+		}
+	}
+
+	public <T> ArrayList<T> createTypedArrayList(Parcelable.Creator<T> creator) {
+		int size = readInt();
+		if (size < 0) {
+			return null;
+		}
+		ArrayList<T> list = new ArrayList<T>(size);
+		for (int i = 0; i < size; i++) {
+			list.add(readInt() != 0 ? creator.createFromParcel(this) : null);
+		}
+		return list;
+	}
+
+	public void writeParcelable(Parcelable value, int flags) {
+		if (value == null) {
+			writeString(null);
+			return;
+		}
+		writeString(value.getClass().getName());
+		value.writeToParcel(this, flags);
+	}
+
+	@SuppressWarnings("unchecked")
+	public <T extends Parcelable> T readParcelable(ClassLoader loader) {
+		String name = readString();
+		if (name == null) {
+			return null;
+		}
+		try {
+			// Like the real Parcel, look the CREATOR up reflectively every time
+			Field field = Class.forName(name, true, loader).getField("CREATOR");
+			return ((Parcelable.Creator<T>) field.get(null)).createFromParcel(this);
+		} catch (Exception e) {
+			throw new RuntimeException("Can't unparcel " + name, e);
+		}
+	}
+
+	public void writeSerializable(Serializable value) {
+		if (value == null) {
+			writeString(null);
+			return;
+		}
+		writeString(value.getClass().getName());
+		try {
+			ByteArrayOutputStream bytes = new ByteArrayOutputStream();
+			ObjectOutputStream objects = new ObjectOutputStream(bytes);
+			objects.writeObject(value);
+			objects.close();
+			writeByteArray(bytes.toByteArray());
+		} catch (IOException e) {
+			throw new RuntimeException("Can't serialize " + value.getClass().getName(), e);
+		}
+	}
+
+	public Serializable readSerializable() {
+		String name = readString();
+		if (name == null) {
+			return null;
+		}
+		try {
+			ObjectInputStream objects = new ObjectInputStream(new ByteArrayInputStream(createByteArray()));
+			return (Serializable) objects.readObject();
+		} catch (Exception e) {
+			throw new RuntimeException("Can't deserialize " + name, e);
+		}
+	}
+}
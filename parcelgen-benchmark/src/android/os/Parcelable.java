@@ -0,0 +1,19 @@
+package android.os;
+
+/**
+ * Plain JVM stand-in for Android's Parcelable, for running benchmarks of
+ * generated classes off device.
+ */
+public interface Parcelable {
+
+	int describeContents();
+
+	void writeToParcel(Parcel dest, int flags);
+
+	public interface Creator<T> {
+
+		T createFromParcel(Parcel source);
+
+		T[] newArray(int size);
+	}
+}
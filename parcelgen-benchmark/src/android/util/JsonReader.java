@@ -0,0 +1,83 @@
+package android.util;
+
+import java.io.Closeable;
+import java.io.IOException;
+import java.io.Reader;
+
+/**
+ * Plain JVM stand-in for Android's JsonReader, for running benchmarks of
+ * generated classes off device. Android's JsonReader started out as a copy
+ * of Gson's, which this delegates to, so their performance is comparable.
+ */
+public class JsonReader implements Closeable {
+
+	private final com.google.gson.stream.JsonReader mReader;
+
+	public JsonReader(Reader in) {
+		mReader = new com.google.gson.stream.JsonReader(in);
+	}
+
+	public void setLenient(boolean lenient) {
+		mReader.setLenient(lenient);
+	}
+
+	public void beginArray() throws IOException {
+		mReader.beginArray();
+	}
+
+	public void endArray() throws IOException {
+		mReader.endArray();
+	}
+
+	public void beginObject() throws IOException {
+		mReader.beginObject();
+	}
+
+	public void endObject() throws IOException {
+		mReader.endObject();
+	}
+
+	public boolean hasNext() throws IOException {
+		return mReader.hasNext();
+	}
+
+	public JsonToken peek() throws IOException {
+		return JsonToken.valueOf(mReader.peek().name());
+	}
+
+	public String nextName() throws IOException {
+		return mReader.nextName();
+	}
+
+	public String nextString() throws IOException {
+		return mReader.nextString();
+	}
+
+	public boolean nextBoolean() throws IOException {
+		return mReader.nextBoolean();
+	}
+
+	public void nextNull() throws IOException {
+		mReader.nextNull();
+	}
+
+	public double nextDouble() throws IOException {
+		return mReader.nextDouble();
+	}
+
+	public long nextLong() throws IOException {
+		return mReader.nextLong();
+	}
+
+	public int nextInt() throws IOException {
+		return mReader.nextInt();
+	}
+
+	public void skipValue() throws IOException {
+		mReader.skipValue();
+	}
+
+	public void close() throws IOException {
+		mReader.close();
+	}
+}
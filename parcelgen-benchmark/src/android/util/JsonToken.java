@@ -0,0 +1,18 @@
+package android.util;
+
+/**
+ * Plain JVM stand-in for Android's JsonToken, for running benchmarks of
+ * generated classes off device.
+ */
+public enum JsonToken {
+	BEGIN_ARRAY,
+	END_ARRAY,
+	BEGIN_OBJECT,
+	END_OBJECT,
+	NAME,
+	STRING,
+	NUMBER,
+	BOOLEAN,
+	NULL,
+	END_DOCUMENT
+}
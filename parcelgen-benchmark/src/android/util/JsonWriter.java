@@ -0,0 +1,15 @@
+package android.util;
+
+import java.io.Writer;
+
+/**
+ * Plain JVM stand-in for Android's JsonWriter, for running benchmarks of
+ * generated classes off device. Android's JsonWriter started out as a copy
+ * of Gson's, which this extends.
+ */
+public class JsonWriter extends com.google.gson.stream.JsonWriter {
+
+	public JsonWriter(Writer out) {
+		super(out);
+	}
+}
@@ -0,0 +1,66 @@
+package com.yelp.parcelgen.bench;
+
+/**
+ * A minimal microbenchmark harness for the benchmarks parcelgen generates with
+ * --emit-benchmarks. Each task is warmed up until the JIT has had a chance to
+ * compile it, then timed over several rounds; the fastest and median rounds are
+ * reported in nanoseconds per operation.
+ */
+public final class Bench {
+
+	public interface Task {
+		/**
+		 * Runs one iteration. The result is consumed so the work can't be optimized away.
+		 */
+		Object run() throws Exception;
+	}
+
+	private static final long WARMUP_NANOS = 1000L * 1000 * 1000;
+	private static final long ROUND_NANOS = 200L * 1000 * 1000;
+	private static final int ROUNDS = 10;
+
+	private static int sSink;
+
+	private Bench() {}
+
+	/**
+	 * Times <code>task</code>, which performs <code>operations</code>
+	 * operations per iteration, and prints a line for it.
+	 */
+	public static void run(String subject, String name, int operations, Task task) throws Exception {
+		long iterations = 1;
+		long deadline = System.nanoTime() + WARMUP_NANOS;
+		while (System.nanoTime() < deadline) {
+			long start = System.nanoTime();
+			consume(task, iterations);
+			long elapsed = System.nanoTime() - start;
+			if (elapsed < ROUND_NANOS / 10) {
+				iterations *= 2;
+			}
+		}
+		double[] rounds = new double[ROUNDS];
+		for (int round = 0; round < ROUNDS; round++) {
+			long start = System.nanoTime();
+			consume(task, iterations);
+			rounds[round] = (double) (System.nanoTime() - start) / (iterations * operations);
+		}
+		java.util.Arrays.sort(rounds);
+		System.out.println(String.format("%-24s %-28s %12.1f ns/op (median %.1f)",
+				subject, name, rounds[0], rounds[ROUNDS / 2]));
+	}
+
+	private static void consume(Task task, long iterations) throws Exception {
+		for (long i = 0; i < iterations; i++) {
+			Object result = task.run();
+			sSink += result == null ? 0 : 1;
+		}
+	}
+
+	/**
+	 * Returns the number of the iterations run so far that produced a result,
+	 * so the JIT can't tell they're unused.
+	 */
+	public static int sink() {
+		return sSink;
+	}
+}
@@ -104,7 +104,8 @@ import org.json.JSONObject;
 	}
 
 	public void writeToParcel(Parcel parcel, int flags) {
-		parcel.writeParcelable(mLocation, 0);
+		parcel.writeInt(mLocation == null ? 0 : 1);
+		if (mLocation != null) mLocation.writeToParcel(parcel, flags);
 		parcel.writeString(mId);
 		parcel.writeString(mName);
 		parcel.writeString(mImageUrl);
@@ -122,7 +123,7 @@ import org.json.JSONObject;
 	}
 
 	public void readFromParcel(Parcel source) {
-		mLocation = source.readParcelable(Location.class.getClassLoader());
+		mLocation = source.readInt() == 0 ? null : Location.CREATOR.createFromParcel(source);
 		mId = source.readString();
 		mName = source.readString();
 		mImageUrl = source.readString();
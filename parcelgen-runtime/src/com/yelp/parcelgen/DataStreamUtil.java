@@ -0,0 +1,481 @@
+package com.yelp.parcelgen;
+
+import android.net.Uri;
+
+import java.io.ByteArrayInputStream;
+import java.io.ByteArrayOutputStream;
+import java.io.DataInput;
+import java.io.DataOutput;
+import java.io.IOException;
+import java.io.ObjectInputStream;
+import java.io.ObjectOutputStream;
+import java.io.Serializable;
+import java.nio.charset.Charset;
+import java.util.ArrayList;
+import java.util.Date;
+import java.util.List;
+
+/**
+ * Reads and writes the members of DataStreamable classes. References are
+ * preceded by a marker or length telling whether they are null, and strings
+ * are written as UTF-8 without DataOutput.writeUTF()'s 64KB limit. Wrap the
+ * underlying streams in buffered ones: every value is a separate call.
+ */
+public class DataStreamUtil {
+
+	private static final Charset UTF_8 = Charset.forName("UTF-8");
+
+	/**
+	 * DataStreamUtil consists only of static methods and cannot be instantiated.
+	 */
+	private DataStreamUtil() {}
+
+	/**
+	 * Reads the schema fingerprint at the start of an object's data.
+	 * @param in
+	 * @param type The class reading the data.
+	 * @param expected The fingerprint of its schema.
+	 * @throws StaleDataException If the fingerprint doesn't match.
+	 * @throws IOException
+	 */
+	public static void readFingerprint(DataInput in, Class<?> type, long expected) throws IOException {
+		long fingerprint = in.readLong();
+		if (fingerprint != expected) {
+			throw new StaleDataException(type, fingerprint, expected);
+		}
+	}
+
+	/**
+	 * Writes <code>value</code>, which may be null.
+	 * @param out
+	 * @param value
+	 * @throws IOException
+	 */
+	public static void writeString(DataOutput out, String value) throws IOException {
+		if (value == null) {
+			out.writeInt(-1);
+			return;
+		}
+		byte[] bytes = value.getBytes(UTF_8);
+		out.writeInt(bytes.length);
+		out.write(bytes);
+	}
+
+	/**
+	 * Reads a string written by writeString().
+	 * @param in
+	 * @return The string, or null.
+	 * @throws IOException
+	 */
+	public static String readString(DataInput in) throws IOException {
+		int length = in.readInt();
+		if (length < 0) {
+			return null;
+		}
+		byte[] bytes = new byte[length];
+		in.readFully(bytes);
+		return new String(bytes, UTF_8);
+	}
+
+	/**
+	 * Writes <code>date</code>, which may be null.
+	 * @param out
+	 * @param date
+	 * @throws IOException
+	 */
+	public static void writeDate(DataOutput out, Date date) throws IOException {
+		out.writeBoolean(date != null);
+		if (date != null) {
+			out.writeLong(date.getTime());
+		}
+	}
+
+	/**
+	 * Reads a date written by writeDate().
+	 * @param in
+	 * @return The date, or null.
+	 * @throws IOException
+	 */
+	public static Date readDate(DataInput in) throws IOException {
+		return in.readBoolean() ? new Date(in.readLong()) : null;
+	}
+
+	/**
+	 * Writes <code>uri</code>, which may be null, as its string form.
+	 * @param out
+	 * @param uri
+	 * @throws IOException
+	 */
+	public static void writeUri(DataOutput out, Uri uri) throws IOException {
+		writeString(out, uri == null ? null : uri.toString());
+	}
+
+	/**
+	 * Reads a uri written by writeUri().
+	 * @param in
+	 * @return The uri, or null.
+	 * @throws IOException
+	 */
+	public static Uri readUri(DataInput in) throws IOException {
+		String uri = readString(in);
+		return uri == null ? null : Uri.parse(uri);
+	}
+
+	/**
+	 * Writes <code>object</code>, which may be null, with its writeTo().
+	 * Read it back by checking readBoolean() and calling readFrom() on a new instance.
+	 * @param out
+	 * @param object
+	 * @throws IOException
+	 */
+	public static void writeObject(DataOutput out, DataStreamable object) throws IOException {
+		out.writeBoolean(object != null);
+		if (object != null) {
+			object.writeTo(out);
+		}
+	}
+
+	/**
+	 * Writes <code>list</code>, which may be null, as its size followed by
+	 * each element as writeObject() would write it.
+	 * @param out
+	 * @param list
+	 * @throws IOException
+	 */
+	public static void writeList(DataOutput out, List<? extends DataStreamable> list) throws IOException {
+		if (list == null) {
+			out.writeInt(-1);
+			return;
+		}
+		int size = list.size();
+		out.writeInt(size);
+		for (int i = 0; i < size; i++) {
+			writeObject(out, list.get(i));
+		}
+	}
+
+	/**
+	 * Writes <code>list</code>, which may be null, as its size followed by its strings.
+	 * @param out
+	 * @param list
+	 * @throws IOException
+	 */
+	public static void writeStringList(DataOutput out, List<String> list) throws IOException {
+		if (list == null) {
+			out.writeInt(-1);
+			return;
+		}
+		int size = list.size();
+		out.writeInt(size);
+		for (int i = 0; i < size; i++) {
+			writeString(out, list.get(i));
+		}
+	}
+
+	/**
+	 * Reads a list written by writeStringList().
+	 * @param in
+	 * @return The list, or null.
+	 * @throws IOException
+	 */
+	public static ArrayList<String> readStringList(DataInput in) throws IOException {
+		int size = in.readInt();
+		if (size < 0) {
+			return null;
+		}
+		ArrayList<String> list = new ArrayList<String>(size);
+		for (int i = 0; i < size; i++) {
+			list.add(readString(in));
+		}
+		return list;
+	}
+
+	/**
+	 * Writes <code>value</code>, which may be null, with Java serialization.
+	 * Only used for members listed in "serializables", whose classes parcelgen
+	 * knows nothing else about.
+	 * @param out
+	 * @param value
+	 * @throws IOException
+	 */
+	public static void writeSerializable(DataOutput out, Serializable value) throws IOException {
+		if (value == null) {
+			out.writeInt(-1);
+			return;
+		}
+		ByteArrayOutputStream bytes = new ByteArrayOutputStream();
+		ObjectOutputStream objects = new ObjectOutputStream(bytes);
+		objects.writeObject(value);
+		objects.close();
+		out.writeInt(bytes.size());
+		out.write(bytes.toByteArray());
+	}
+
+	/**
+	 * Reads a value written by writeSerializable().
+	 * @param in
+	 * @return The value, or null.
+	 * @throws IOException If the value can't be deserialized, for instance
+	 * because its class changed incompatibly.
+	 */
+	public static Object readSerializable(DataInput in) throws IOException {
+		int length = in.readInt();
+		if (length < 0) {
+			return null;
+		}
+		byte[] bytes = new byte[length];
+		in.readFully(bytes);
+		ObjectInputStream objects = new ObjectInputStream(new ByteArrayInputStream(bytes));
+		try {
+			return objects.readObject();
+		} catch (ClassNotFoundException e) {
+			IOException exception = new IOException("Can't deserialize " + e.getMessage());
+			exception.initCause(e);
+			throw exception;
+		} finally {
+			objects.close();
+		}
+	}
+
+	/**
+	 * Writes <code>array</code>, which may be null, as its length followed by its bytes.
+	 * @param out
+	 * @param array
+	 * @throws IOException
+	 */
+	public static void writeArray(DataOutput out, byte[] array) throws IOException {
+		if (array == null) {
+			out.writeInt(-1);
+			return;
+		}
+		out.writeInt(array.length);
+		out.write(array);
+	}
+
+	/**
+	 * Reads an array written by writeArray().
+	 * @param in
+	 * @return The array, or null.
+	 * @throws IOException
+	 */
+	public static byte[] readByteArray(DataInput in) throws IOException {
+		int length = in.readInt();
+		if (length < 0) {
+			return null;
+		}
+		byte[] array = new byte[length];
+		in.readFully(array);
+		return array;
+	}
+
+	/**
+	 * Writes <code>array</code>, which may be null, as its length followed by its elements.
+	 * @param out
+	 * @param array
+	 * @throws IOException
+	 */
+	public static void writeArray(DataOutput out, int[] array) throws IOException {
+		if (array == null) {
+			out.writeInt(-1);
+			return;
+		}
+		out.writeInt(array.length);
+		for (int i = 0; i < array.length; i++) {
+			out.writeInt(array[i]);
+		}
+	}
+
+	/**
+	 * Reads an array written by writeArray().
+	 * @param in
+	 * @return The array, or null.
+	 * @throws IOException
+	 */
+	public static int[] readIntArray(DataInput in) throws IOException {
+		int length = in.readInt();
+		if (length < 0) {
+			return null;
+		}
+		int[] array = new int[length];
+		for (int i = 0; i < length; i++) {
+			array[i] = in.readInt();
+		}
+		return array;
+	}
+
+	/**
+	 * Writes <code>array</code>, which may be null, as its length followed by its elements.
+	 * @param out
+	 * @param array
+	 * @throws IOException
+	 */
+	public static void writeArray(DataOutput out, long[] array) throws IOException {
+		if (array == null) {
+			out.writeInt(-1);
+			return;
+		}
+		out.writeInt(array.length);
+		for (int i = 0; i < array.length; i++) {
+			out.writeLong(array[i]);
+		}
+	}
+
+	/**
+	 * Reads an array written by writeArray().
+	 * @param in
+	 * @return The array, or null.
+	 * @throws IOException
+	 */
+	public static long[] readLongArray(DataInput in) throws IOException {
+		int length = in.readInt();
+		if (length < 0) {
+			return null;
+		}
+		long[] array = new long[length];
+		for (int i = 0; i < length; i++) {
+			array[i] = in.readLong();
+		}
+		return array;
+	}
+
+	/**
+	 * Writes <code>array</code>, which may be null, as its length followed by its elements.
+	 * @param out
+	 * @param array
+	 * @throws IOException
+	 */
+	public static void writeArray(DataOutput out, double[] array) throws IOException {
+		if (array == null) {
+			out.writeInt(-1);
+			return;
+		}
+		out.writeInt(array.length);
+		for (int i = 0; i < array.length; i++) {
+			out.writeDouble(array[i]);
+		}
+	}
+
+	/**
+	 * Reads an array written by writeArray().
+	 * @param in
+	 * @return The array, or null.
+	 * @throws IOException
+	 */
+	public static double[] readDoubleArray(DataInput in) throws IOException {
+		int length = in.readInt();
+		if (length < 0) {
+			return null;
+		}
+		double[] array = new double[length];
+		for (int i = 0; i < length; i++) {
+			array[i] = in.readDouble();
+		}
+		return array;
+	}
+
+	/**
+	 * Writes <code>array</code>, which may be null, as its length followed by its elements.
+	 * @param out
+	 * @param array
+	 * @throws IOException
+	 */
+	public static void writeArray(DataOutput out, float[] array) throws IOException {
+		if (array == null) {
+			out.writeInt(-1);
+			return;
+		}
+		out.writeInt(array.length);
+		for (int i = 0; i < array.length; i++) {
+			out.writeFloat(array[i]);
+		}
+	}
+
+	/**
+	 * Reads an array written by writeArray().
+	 * @param in
+	 * @return The array, or null.
+	 * @throws IOException
+	 */
+	public static float[] readFloatArray(DataInput in) throws IOException {
+		int length = in.readInt();
+		if (length < 0) {
+			return null;
+		}
+		float[] array = new float[length];
+		for (int i = 0; i < length; i++) {
+			array[i] = in.readFloat();
+		}
+		return array;
+	}
+
+	/**
+	 * Writes <code>array</code>, which may be null, as its length followed by its elements.
+	 * @param out
+	 * @param array
+	 * @throws IOException
+	 */
+	public static void writeArray(DataOutput out, boolean[] array) throws IOException {
+		if (array == null) {
+			out.writeInt(-1);
+			return;
+		}
+		out.writeInt(array.length);
+		for (int i = 0; i < array.length; i++) {
+			out.writeBoolean(array[i]);
+		}
+	}
+
+	/**
+	 * Reads an array written by writeArray().
+	 * @param in
+	 * @return The array, or null.
+	 * @throws IOException
+	 */
+	public static boolean[] readBooleanArray(DataInput in) throws IOException {
+		int length = in.readInt();
+		if (length < 0) {
+			return null;
+		}
+		boolean[] array = new boolean[length];
+		for (int i = 0; i < length; i++) {
+			array[i] = in.readBoolean();
+		}
+		return array;
+	}
+
+	/**
+	 * Writes <code>array</code>, which may be null, as its length followed by its elements.
+	 * @param out
+	 * @param array
+	 * @throws IOException
+	 */
+	public static void writeArray(DataOutput out, String[] array) throws IOException {
+		if (array == null) {
+			out.writeInt(-1);
+			return;
+		}
+		out.writeInt(array.length);
+		for (int i = 0; i < array.length; i++) {
+			writeString(out, array[i]);
+		}
+	}
+
+	/**
+	 * Reads an array written by writeArray().
+	 * @param in
+	 * @return The array, or null.
+	 * @throws IOException
+	 */
+	public static String[] readStringArray(DataInput in) throws IOException {
+		int length = in.readInt();
+		if (length < 0) {
+			return null;
+		}
+		String[] array = new String[length];
+		for (int i = 0; i < length; i++) {
+			array[i] = readString(in);
+		}
+		return array;
+	}
+
+}
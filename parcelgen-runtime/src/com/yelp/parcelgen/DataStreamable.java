@@ -0,0 +1,26 @@
+package com.yelp.parcelgen;
+
+import java.io.DataInput;
+import java.io.DataOutput;
+import java.io.IOException;
+
+/**
+ * An object which can write itself to and read itself from a binary stream,
+ * a compact and reflection free alternative to java.io.Serializable for disk
+ * caches. Classes generated with the data_stream option implement this, and
+ * start their data with a fingerprint of their schema so that data written by
+ * an older version of the class is rejected instead of misread.
+ */
+public interface DataStreamable {
+
+	/**
+	 * Writes this object's schema fingerprint followed by its members to <code>out</code>.
+	 */
+	void writeTo(DataOutput out) throws IOException;
+
+	/**
+	 * Replaces this object's members with those read from <code>in</code>.
+	 * @throws StaleDataException If the data was written with a different schema.
+	 */
+	void readFrom(DataInput in) throws IOException;
+}
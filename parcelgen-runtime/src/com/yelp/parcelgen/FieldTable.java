@@ -0,0 +1,356 @@
+package com.yelp.parcelgen;
+
+import android.net.Uri;
+import android.os.Parcel;
+import android.os.Parcelable;
+
+import org.json.JSONException;
+import org.json.JSONObject;
+
+import java.io.Serializable;
+import java.util.ArrayList;
+import java.util.Collections;
+import java.util.Date;
+import java.util.List;
+
+/**
+ * Describes the members of a class generated with the "table" codegen mode
+ * in the order its unrolled code would handle them: each member's type code,
+ * json key and creator. Its loops parcel and read json into TableParcelables
+ * through getField() and setField() in exactly the formats the unrolled code
+ * uses, so classes can switch modes without affecting stored parcels or the
+ * json they accept.
+ */
+public final class FieldTable {
+
+	// Primitives, which are boxed by getField() and setField()
+	public static final byte BOOLEAN = 0;
+	public static final byte BYTE = 1;
+	public static final byte DOUBLE = 2;
+	public static final byte FLOAT = 3;
+	public static final byte INT = 4;
+	public static final byte LONG = 5;
+
+	public static final byte STRING = 6;
+	public static final byte DATE = 7;
+	public static final byte URI = 8;
+	public static final byte STRING_LIST = 9;
+	public static final byte STRING_ARRAY_LIST = 10;
+	/** A List of Parcelables, whose creator is given. */
+	public static final byte TYPED_LIST = 11;
+	/** An ArrayList of Parcelables, whose creator is given. */
+	public static final byte TYPED_ARRAY_LIST = 12;
+	public static final byte BOOLEAN_ARRAY = 13;
+	public static final byte BYTE_ARRAY = 14;
+	public static final byte DOUBLE_ARRAY = 15;
+	public static final byte FLOAT_ARRAY = 16;
+	public static final byte INT_ARRAY = 17;
+	public static final byte LONG_ARRAY = 18;
+	public static final byte STRING_ARRAY = 19;
+	/** An object of a class generated by parcelgen, whose DualCreator is given. */
+	public static final byte PARCELGEN = 20;
+	/** A Serializable, whose JsonParser is given if it's read from json. */
+	public static final byte SERIALIZABLE = 21;
+	/** Any other Parcelable, whose JsonParser is given if it's read from json. */
+	public static final byte PARCELABLE = 22;
+
+	private final byte[] mTypes;
+	private final String[] mKeys;
+	private final Object[] mCreators;
+	private final Object[] mDefaults;
+
+	/**
+	 * @param types The type code of each member.
+	 * @param keys The json key of each member, or null for those which aren't read from json.
+	 * @param creators The Parcelable.Creator or JsonParser of the object or element type
+	 *        of each member which needs one, in member order, or null if none does.
+	 *        Lists of Parcelables and PARCELGEN members need one, as do SERIALIZABLE
+	 *        and PARCELABLE members which are read from json.
+	 * @param defaults The value of each member missing from json, or null if no member has one.
+	 */
+	public FieldTable(byte[] types, String[] keys, Object[] creators, Object[] defaults) {
+		mTypes = types;
+		mKeys = keys;
+		mCreators = new Object[types.length];
+		mDefaults = defaults;
+		int next = 0;
+		for (int i = 0; i < types.length; i++) {
+			if (needsCreator(i)) {
+				mCreators[i] = creators[next++];
+			}
+		}
+	}
+
+	private boolean needsCreator(int field) {
+		switch (mTypes[field]) {
+		case TYPED_LIST:
+		case TYPED_ARRAY_LIST:
+		case PARCELGEN:
+			return true;
+		case SERIALIZABLE:
+		case PARCELABLE:
+			return mKeys[field] != null;
+		default:
+			return false;
+		}
+	}
+
+	/**
+	 * Returns the index after the run of booleans starting at <code>field</code>.
+	 * The booleans of a class are parcelled together as one array.
+	 */
+	private int booleansEnd(int field) {
+		int end = field;
+		while (end < mTypes.length && mTypes[end] == BOOLEAN) {
+			end++;
+		}
+		return end;
+	}
+
+	/**
+	 * Writes the members of <code>object</code> to <code>parcel</code>.
+	 * @param object
+	 * @param parcel
+	 * @param flags
+	 */
+	@SuppressWarnings("unchecked")
+	public void writeToParcel(TableParcelable object, Parcel parcel, int flags) {
+		for (int i = 0; i < mTypes.length; i++) {
+			if (mTypes[i] == BOOLEAN) {
+				int end = booleansEnd(i);
+				boolean[] bools = new boolean[end - i];
+				for (int j = i; j < end; j++) {
+					bools[j - i] = (Boolean) object.getField(j);
+				}
+				parcel.writeBooleanArray(bools);
+				i = end - 1;
+				continue;
+			}
+			Object value = object.getField(i);
+			switch (mTypes[i]) {
+			case BYTE:
+				parcel.writeByte((Byte) value);
+				break;
+			case DOUBLE:
+				parcel.writeDouble((Double) value);
+				break;
+			case FLOAT:
+				parcel.writeFloat((Float) value);
+				break;
+			case INT:
+				parcel.writeInt((Integer) value);
+				break;
+			case LONG:
+				parcel.writeLong((Long) value);
+				break;
+			case STRING:
+				parcel.writeString((String) value);
+				break;
+			case DATE:
+				parcel.writeLong(value == null ? Integer.MIN_VALUE : ((Date) value).getTime());
+				break;
+			case STRING_LIST:
+			case STRING_ARRAY_LIST:
+				parcel.writeStringList((List<String>) value);
+				break;
+			case TYPED_LIST:
+			case TYPED_ARRAY_LIST:
+				parcel.writeTypedList((List<Parcelable>) value);
+				break;
+			case BOOLEAN_ARRAY:
+				parcel.writeBooleanArray((boolean[]) value);
+				break;
+			case BYTE_ARRAY:
+				parcel.writeByteArray((byte[]) value);
+				break;
+			case DOUBLE_ARRAY:
+				parcel.writeDoubleArray((double[]) value);
+				break;
+			case FLOAT_ARRAY:
+				parcel.writeFloatArray((float[]) value);
+				break;
+			case INT_ARRAY:
+				parcel.writeIntArray((int[]) value);
+				break;
+			case LONG_ARRAY:
+				parcel.writeLongArray((long[]) value);
+				break;
+			case STRING_ARRAY:
+				parcel.writeStringArray((String[]) value);
+				break;
+			case PARCELGEN:
+				parcel.writeInt(value == null ? 0 : 1);
+				if (value != null) ((Parcelable) value).writeToParcel(parcel, flags);
+				break;
+			case SERIALIZABLE:
+				parcel.writeSerializable((Serializable) value);
+				break;
+			default:
+				parcel.writeParcelable((Parcelable) value, 0);
+				break;
+			}
+		}
+	}
+
+	/**
+	 * Replaces the members of <code>object</code> with those read from <code>source</code>.
+	 * @param object
+	 * @param source
+	 */
+	@SuppressWarnings("unchecked")
+	public void readFromParcel(TableParcelable object, Parcel source) {
+		for (int i = 0; i < mTypes.length; i++) {
+			switch (mTypes[i]) {
+			case BOOLEAN:
+				boolean[] bools = source.createBooleanArray();
+				int end = booleansEnd(i);
+				for (int j = i; j < end; j++) {
+					object.setField(j, bools[j - i]);
+				}
+				i = end - 1;
+				break;
+			case BYTE:
+				object.setField(i, source.readByte());
+				break;
+			case DOUBLE:
+				object.setField(i, source.readDouble());
+				break;
+			case FLOAT:
+				object.setField(i, source.readFloat());
+				break;
+			case INT:
+				object.setField(i, source.readInt());
+				break;
+			case LONG:
+				object.setField(i, source.readLong());
+				break;
+			case STRING:
+				object.setField(i, source.readString());
+				break;
+			case DATE:
+				long date = source.readLong();
+				if (date != Integer.MIN_VALUE) {
+					object.setField(i, new Date(date));
+				}
+				break;
+			case STRING_LIST:
+			case STRING_ARRAY_LIST:
+				object.setField(i, source.createStringArrayList());
+				break;
+			case TYPED_LIST:
+			case TYPED_ARRAY_LIST:
+				object.setField(i, source.createTypedArrayList((Parcelable.Creator<Object>) mCreators[i]));
+				break;
+			case BOOLEAN_ARRAY:
+				object.setField(i, source.createBooleanArray());
+				break;
+			case BYTE_ARRAY:
+				object.setField(i, source.createByteArray());
+				break;
+			case DOUBLE_ARRAY:
+				object.setField(i, source.createDoubleArray());
+				break;
+			case FLOAT_ARRAY:
+				object.setField(i, source.createFloatArray());
+				break;
+			case INT_ARRAY:
+				object.setField(i, source.createIntArray());
+				break;
+			case LONG_ARRAY:
+				object.setField(i, source.createLongArray());
+				break;
+			case STRING_ARRAY:
+				object.setField(i, source.createStringArray());
+				break;
+			case PARCELGEN:
+				object.setField(i, source.readInt() == 0 ? null
+						: ((Parcelable.Creator<Object>) mCreators[i]).createFromParcel(source));
+				break;
+			case SERIALIZABLE:
+				object.setField(i, source.readSerializable());
+				break;
+			case URI:
+				object.setField(i, source.readParcelable(Uri.class.getClassLoader()));
+				break;
+			default:
+				object.setField(i, source.readParcelable(object.getClass().getClassLoader()));
+				break;
+			}
+		}
+	}
+
+	/**
+	 * Replaces the members of <code>object</code> which are read from json with
+	 * those in <code>json</code>. Missing lists are read as empty ones, and
+	 * other missing members take their default value if they have one.
+	 * @param object
+	 * @param json
+	 * @throws JSONException
+	 */
+	public void readFromJson(TableParcelable object, JSONObject json) throws JSONException {
+		for (int i = 0; i < mTypes.length; i++) {
+			String key = mKeys[i];
+			if (key == null) {
+				continue;
+			}
+			byte type = mTypes[i];
+			Object fallback = mDefaults == null ? null : mDefaults[i];
+			// Like the unrolled code, primitives without a default are read even if they're null
+			if ((type <= LONG && fallback == null) || !json.isNull(key)) {
+				object.setField(i, readJsonValue(json, key, i));
+			} else if (fallback != null) {
+				object.setField(i, fallback);
+			} else if (type == STRING_ARRAY_LIST || type == TYPED_ARRAY_LIST) {
+				object.setField(i, new ArrayList<Object>());
+			} else if (type == STRING_LIST || type == TYPED_LIST) {
+				object.setField(i, Collections.emptyList());
+			}
+		}
+	}
+
+	private Object readJsonValue(JSONObject json, String key, int field) throws JSONException {
+		switch (mTypes[field]) {
+		case BOOLEAN:
+			return json.optBoolean(key);
+		case BYTE:
+			return (byte) json.optInt(key);
+		case DOUBLE:
+			return json.optDouble(key);
+		case FLOAT:
+			return (float) json.optDouble(key);
+		case INT:
+			return json.optInt(key);
+		case LONG:
+			return json.optLong(key);
+		case STRING:
+			return json.optString(key);
+		case DATE:
+			return JsonUtil.parseTimestamp(json, key);
+		case URI:
+			return Uri.parse(json.getString(key));
+		case STRING_LIST:
+			return JsonUtil.getStringList(json.optJSONArray(key));
+		case STRING_ARRAY_LIST:
+			return new ArrayList<String>(JsonUtil.getStringList(json.optJSONArray(key)));
+		case TYPED_LIST:
+		case TYPED_ARRAY_LIST:
+			return JsonUtil.parseJsonList(json.optJSONArray(key), (JsonParser<?>) mCreators[field]);
+		case BOOLEAN_ARRAY:
+			return JsonUtil.getBooleanArray(json.optJSONArray(key));
+		case BYTE_ARRAY:
+			return JsonUtil.getByteArray(json.optJSONArray(key));
+		case DOUBLE_ARRAY:
+			return JsonUtil.getDoubleArray(json.optJSONArray(key));
+		case FLOAT_ARRAY:
+			return JsonUtil.getFloatArray(json.optJSONArray(key));
+		case INT_ARRAY:
+			return JsonUtil.getIntArray(json.optJSONArray(key));
+		case LONG_ARRAY:
+			return JsonUtil.getLongArray(json.optJSONArray(key));
+		case STRING_ARRAY:
+			return JsonUtil.getStringArray(json.optJSONArray(key));
+		default:
+			return ((JsonParser<?>) mCreators[field]).parse(json.getJSONObject(key));
+		}
+	}
+}
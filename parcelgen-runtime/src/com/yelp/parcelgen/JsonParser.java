@@ -1,11 +1,14 @@
 package com.yelp.parcelgen;
 
 import android.os.Parcelable;
+import android.util.JsonReader;
 
 import org.json.JSONArray;
 import org.json.JSONException;
 import org.json.JSONObject;
 
+import java.io.IOException;
+
 /**
  * A standard class for json-representable objects to extend as
  * a static member for a standardized JSON parsing interface, much
@@ -39,6 +42,16 @@ public abstract class JsonParser<E> {
 		throw new UnsupportedOperationException("Must implement parse(JSONObject): " + this.getClass().getCanonicalName());
 	}
 
+	/**
+	 * Parses object into reuse if it isn't null, for refilling recycled
+	 * objects instead of allocating new ones. Classes generated with the
+	 * "reuse" option override this to call readFromJson(JSONObject) on reuse;
+	 * the default implementation ignores reuse and calls parse(JSONObject).
+	 */
+	public E parse(JSONObject object, E reuse) throws JSONException {
+		return parse(object);
+	}
+
 	public E parse(JSONArray object) throws JSONException {
 		if (getElementType() != ARRAY_TYPE) {
 			throw new UnsupportedOperationException("This JsonParser requires you to call parse(JSONObject): " + this.getClass().getCanonicalName());
@@ -46,6 +59,15 @@ public abstract class JsonParser<E> {
 		throw new UnsupportedOperationException("Must implement parse(JSONArray): " + this.getClass().getCanonicalName());
 	}
 
+	/**
+	 * Reads the next value from a streaming JsonReader. Classes generated
+	 * with the "jsonreader" json_backend override this to call
+	 * readFromJson(JsonReader).
+	 */
+	public E parse(JsonReader reader) throws IOException {
+		throw new UnsupportedOperationException("Must implement parse(JsonReader): " + this.getClass().getCanonicalName());
+	}
+
 	public E make(JSONArray array, int index) {
 		try {
 			if (getElementType() == OBJECT_TYPE) {
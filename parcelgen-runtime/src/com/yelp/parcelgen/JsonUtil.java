@@ -1,14 +1,23 @@
 package com.yelp.parcelgen;
 
+import android.util.JsonReader;
+import android.util.JsonToken;
+import android.util.JsonWriter;
+
 import org.json.JSONArray;
 import org.json.JSONException;
 import org.json.JSONObject;
 
+import java.io.IOException;
+import java.lang.reflect.Array;
 import java.util.ArrayList;
 import java.util.Arrays;
 import java.util.Collections;
 import java.util.Date;
 import java.util.List;
+import java.util.concurrent.CountDownLatch;
+import java.util.concurrent.Executor;
+import java.util.concurrent.RejectedExecutionException;
 
 public class JsonUtil {
 
@@ -32,8 +41,9 @@ public class JsonUtil {
 		}
 		int size = array.length();
 		ArrayList<E> list = new ArrayList<E>(size);
+		boolean arrays = creator.getElementType() == JsonParser.ARRAY_TYPE;
 		for (int i = 0; i < size; i++) {
-			if (creator.getElementType() == JsonParser.ARRAY_TYPE) {
+			if (arrays) {
 				list.add(creator.parse(array.getJSONArray(i)));
 			} else {
 				list.add(creator.parse(array.getJSONObject(i)));
@@ -42,6 +52,189 @@ public class JsonUtil {
 		return list;
 	}
 
+	/**
+	 * Like {@link #parseJsonList(JSONArray, JsonParser)}, but arrays longer than
+	 * <code>chunkSize</code> are split into slices of that many elements which are
+	 * parsed in parallel on <code>executor</code>, one of them on the calling thread.
+	 * The results are in the same order as the array. <code>creator</code> must be
+	 * safe to call from several threads, which generated CREATORs are.
+	 * If the executor rejects a slice, it is parsed on the calling thread instead.
+	 * @param <E>
+	 * @param array
+	 * @param creator
+	 * @param executor
+	 * @param chunkSize The most elements parsed by one task.
+	 * @return An ArrayList of new objects created by <code>creator</code>.
+	 * @throws JSONException If parsing of one of the objects fails. Its message
+	 * starts with the index of the first element that failed.
+	 */
+	public static <E> ArrayList<E> parseJsonList(JSONArray array, JsonParser<E> creator, Executor executor,
+			int chunkSize) throws JSONException {
+		if (array == null) {
+			return new ArrayList<E>();
+		}
+		if (chunkSize < 1) {
+			throw new IllegalArgumentException("chunkSize must be positive: " + chunkSize);
+		}
+		int size = array.length();
+		Object[] results = new Object[size];
+		int chunks = Math.max((size + chunkSize - 1) / chunkSize, 1);
+		CountDownLatch done = new CountDownLatch(chunks - 1);
+		ListChunk<E>[] tasks = new ListChunk[chunks];
+		for (int i = 1; i < chunks; i++) {
+			tasks[i] = new ListChunk<E>(array, creator, results, i * chunkSize,
+					Math.min(size, (i + 1) * chunkSize), done);
+			try {
+				executor.execute(tasks[i]);
+			} catch (RejectedExecutionException e) {
+				tasks[i].run();
+			}
+		}
+		tasks[0] = new ListChunk<E>(array, creator, results, 0, Math.min(size, chunkSize), null);
+		tasks[0].run();
+		try {
+			done.await();
+		} catch (InterruptedException e) {
+			Thread.currentThread().interrupt();
+			throw new JSONException("Interrupted while parsing list");
+		}
+		// Slices are checked in order, so the lowest failed index is reported
+		for (ListChunk<E> task : tasks) {
+			task.checkFailure();
+		}
+		ArrayList<E> list = new ArrayList<E>(size);
+		for (int i = 0; i < size; i++) {
+			list.add((E) results[i]);
+		}
+		return list;
+	}
+
+	/**
+	 * Parses the elements of a JSONArray from start to end into results,
+	 * stopping at the first one which fails.
+	 */
+	private static class ListChunk<E> implements Runnable {
+		private final JSONArray mArray;
+		private final JsonParser<E> mCreator;
+		private final Object[] mResults;
+		private final int mStart;
+		private final int mEnd;
+		private final CountDownLatch mDone;
+		private int mFailedIndex = -1;
+		private Exception mFailure;
+
+		ListChunk(JSONArray array, JsonParser<E> creator, Object[] results, int start, int end, CountDownLatch done) {
+			mArray = array;
+			mCreator = creator;
+			mResults = results;
+			mStart = start;
+			mEnd = end;
+			mDone = done;
+		}
+
+		public void run() {
+			boolean arrays = mCreator.getElementType() == JsonParser.ARRAY_TYPE;
+			int i = mStart;
+			try {
+				for (; i < mEnd; i++) {
+					if (arrays) {
+						mResults[i] = mCreator.parse(mArray.getJSONArray(i));
+					} else {
+						mResults[i] = mCreator.parse(mArray.getJSONObject(i));
+					}
+				}
+			} catch (Exception e) {
+				mFailedIndex = i;
+				mFailure = e;
+			} finally {
+				if (mDone != null) {
+					mDone.countDown();
+				}
+			}
+		}
+
+		/**
+		 * Throws a JSONException naming the element this slice failed on, if it did.
+		 * Only call this once the slice has run; the latch publishes its results.
+		 */
+		void checkFailure() throws JSONException {
+			if (mFailure != null) {
+				JSONException failure = new JSONException("Element " + mFailedIndex + ": " + mFailure.getMessage());
+				failure.initCause(mFailure);
+				throw failure;
+			}
+		}
+	}
+
+	/**
+	 * Like {@link #parseJsonList(JSONArray, JsonParser)}, but refills
+	 * <code>destination</code> in place if it is an ArrayList.
+	 * @param <E>
+	 * @param array
+	 * @param creator
+	 * @param destination The list to clear and refill, or null.
+	 * @return destination, or a new ArrayList if it couldn't be reused.
+	 * @throws JSONException If parsing of one of the objects fails.
+	 */
+	public static <E> ArrayList<E> parseJsonList(JSONArray array, JsonParser<E> creator, List<E> destination)
+			throws JSONException {
+		return parseJsonList(array, creator, destination, null);
+	}
+
+	/**
+	 * Like {@link #parseJsonList(JSONArray, JsonParser)}, but refills
+	 * <code>destination</code> in place if it is an ArrayList. If a pool is
+	 * given, the elements previously in destination are recycled into it and
+	 * the new elements are parsed into objects obtained from it with
+	 * {@link JsonParser#parse(JSONObject, Object)}.
+	 * @param <E>
+	 * @param array
+	 * @param creator
+	 * @param destination The list to clear and refill, or null.
+	 * @param pool Recycled elements, or null to allocate new ones.
+	 * @return destination, or a new ArrayList if it couldn't be reused.
+	 * @throws JSONException If parsing of one of the objects fails.
+	 */
+	public static <E> ArrayList<E> parseJsonList(JSONArray array, JsonParser<E> creator, List<E> destination,
+			ObjectPool<E> pool) throws JSONException {
+		if (pool != null && destination != null) {
+			pool.recycleAll(destination);
+		}
+		ArrayList<E> list = reuseList(destination);
+		if (array == null) {
+			return list;
+		}
+		int size = array.length();
+		list.ensureCapacity(size);
+		boolean arrays = creator.getElementType() == JsonParser.ARRAY_TYPE;
+		for (int i = 0; i < size; i++) {
+			if (arrays) {
+				list.add(creator.parse(array.getJSONArray(i)));
+			} else if (pool != null) {
+				list.add(creator.parse(array.getJSONObject(i), pool.obtain()));
+			} else {
+				list.add(creator.parse(array.getJSONObject(i)));
+			}
+		}
+		return list;
+	}
+
+	/**
+	 * Returns <code>list</code> emptied if it is an ArrayList, or
+	 * a new ArrayList if it is null or can't be modified.
+	 * @param <E>
+	 * @param list
+	 * @return
+	 */
+	public static <E> ArrayList<E> reuseList(List<E> list) {
+		if (list instanceof ArrayList) {
+			ArrayList<E> arrayList = (ArrayList<E>) list;
+			arrayList.clear();
+			return arrayList;
+		}
+		return new ArrayList<E>();
+	}
+
 	/**
 	 * If object[key] is a valid integer Unix timestamp,
 	 * returns the appropriate Date for that timestamp.
@@ -93,10 +286,614 @@ public class JsonUtil {
 	 * or the empty list if array is null.
 	 */
 	public static List<String> getStringList(JSONArray array) {
-		String[] stringArray = getStringArray(array);
-		if (stringArray == null) return Collections.emptyList();
+		if (array == null) return Collections.emptyList();
+
+		int len = array.length();
+		ArrayList<String> list = new ArrayList<String>(len);
+		for (int i = 0; i < len; i++) {
+			list.add(array.optString(i, null));
+		}
+		return list;
+	}
+
+	/**
+	 * Returns a primitive array of the JSONArray's int values,
+	 * or an empty array if the provided array is null.
+	 * Entries which aren't numbers are read as 0.
+	 * @param array
+	 * @return
+	 */
+	public static int[] getIntArray(JSONArray array) {
+		if (array == null) return new int[0];
+
+		int len = array.length();
+		int[] values = new int[len];
+		for (int i = 0; i < len; i++) {
+			values[i] = array.optInt(i);
+		}
+		return values;
+	}
+
+	/**
+	 * Returns a primitive array of the JSONArray's long values,
+	 * or an empty array if the provided array is null.
+	 * Entries which aren't numbers are read as 0.
+	 * @param array
+	 * @return
+	 */
+	public static long[] getLongArray(JSONArray array) {
+		if (array == null) return new long[0];
+
+		int len = array.length();
+		long[] values = new long[len];
+		for (int i = 0; i < len; i++) {
+			values[i] = array.optLong(i);
+		}
+		return values;
+	}
+
+	/**
+	 * Returns a primitive array of the JSONArray's double values,
+	 * or an empty array if the provided array is null.
+	 * Entries which aren't numbers are read as NaN.
+	 * @param array
+	 * @return
+	 */
+	public static double[] getDoubleArray(JSONArray array) {
+		if (array == null) return new double[0];
+
+		int len = array.length();
+		double[] values = new double[len];
+		for (int i = 0; i < len; i++) {
+			values[i] = array.optDouble(i);
+		}
+		return values;
+	}
+
+	/**
+	 * Returns a primitive array of the JSONArray's float values,
+	 * or an empty array if the provided array is null.
+	 * Entries which aren't numbers are read as NaN.
+	 * @param array
+	 * @return
+	 */
+	public static float[] getFloatArray(JSONArray array) {
+		if (array == null) return new float[0];
+
+		int len = array.length();
+		float[] values = new float[len];
+		for (int i = 0; i < len; i++) {
+			values[i] = (float)array.optDouble(i);
+		}
+		return values;
+	}
 
-		return Arrays.asList(stringArray);
+	/**
+	 * Returns a primitive array of the JSONArray's byte values,
+	 * or an empty array if the provided array is null.
+	 * Entries which aren't numbers are read as 0.
+	 * @param array
+	 * @return
+	 */
+	public static byte[] getByteArray(JSONArray array) {
+		if (array == null) return new byte[0];
+
+		int len = array.length();
+		byte[] values = new byte[len];
+		for (int i = 0; i < len; i++) {
+			values[i] = (byte)array.optInt(i);
+		}
+		return values;
+	}
+
+	/**
+	 * Returns a primitive array of the JSONArray's boolean values,
+	 * or an empty array if the provided array is null.
+	 * Entries which aren't booleans are read as false.
+	 * @param array
+	 * @return
+	 */
+	public static boolean[] getBooleanArray(JSONArray array) {
+		if (array == null) return new boolean[0];
+
+		int len = array.length();
+		boolean[] values = new boolean[len];
+		for (int i = 0; i < len; i++) {
+			values[i] = array.optBoolean(i);
+		}
+		return values;
+	}
+
+	/**
+	 * Returns a JSONArray holding each element of <code>array</code>,
+	 * which must be an array of primitives or Strings.
+	 * @param array
+	 * @return
+	 * @throws JSONException If the array contains a non-finite number.
+	 */
+	public static JSONArray toJsonArray(Object array) throws JSONException {
+		JSONArray json = new JSONArray();
+		int len = Array.getLength(array);
+		for (int i = 0; i < len; i++) {
+			json.put(Array.get(array, i));
+		}
+		return json;
+	}
+
+	/**
+	 * Like {@link #getStringList(JSONArray)}, but refills
+	 * <code>destination</code> in place if it is an ArrayList.
+	 * @param array
+	 * @param destination The list to clear and refill, or null.
+	 * @return destination, or a new ArrayList if it couldn't be reused.
+	 */
+	public static ArrayList<String> getStringList(JSONArray array, List<String> destination) {
+		ArrayList<String> list = reuseList(destination);
+		if (array == null) {
+			return list;
+		}
+		int len = array.length();
+		list.ensureCapacity(len);
+		for (int i = 0; i < len; i++) {
+			list.add(array.optString(i, null));
+		}
+		return list;
+	}
+
+	/**
+	 * Streaming version of {@link #parseJsonList(JSONArray, JsonParser)}: reads
+	 * the next value from <code>reader</code>, which must be an array or null,
+	 * parsing each element with <code>creator</code>.
+	 * @param <E>
+	 * @param reader
+	 * @param creator
+	 * @return An ArrayList of new objects created by <code>creator</code>,
+	 * or the empty list if the value is null.
+	 * @throws IOException If reading one of the objects fails.
+	 */
+	public static <E> ArrayList<E> parseJsonList(JsonReader reader, JsonParser<E> creator) throws IOException {
+		ArrayList<E> list = new ArrayList<E>();
+		if (reader.peek() == JsonToken.NULL) {
+			reader.nextNull();
+			return list;
+		}
+		reader.beginArray();
+		while (reader.hasNext()) {
+			if (reader.peek() == JsonToken.NULL) {
+				reader.nextNull();
+				list.add(null);
+			} else {
+				list.add(creator.parse(reader));
+			}
+		}
+		reader.endArray();
+		return list;
+	}
+
+	/**
+	 * Like {@link #parseJsonList(JsonReader, JsonParser)}, but refills
+	 * <code>destination</code> in place if it is an ArrayList.
+	 * @param <E>
+	 * @param reader
+	 * @param creator
+	 * @param destination The list to clear and refill, or null.
+	 * @return destination, or a new ArrayList if it couldn't be reused.
+	 * @throws IOException If reading one of the objects fails.
+	 */
+	public static <E> ArrayList<E> parseJsonList(JsonReader reader, JsonParser<E> creator, List<E> destination)
+			throws IOException {
+		ArrayList<E> list = reuseList(destination);
+		if (reader.peek() == JsonToken.NULL) {
+			reader.nextNull();
+			return list;
+		}
+		reader.beginArray();
+		while (reader.hasNext()) {
+			if (reader.peek() == JsonToken.NULL) {
+				reader.nextNull();
+				list.add(null);
+			} else {
+				list.add(creator.parse(reader));
+			}
+		}
+		reader.endArray();
+		return list;
+	}
+
+	/**
+	 * Streaming version of {@link #parseTimestamp(JSONObject, String)}: reads the
+	 * next value from <code>reader</code> as a Unix timestamp.
+	 * @param reader
+	 * @return The Date for the timestamp, or null if the value is null.
+	 * @throws IOException
+	 */
+	public static Date parseTimestamp(JsonReader reader) throws IOException {
+		if (reader.peek() == JsonToken.NULL) {
+			reader.nextNull();
+			return null;
+		}
+		return new Date(reader.nextLong() * 1000L);
+	}
+
+	/**
+	 * Streaming version of {@link #getStringList(JSONArray)}: reads the next
+	 * value from <code>reader</code>, which must be an array or null.
+	 * Null entries in the array are preserved as <code>null</code>.
+	 * @param reader
+	 * @return An ArrayList of the elements of the array converted to strings,
+	 * or the empty list if the value is null.
+	 * @throws IOException
+	 */
+	public static List<String> getStringList(JsonReader reader) throws IOException {
+		if (reader.peek() == JsonToken.NULL) {
+			reader.nextNull();
+			return Collections.emptyList();
+		}
+		List<String> list = new ArrayList<String>();
+		reader.beginArray();
+		while (reader.hasNext()) {
+			if (reader.peek() == JsonToken.NULL) {
+				reader.nextNull();
+				list.add(null);
+			} else {
+				list.add(reader.nextString());
+			}
+		}
+		reader.endArray();
+		return list;
+	}
+
+	/**
+	 * Like {@link #getStringList(JsonReader)}, but refills
+	 * <code>destination</code> in place if it is an ArrayList.
+	 * @param reader
+	 * @param destination The list to clear and refill, or null.
+	 * @return destination, or a new ArrayList if it couldn't be reused.
+	 * @throws IOException
+	 */
+	public static ArrayList<String> getStringList(JsonReader reader, List<String> destination) throws IOException {
+		ArrayList<String> list = reuseList(destination);
+		if (reader.peek() == JsonToken.NULL) {
+			reader.nextNull();
+			return list;
+		}
+		reader.beginArray();
+		while (reader.hasNext()) {
+			if (reader.peek() == JsonToken.NULL) {
+				reader.nextNull();
+				list.add(null);
+			} else {
+				list.add(reader.nextString());
+			}
+		}
+		reader.endArray();
+		return list;
+	}
+
+	/**
+	 * Streaming version of {@link #getIntArray(JSONArray)}: reads the next value
+	 * from <code>reader</code>, which must be an array or null, straight into a
+	 * primitive array without boxing the elements.
+	 * @param reader
+	 * @return The array's values, or an empty array if the value is null.
+	 * @throws IOException
+	 */
+	public static int[] getIntArray(JsonReader reader) throws IOException {
+		if (reader.peek() == JsonToken.NULL) {
+			reader.nextNull();
+			return new int[0];
+		}
+		int[] values = new int[16];
+		int size = 0;
+		reader.beginArray();
+		while (reader.hasNext()) {
+			if (size == values.length) {
+				values = Arrays.copyOf(values, size * 2);
+			}
+			values[size++] = reader.nextInt();
+		}
+		reader.endArray();
+		return Arrays.copyOf(values, size);
+	}
+
+	/**
+	 * Streaming version of {@link #getLongArray(JSONArray)}.
+	 * @param reader
+	 * @return The array's values, or an empty array if the value is null.
+	 * @throws IOException
+	 */
+	public static long[] getLongArray(JsonReader reader) throws IOException {
+		if (reader.peek() == JsonToken.NULL) {
+			reader.nextNull();
+			return new long[0];
+		}
+		long[] values = new long[16];
+		int size = 0;
+		reader.beginArray();
+		while (reader.hasNext()) {
+			if (size == values.length) {
+				values = Arrays.copyOf(values, size * 2);
+			}
+			values[size++] = reader.nextLong();
+		}
+		reader.endArray();
+		return Arrays.copyOf(values, size);
+	}
+
+	/**
+	 * Streaming version of {@link #getDoubleArray(JSONArray)}.
+	 * @param reader
+	 * @return The array's values, or an empty array if the value is null.
+	 * @throws IOException
+	 */
+	public static double[] getDoubleArray(JsonReader reader) throws IOException {
+		if (reader.peek() == JsonToken.NULL) {
+			reader.nextNull();
+			return new double[0];
+		}
+		double[] values = new double[16];
+		int size = 0;
+		reader.beginArray();
+		while (reader.hasNext()) {
+			if (size == values.length) {
+				values = Arrays.copyOf(values, size * 2);
+			}
+			values[size++] = reader.nextDouble();
+		}
+		reader.endArray();
+		return Arrays.copyOf(values, size);
+	}
+
+	/**
+	 * Streaming version of {@link #getFloatArray(JSONArray)}.
+	 * @param reader
+	 * @return The array's values, or an empty array if the value is null.
+	 * @throws IOException
+	 */
+	public static float[] getFloatArray(JsonReader reader) throws IOException {
+		if (reader.peek() == JsonToken.NULL) {
+			reader.nextNull();
+			return new float[0];
+		}
+		float[] values = new float[16];
+		int size = 0;
+		reader.beginArray();
+		while (reader.hasNext()) {
+			if (size == values.length) {
+				values = Arrays.copyOf(values, size * 2);
+			}
+			values[size++] = (float)reader.nextDouble();
+		}
+		reader.endArray();
+		return Arrays.copyOf(values, size);
+	}
+
+	/**
+	 * Streaming version of {@link #getByteArray(JSONArray)}.
+	 * @param reader
+	 * @return The array's values, or an empty array if the value is null.
+	 * @throws IOException
+	 */
+	public static byte[] getByteArray(JsonReader reader) throws IOException {
+		if (reader.peek() == JsonToken.NULL) {
+			reader.nextNull();
+			return new byte[0];
+		}
+		byte[] values = new byte[16];
+		int size = 0;
+		reader.beginArray();
+		while (reader.hasNext()) {
+			if (size == values.length) {
+				values = Arrays.copyOf(values, size * 2);
+			}
+			values[size++] = (byte)reader.nextInt();
+		}
+		reader.endArray();
+		return Arrays.copyOf(values, size);
+	}
+
+	/**
+	 * Streaming version of {@link #getBooleanArray(JSONArray)}.
+	 * @param reader
+	 * @return The array's values, or an empty array if the value is null.
+	 * @throws IOException
+	 */
+	public static boolean[] getBooleanArray(JsonReader reader) throws IOException {
+		if (reader.peek() == JsonToken.NULL) {
+			reader.nextNull();
+			return new boolean[0];
+		}
+		boolean[] values = new boolean[16];
+		int size = 0;
+		reader.beginArray();
+		while (reader.hasNext()) {
+			if (size == values.length) {
+				values = Arrays.copyOf(values, size * 2);
+			}
+			values[size++] = reader.nextBoolean();
+		}
+		reader.endArray();
+		return Arrays.copyOf(values, size);
+	}
+
+	/**
+	 * Streaming version of {@link #getStringArray(JSONArray)}.
+	 * Null entries in the array are preserved as <code>null</code>.
+	 * @param reader
+	 * @return The array's values, or an empty array if the value is null.
+	 * @throws IOException
+	 */
+	public static String[] getStringArray(JsonReader reader) throws IOException {
+		List<String> list = getStringList(reader);
+		return list.toArray(new String[list.size()]);
+	}
+
+	/**
+	 * Writes <code>list</code> as the next value of <code>writer</code>,
+	 * an array with each element written by its writeJson().
+	 * @param writer
+	 * @param list
+	 * @throws IOException
+	 */
+	public static void writeJsonList(JsonWriter writer, List<? extends JsonWritable> list) throws IOException {
+		if (list == null) {
+			writer.nullValue();
+			return;
+		}
+		writer.beginArray();
+		for (int i = 0, size = list.size(); i < size; i++) {
+			JsonWritable element = list.get(i);
+			if (element == null) {
+				writer.nullValue();
+			} else {
+				element.writeJson(writer);
+			}
+		}
+		writer.endArray();
+	}
+
+	/**
+	 * Writes <code>list</code> as the next value of <code>writer</code>, an array of strings.
+	 * @param writer
+	 * @param list
+	 * @throws IOException
+	 */
+	public static void writeStringList(JsonWriter writer, List<String> list) throws IOException {
+		if (list == null) {
+			writer.nullValue();
+			return;
+		}
+		writer.beginArray();
+		for (int i = 0, size = list.size(); i < size; i++) {
+			writer.value(list.get(i));
+		}
+		writer.endArray();
+	}
+
+	/**
+	 * Writes <code>array</code> as the next value of <code>writer</code>.
+	 * @param writer
+	 * @param array
+	 * @throws IOException
+	 */
+	public static void writeJsonArray(JsonWriter writer, int[] array) throws IOException {
+		if (array == null) {
+			writer.nullValue();
+			return;
+		}
+		writer.beginArray();
+		for (int i = 0; i < array.length; i++) {
+			writer.value(array[i]);
+		}
+		writer.endArray();
+	}
+
+	/**
+	 * Writes <code>array</code> as the next value of <code>writer</code>.
+	 * @param writer
+	 * @param array
+	 * @throws IOException
+	 */
+	public static void writeJsonArray(JsonWriter writer, long[] array) throws IOException {
+		if (array == null) {
+			writer.nullValue();
+			return;
+		}
+		writer.beginArray();
+		for (int i = 0; i < array.length; i++) {
+			writer.value(array[i]);
+		}
+		writer.endArray();
+	}
+
+	/**
+	 * Writes <code>array</code> as the next value of <code>writer</code>.
+	 * @param writer
+	 * @param array
+	 * @throws IOException
+	 */
+	public static void writeJsonArray(JsonWriter writer, double[] array) throws IOException {
+		if (array == null) {
+			writer.nullValue();
+			return;
+		}
+		writer.beginArray();
+		for (int i = 0; i < array.length; i++) {
+			writer.value(array[i]);
+		}
+		writer.endArray();
+	}
+
+	/**
+	 * Writes <code>array</code> as the next value of <code>writer</code>.
+	 * @param writer
+	 * @param array
+	 * @throws IOException
+	 */
+	public static void writeJsonArray(JsonWriter writer, float[] array) throws IOException {
+		if (array == null) {
+			writer.nullValue();
+			return;
+		}
+		writer.beginArray();
+		for (int i = 0; i < array.length; i++) {
+			writer.value(array[i]);
+		}
+		writer.endArray();
+	}
+
+	/**
+	 * Writes <code>array</code> as the next value of <code>writer</code>.
+	 * @param writer
+	 * @param array
+	 * @throws IOException
+	 */
+	public static void writeJsonArray(JsonWriter writer, byte[] array) throws IOException {
+		if (array == null) {
+			writer.nullValue();
+			return;
+		}
+		writer.beginArray();
+		for (int i = 0; i < array.length; i++) {
+			writer.value(array[i]);
+		}
+		writer.endArray();
+	}
+
+	/**
+	 * Writes <code>array</code> as the next value of <code>writer</code>.
+	 * @param writer
+	 * @param array
+	 * @throws IOException
+	 */
+	public static void writeJsonArray(JsonWriter writer, boolean[] array) throws IOException {
+		if (array == null) {
+			writer.nullValue();
+			return;
+		}
+		writer.beginArray();
+		for (int i = 0; i < array.length; i++) {
+			writer.value(array[i]);
+		}
+		writer.endArray();
+	}
+
+	/**
+	 * Writes <code>array</code> as the next value of <code>writer</code>.
+	 * @param writer
+	 * @param array
+	 * @throws IOException
+	 */
+	public static void writeJsonArray(JsonWriter writer, String[] array) throws IOException {
+		if (array == null) {
+			writer.nullValue();
+			return;
+		}
+		writer.beginArray();
+		for (int i = 0; i < array.length; i++) {
+			writer.value(array[i]);
+		}
+		writer.endArray();
 	}
 
 }
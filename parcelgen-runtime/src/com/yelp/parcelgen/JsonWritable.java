@@ -0,0 +1,18 @@
+package com.yelp.parcelgen;
+
+import android.util.JsonWriter;
+
+import java.io.IOException;
+
+/**
+ * An object which can write itself as json to a streaming JsonWriter.
+ * Classes generated with do_json_writer and the "jsonreader" json_backend
+ * implement this with the same output as their writeJSON().
+ */
+public interface JsonWritable {
+
+	/**
+	 * Writes this object as the next value of <code>writer</code>.
+	 */
+	void writeJson(JsonWriter writer) throws IOException;
+}
@@ -0,0 +1,52 @@
+package com.yelp.parcelgen;
+
+import java.util.ArrayList;
+import java.util.Collection;
+
+/**
+ * A bounded pool of objects to refill instead of allocating new ones, such as
+ * the elements of a list that is parsed again with
+ * {@link JsonUtil#parseJsonList(org.json.JSONArray, JsonParser, java.util.List, ObjectPool)}.
+ * Only recycle objects nothing else refers to any more.
+ * ObjectPool is not thread safe.
+ *
+ * @param <E> The type of the pooled objects.
+ */
+public class ObjectPool<E> {
+
+	private final ArrayList<E> mPool;
+	private final int mMaxSize;
+
+	/**
+	 * @param maxSize The most objects the pool keeps; any more are
+	 *        left to the garbage collector.
+	 */
+	public ObjectPool(int maxSize) {
+		mPool = new ArrayList<E>(Math.min(maxSize, 16));
+		mMaxSize = maxSize;
+	}
+
+	/**
+	 * @return A recycled object, or null if the pool is empty.
+	 */
+	public E obtain() {
+		int size = mPool.size();
+		return size == 0 ? null : mPool.remove(size - 1);
+	}
+
+	public void recycle(E object) {
+		if (object != null && mPool.size() < mMaxSize) {
+			mPool.add(object);
+		}
+	}
+
+	public void recycleAll(Collection<? extends E> objects) {
+		for (E object : objects) {
+			recycle(object);
+		}
+	}
+
+	public int size() {
+		return mPool.size();
+	}
+}
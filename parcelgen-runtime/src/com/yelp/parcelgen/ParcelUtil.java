@@ -0,0 +1,60 @@
+package com.yelp.parcelgen;
+
+import android.os.Parcel;
+import android.os.Parcelable;
+
+import java.util.ArrayList;
+import java.util.List;
+
+public class ParcelUtil {
+
+	/**
+	 * ParcelUtil consists only of static methods and cannot be instantiated.
+	 */
+	private ParcelUtil() {}
+
+	/**
+	 * Reads a list written by Parcel.writeTypedList() into <code>list</code>,
+	 * which is cleared first, if it is an ArrayList. Otherwise a new ArrayList
+	 * is returned, like Parcel.createTypedArrayList() would.
+	 * @param <E>
+	 * @param source
+	 * @param list The list to refill, or null.
+	 * @param creator
+	 * @return The refilled or new list, or null if a null list was written.
+	 */
+	public static <E> ArrayList<E> readTypedList(Parcel source, List<E> list, Parcelable.Creator<E> creator) {
+		int size = source.readInt();
+		if (size < 0) {
+			return null;
+		}
+		ArrayList<E> result = JsonUtil.reuseList(list);
+		result.ensureCapacity(size);
+		for (int i = 0; i < size; i++) {
+			result.add(source.readInt() != 0 ? creator.createFromParcel(source) : null);
+		}
+		return result;
+	}
+
+	/**
+	 * Reads a list written by Parcel.writeStringList() into <code>list</code>,
+	 * which is cleared first, if it is an ArrayList. Otherwise a new ArrayList
+	 * is returned, like Parcel.createStringArrayList() would.
+	 * @param source
+	 * @param list The list to refill, or null.
+	 * @return The refilled or new list, or null if a null list was written.
+	 */
+	public static ArrayList<String> readStringList(Parcel source, List<String> list) {
+		int size = source.readInt();
+		if (size < 0) {
+			return null;
+		}
+		ArrayList<String> result = JsonUtil.reuseList(list);
+		result.ensureCapacity(size);
+		for (int i = 0; i < size; i++) {
+			result.add(source.readString());
+		}
+		return result;
+	}
+
+}
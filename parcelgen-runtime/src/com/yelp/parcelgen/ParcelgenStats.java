@@ -0,0 +1,53 @@
+package com.yelp.parcelgen;
+
+/**
+ * Receives the timings and sizes reported by classes generated with the
+ * "instrument" option, for building per-class histograms. Install a sink
+ * with {@link Sink#set(ParcelgenStats)}; until then reports are dropped.
+ * Classes generated without the option never report anything.
+ */
+public interface ParcelgenStats {
+
+	int WRITE_PARCEL = 1;
+	int READ_PARCEL = 2;
+	int READ_JSON = 3;
+	int WRITE_JSON = 4;
+
+	/**
+	 * Called after each instrumented operation completes. Times include
+	 * any nested objects the operation wrote or read. This is called on
+	 * whichever thread did the work, so implementations must be thread safe.
+	 * @param type The runtime class of the object.
+	 * @param operation One of WRITE_PARCEL, READ_PARCEL, READ_JSON or WRITE_JSON.
+	 * @param elapsedNanos Time taken, from System.nanoTime().
+	 * @param bytes The number of bytes written to or read from the Parcel,
+	 *        or -1 for json operations.
+	 */
+	void record(Class<?> type, int operation, long elapsedNanos, int bytes);
+
+	/**
+	 * Holds the sink instrumented classes report to.
+	 */
+	public static final class Sink {
+
+		private static final ParcelgenStats NONE = new ParcelgenStats() {
+			public void record(Class<?> type, int operation, long elapsedNanos, int bytes) {
+			}
+		};
+
+		private static volatile ParcelgenStats sStats = NONE;
+
+		private Sink() {}
+
+		public static ParcelgenStats get() {
+			return sStats;
+		}
+
+		/**
+		 * Installs stats as the sink, or restores the no-op sink if it is null.
+		 */
+		public static void set(ParcelgenStats stats) {
+			sStats = stats == null ? NONE : stats;
+		}
+	}
+}
@@ -0,0 +1,45 @@
+package com.yelp.parcelgen;
+
+import java.io.IOException;
+
+/**
+ * Thrown by DataStreamable.readFrom() when the data was written by a version
+ * of the class with different members. Disk caches should discard the entry.
+ */
+public class StaleDataException extends IOException {
+
+	private static final long serialVersionUID = 1L;
+
+	private final Class<?> mType;
+	private final long mFingerprint;
+	private final long mExpectedFingerprint;
+
+	public StaleDataException(Class<?> type, long fingerprint, long expectedFingerprint) {
+		super(String.format("Stale data for %s: schema %016x, expected %016x",
+				type.getName(), fingerprint, expectedFingerprint));
+		mType = type;
+		mFingerprint = fingerprint;
+		mExpectedFingerprint = expectedFingerprint;
+	}
+
+	/**
+	 * The class whose data was stale.
+	 */
+	public Class<?> getType() {
+		return mType;
+	}
+
+	/**
+	 * The schema fingerprint found in the data.
+	 */
+	public long getFingerprint() {
+		return mFingerprint;
+	}
+
+	/**
+	 * The schema fingerprint of the class reading the data.
+	 */
+	public long getExpectedFingerprint() {
+		return mExpectedFingerprint;
+	}
+}
@@ -0,0 +1,83 @@
+package com.yelp.parcelgen;
+
+import java.lang.ref.WeakReference;
+import java.util.List;
+
+/**
+ * Deduplicates strings which repeat across many objects, such as country codes
+ * or category names, so equal values read from json or Parcels share one String.
+ * Unlike String.intern(), the pool is bounded and only weakly refers to its
+ * strings: it's a fixed size table indexed by hash code, where a new string
+ * replaces whichever string was in its slot, and strings nothing else refers
+ * to any more are garbage collected. Lookups are safe from any thread; at
+ * worst a racing lookup misses and returns its own copy.
+ */
+public class StringPool {
+
+	/**
+	 * The pool used by classes generated with "intern" properties.
+	 */
+	public static final StringPool DEFAULT = new StringPool(2048);
+
+	private final WeakReference<String>[] mSlots;
+	private final int mMask;
+
+	/**
+	 * @param size The number of slots, rounded up to a power of two.
+	 */
+	@SuppressWarnings("unchecked")
+	public StringPool(int size) {
+		int slots = Integer.highestOneBit(Math.max(size - 1, 1)) << 1;
+		mSlots = new WeakReference[slots];
+		mMask = slots - 1;
+	}
+
+	/**
+	 * Returns the pooled string equal to value, or pools and returns value
+	 * itself if there isn't one.
+	 * @param value
+	 * @return An equal String, or null if value is null.
+	 */
+	public String intern(String value) {
+		if (value == null) {
+			return null;
+		}
+		int hash = value.hashCode();
+		int index = (hash ^ (hash >>> 16)) & mMask;
+		WeakReference<String> slot = mSlots[index];
+		String pooled = slot == null ? null : slot.get();
+		if (pooled != null && pooled.equals(value)) {
+			return pooled;
+		}
+		mSlots[index] = new WeakReference<String>(value);
+		return value;
+	}
+
+	/**
+	 * Replaces each element of list with its pooled equal.
+	 * @param list
+	 * @return list
+	 */
+	public <L extends List<String>> L internAll(L list) {
+		if (list != null) {
+			for (int i = 0, size = list.size(); i < size; i++) {
+				list.set(i, intern(list.get(i)));
+			}
+		}
+		return list;
+	}
+
+	/**
+	 * Replaces each element of array with its pooled equal.
+	 * @param array
+	 * @return array
+	 */
+	public String[] internAll(String[] array) {
+		if (array != null) {
+			for (int i = 0; i < array.length; i++) {
+				array[i] = intern(array[i]);
+			}
+		}
+		return array;
+	}
+}
@@ -0,0 +1,49 @@
+package com.yelp.parcelgen;
+
+import android.os.Parcel;
+import android.os.Parcelable;
+
+import org.json.JSONException;
+import org.json.JSONObject;
+
+/**
+ * The superclass of classes generated with the "table" codegen mode. Instead
+ * of code unrolled for each member, they parcel themselves and read json with
+ * the shared loops of their FieldTable, and only provide the table and access
+ * to their members by index.
+ */
+public abstract class TableParcelable implements Parcelable {
+
+	/**
+	 * Returns the table describing this class's members, which is shared by
+	 * every instance.
+	 */
+	protected abstract FieldTable getFieldTable();
+
+	/**
+	 * Returns the member at <code>field</code> in the table, boxed if it's primitive.
+	 */
+	protected abstract Object getField(int field);
+
+	/**
+	 * Sets the member at <code>field</code> in the table to <code>value</code>,
+	 * which is unboxed if the member is primitive.
+	 */
+	protected abstract void setField(int field, Object value);
+
+	public int describeContents() {
+		return 0;
+	}
+
+	public void writeToParcel(Parcel parcel, int flags) {
+		getFieldTable().writeToParcel(this, parcel, flags);
+	}
+
+	public void readFromParcel(Parcel source) {
+		getFieldTable().readFromParcel(this, source);
+	}
+
+	public void readFromJson(JSONObject json) throws JSONException {
+		getFieldTable().readFromJson(this, json);
+	}
+}
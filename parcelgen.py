@@ -2,6 +2,14 @@
 
 import sys, re, os.path, json
 import argparse
+import ctypes, ctypes.util
+import hashlib
+import multiprocessing
+import select
+import struct
+import tempfile
+import time
+import traceback
 import yaml
 from collections import defaultdict
 
@@ -12,31 +20,50 @@ from collections import defaultdict
 
 # Primary Author: Alex Pretzlav <alex@pretzlav.com>
 
+GENERATOR_VERSION = "1.1.0"
+
 
 class ObjectProperty(object):
     """
     A property of an ObjectDescription that includes its name (as returned by the API),
     its type, an optional description, and an optional example value for the property.
     """
-    def __init__(self, name, type_, description='', example='', collection=False):
+    def __init__(self, name, type_, description='', example='', collection=False, intern=False):
         self.name = name
         self.type_ = type_
         self.description = description
         self.example = example
         self.collection = collection
+        self.intern = intern
 
 
 class ParcelGen:
     BASE_IMPORTS = ("android.os.Parcel", "android.os.Parcelable")
     CLASS_STR = "/* package */ abstract class %s implements %s {"
+    TABLE_CLASS_STR = "/* package */ abstract class %s extends TableParcelable implements %s {"
     CHILD_CLASS_STR = "public class {0} extends _{0} {{"
     NATIVE_TYPES = ["string", "byte", "double", "float", "int", "long"]
+    PRIMITIVE_TYPES = ["boolean", "byte", "double", "float", "int", "long"]
+    # Array types Parcel writes and creates in bulk, e.g. writeIntArray() and createIntArray()
+    ARRAY_TYPES = ["boolean[]", "byte[]", "double[]", "float[]", "int[]", "long[]", "String[]"]
+    INTERNABLE_TYPES = ["String", "String[]", "List<String>", "ArrayList<String>"]
     JSON_IMPORTS = ["org.json.JSONException", "org.json.JSONObject"]
+    JSON_READER_IMPORTS = ["android.util.JsonReader", "android.util.JsonToken", "java.io.IOException"]
+    # Ways of reading json: org.json's JSONObject DOM, or also android.util.JsonReader's token stream
+    JSON_BACKENDS = ["org.json", "jsonreader"]
+    # Parcel layouts: one value per member, or booleans packed into bitmasks
+    # and null references recorded in a presence bitmap instead of written
+    PARCEL_LAYOUTS = ["standard", "compact"]
+    # Ways of generating the parcel and json reading code: straight-line code for
+    # each member, or a table of members which the runtime's FieldTable interprets
+    CODEGEN_MODES = ["unrolled", "table"]
+    BOXED_TYPES = {"boolean": "Boolean", "byte": "Byte", "double": "Double", "float": "Float",
+                   "int": "Integer", "long": "Long"}
 
     tablevel = 0
-    outfile = None
 
     def __init__(self):
+        self.buffer = []
         self.props = {}
         self.package = 'org.pretz.parcelgen'
         self.do_json = True
@@ -48,6 +75,35 @@ class ParcelGen:
         self.json_blacklist = []
         self.serializables = []
         self.implements = []
+        self.json_backend = "org.json"
+        self.parcel_layout = "standard"
+        self.codegen = "unrolled"
+        # Decode members which allocate from json when their getter is first called
+        self.lazy_json = False
+        # Report the time and parcel bytes taken by each read and write to ParcelgenStats
+        self.instrument = False
+        # Example values and typical list lengths of members, for estimating parcel sizes
+        self.examples = {}
+        self.list_sizes = {}
+        # Refill existing list members in place when reading instead of allocating new ones
+        self.reuse = False
+        # String members deduplicated through StringPool as they're read
+        self.intern = []
+        # Generate field-wise equals() and a memoized hashCode()
+        self.equals = False
+        # Generate writeTo(DataOutput) and readFrom(DataInput) for disk caches
+        self.data_stream = False
+        # Also generate writeJson(JsonWriter) with do_json_writer, streaming json out
+        self.json_stream_writer = False
+        # Named subsets of members, each read from json by its own reader and creator.
+        # "location.city" selects member location, read with its type's projection
+        # of the same name, which then selects city
+        self.projections = {}
+        # Types which are themselves generated by parcelgen, and can be
+        # parcelled without Parcel.writeParcelable's class name and reflection
+        self.parcelgen_types = set()
+        # The options of those types which their users' generated code depends on
+        self.type_options = {}
         self.from_yaml = False
 
     def tabify(self, string):
@@ -60,10 +116,7 @@ class ParcelGen:
         self.output("\n" * (count-1))
 
     def output(self, string=""):
-        if self.outfile:
-            self.outfile.write(string + "\n")
-        else:
-            print string
+        self.buffer.append(string)
 
     def uptab(self):
         self.tablevel += 1
@@ -87,12 +140,59 @@ class ParcelGen:
             method_name = "get%s%s" % (member[0].capitalize(), member[1:])
         return "\tpublic %s %s() {\n\t\t return %s;\n\t}" % (typ, method_name, self.memberize(member))
 
+    def gen_lazy_getter(self, typ, member):
+        """ Returns a getter which first decodes member if it's still pending from json. """
+        pending, _ = self.pending_bit(member)
+        getter = self.gen_getter(typ, member).split("\n")
+        getter.insert(1, "\t\tif (%s) decodeJson(%d);" % (pending, self.lazy_members().index(member)))
+        return "\n".join(getter)
+
     def list_type(self, typ):
         match = re.match(r"(List|ArrayList)<(.*)>", typ)
         if match:
             return match.group(2)
         return None
 
+    def array_type(self, typ):
+        """ Returns the name Parcel's bulk methods use for the array type typ, or None. """
+        if typ in self.ARRAY_TYPES:
+            return typ[:-2].capitalize()
+        return None
+
+    def gen_stats_start(self, parcel=None):
+        """ Returns the statements an instrumented method starts with. """
+        if not self.instrument:
+            return []
+        lines = [self.tabify("long startTime = System.nanoTime();")]
+        if parcel:
+            lines.append(self.tabify("int startPosition = %s.dataPosition();" % parcel))
+        return lines
+
+    def gen_stats_end(self, operation, parcel=None):
+        """ Returns the statement reporting an instrumented method's operation to ParcelgenStats. """
+        if not self.instrument:
+            return []
+        size = "%s.dataPosition() - startPosition" % parcel if parcel else "-1"
+        return [self.tabify("ParcelgenStats.Sink.get().record(getClass(), ParcelgenStats.%s, System.nanoTime() - startTime, %s);" % (
+            operation, size))]
+
+    def intern_value(self, typ, member, value):
+        """ Returns value, an expression read into member, deduplicated through StringPool if member is interned. """
+        if member not in self.intern:
+            return value
+        if typ not in self.INTERNABLE_TYPES:
+            raise Exception("Can't intern %s %s, only String, String[] and lists of Strings can be interned" % (
+                typ, member))
+        if typ == "String":
+            return "StringPool.DEFAULT.intern(%s)" % value
+        return "StringPool.DEFAULT.internAll(%s)" % value
+
+    def gen_list_reuse_read(self, classname, memberized):
+        """ Returns the expression refilling the list memberized from a Parcel in place. """
+        if classname == "String":
+            return "ParcelUtil.readStringList(source, %s)" % memberized
+        return "ParcelUtil.readTypedList(source, %s, %s.CREATOR)" % (memberized, classname)
+
     def gen_list_parcelable(self, typ, memberized):
         classname = self.list_type(typ)
         if not classname:
@@ -102,14 +202,18 @@ class ParcelGen:
         else:
             return self.tabify("parcel.writeTypedList(%s);" % memberized)
 
-    def gen_list_unparcel(self, typ, memberized):
+    def gen_list_unparcel(self, typ, member):
         classname = self.list_type(typ)
         if not classname:
             return None
-        if (classname == "String"):
-            return self.tabify("%s = source.createStringArrayList();" % memberized)
+        memberized = self.memberize(member)
+        if self.reuse:
+            value = self.gen_list_reuse_read(classname, memberized)
+        elif (classname == "String"):
+            value = "source.createStringArrayList()"
         else:
-            return self.tabify("%s = source.createTypedArrayList(%s.CREATOR);" % (memberized, classname))
+            value = "source.createTypedArrayList(%s.CREATOR)" % classname
+        return self.tabify("%s = %s;" % (memberized, self.intern_value(typ, member, value)))
 
     def gen_parcelable_line(self, typ, member):
         memberized = self.memberize(member)
@@ -120,6 +224,12 @@ class ParcelGen:
                 memberized, memberized))
         elif self.list_type(typ):
             return self.gen_list_parcelable(typ, memberized)
+        elif self.array_type(typ):
+            return self.tabify("parcel.write%sArray(%s);" % (self.array_type(typ), memberized))
+        elif typ in self.parcelgen_types:
+            return "\n".join([
+                self.tabify("parcel.writeInt(%s == null ? 0 : 1);" % memberized),
+                self.tabify("if (%s != null) %s.writeToParcel(parcel, flags);" % (memberized, memberized))])
         elif typ in self.serializables:
             return self.tabify("parcel.writeSerializable(%s);" % memberized)
         else:
@@ -130,21 +240,159 @@ class ParcelGen:
         types.sort()
         return types
 
+    def gen_unparcel(self):
+        if self.parcel_layout == "compact":
+            return self.gen_compact_unparcel()
+        lines = []
+        i = 0
+        for typ in self.get_types():
+            if typ == "boolean":
+                lines.append(self.tabify("boolean[] bools = source.createBooleanArray();"))
+                for j in xrange(len(self.props[typ])):
+                    lines.append(self.tabify("%s = bools[%d];" % (self.memberize(self.props[typ][j]), j)))
+            else:
+                for member in self.props[typ]:
+                    memberized = self.memberize(member)
+                    list_gen = self.gen_list_unparcel(typ, member)
+                    if list_gen:
+                        lines.append(list_gen)
+                    elif typ == "Date":
+                        lines.append(self.tabify("long date%d = source.readLong();" % i))
+                        lines.append(self.tabify("if (date%d != Integer.MIN_VALUE) {" % i))
+                        lines.append(self.tabify("\t%s = new Date(date%d);" % (memberized, i)))
+                        lines.append(self.tabify("}"))
+                        i += 1
+                    elif typ.lower() in self.NATIVE_TYPES:
+                        lines.append(self.tabify("%s = %s;" % (memberized, self.intern_value(
+                            typ, member, "source.read%s()" % typ.capitalize()))))
+                    elif self.array_type(typ):
+                        lines.append(self.tabify("%s = %s;" % (memberized, self.intern_value(
+                            typ, member, "source.create%sArray()" % self.array_type(typ)))))
+                    elif typ in self.parcelgen_types:
+                        lines.append(self.tabify("%s = source.readInt() == 0 ? null : %s.CREATOR.createFromParcel(source);" % (
+                            memberized, typ)))
+                    elif typ in self.serializables:
+                        lines.append(self.tabify("%s = (%s)source.readSerializable();" % (memberized, typ)))
+                    else:
+                        lines.append(self.tabify("%s = source.readParcelable(%s.class.getClassLoader());" % (memberized, typ)))
+        return "\n".join(lines)
+
+    def compact_layout(self):
+        """
+        Splits the members for the compact parcel layout into nullable
+        references, booleans and primitives, each as a list of (type, member).
+        """
+        nullables, booleans, primitives = [], [], []
+        for typ, member in self.member_map():
+            if typ == "boolean":
+                booleans.append((typ, member))
+            elif typ in self.PRIMITIVE_TYPES:
+                primitives.append((typ, member))
+            else:
+                nullables.append((typ, member))
+        return nullables, booleans, primitives
+
+    def bit(self, index):
+        """ Returns the name of the bitmask holding bit index, and the mask for it. """
+        return index / 32, "1 << %d" % (index % 32) if index % 32 else "1"
+
+    def gen_compact_write(self, typ, memberized):
+        """ Writes a value known not to be null in the compact layout. """
+        if typ == "String":
+            return "parcel.writeString(%s);" % memberized
+        elif typ == "Date":
+            return "parcel.writeLong(%s.getTime());" % memberized
+        elif self.list_type(typ):
+            return self.gen_list_parcelable(typ, memberized).strip()
+        elif self.array_type(typ):
+            return "parcel.write%sArray(%s);" % (self.array_type(typ), memberized)
+        elif typ in self.parcelgen_types:
+            return "%s.writeToParcel(parcel, flags);" % memberized
+        elif typ in self.serializables:
+            return "parcel.writeSerializable(%s);" % memberized
+        return "parcel.writeParcelable(%s, flags);" % memberized
+
+    def gen_compact_read(self, typ, memberized):
+        """ Reads a value written by gen_compact_write into memberized. """
+        list_type = self.list_type(typ)
+        if typ == "String":
+            return "source.readString()"
+        elif typ == "Date":
+            return "new Date(source.readLong())"
+        elif list_type and self.reuse:
+            return self.gen_list_reuse_read(list_type, memberized)
+        elif list_type == "String":
+            return "source.createStringArrayList()"
+        elif list_type:
+            return "source.createTypedArrayList(%s.CREATOR)" % list_type
+        elif self.array_type(typ):
+            return "source.create%sArray()" % self.array_type(typ)
+        elif typ in self.parcelgen_types:
+            return "%s.CREATOR.createFromParcel(source)" % typ
+        elif typ in self.serializables:
+            return "(%s)source.readSerializable()" % typ
+        # Cast since readParcelable's type can't be inferred inside a conditional
+        return "(%s)source.readParcelable(%s.class.getClassLoader())" % (typ, typ)
+
+    def gen_compact_parcelable(self):
+        """
+        Writes the compact layout: a bitmap of which nullable members are present,
+        the booleans packed into int bitmasks, then each primitive and each
+        present nullable member. Null members take no space beyond their bit.
+        """
+        nullables, booleans, primitives = self.compact_layout()
+        lines = []
+        for prefix, members, test in (("present", nullables, "%s != null"), ("bools", booleans, "%s")):
+            for mask in xrange((len(members) + 31) / 32):
+                lines.append(self.tabify("int %s%d = 0;" % (prefix, mask)))
+            for index, (typ, member) in enumerate(members):
+                mask, bit = self.bit(index)
+                lines.append(self.tabify("if (%s) %s%d |= %s;" % (
+                    test % self.memberize(member), prefix, mask, bit)))
+            for mask in xrange((len(members) + 31) / 32):
+                lines.append(self.tabify("parcel.writeInt(%s%d);" % (prefix, mask)))
+        for typ, member in primitives:
+            lines.append(self.gen_parcelable_line(typ, member))
+        for typ, member in nullables:
+            memberized = self.memberize(member)
+            lines.append(self.tabify("if (%s != null) %s" % (memberized, self.gen_compact_write(typ, memberized))))
+        return "\n".join(lines)
+
+    def gen_compact_unparcel(self):
+        nullables, booleans, primitives = self.compact_layout()
+        lines = []
+        for prefix, members in (("present", nullables), ("bools", booleans)):
+            for mask in xrange((len(members) + 31) / 32):
+                lines.append(self.tabify("int %s%d = source.readInt();" % (prefix, mask)))
+        for index, (typ, member) in enumerate(booleans):
+            mask, bit = self.bit(index)
+            lines.append(self.tabify("%s = (bools%d & %s) != 0;" % (self.memberize(member), mask, bit)))
+        for typ, member in primitives:
+            lines.append(self.tabify("%s = source.read%s();" % (self.memberize(member), typ.capitalize())))
+        for index, (typ, member) in enumerate(nullables):
+            mask, bit = self.bit(index)
+            lines.append(self.tabify("%s = (present%d & %s) != 0 ? %s : null;" % (
+                self.memberize(member), mask, bit,
+                self.intern_value(typ, member, self.gen_compact_read(typ, self.memberize(member))))))
+        return "\n".join(lines)
+
     def gen_parcelable(self):
-        result = ""
+        if self.parcel_layout == "compact":
+            return self.gen_compact_parcelable()
+        lines = []
         for typ in self.get_types():
             if typ == "boolean":
                 joined = ", ".join(map(self.memberize, self.props[typ]))
-                result += self.tabify("parcel.writeBooleanArray(new boolean[] {%s});\n" % joined)
+                lines.append(self.tabify("parcel.writeBooleanArray(new boolean[] {%s});" % joined))
             else:
                 for member in self.props[typ]:
-                    result += self.gen_parcelable_line(typ, member) + "\n"
-        return result[:-1] # Strip last newline because I'm too lazy to do this right
+                    lines.append(self.gen_parcelable_line(typ, member))
+        return "\n".join(lines)
 
-    def print_creator(self, class_name, parcel_class, close=True):
+    def print_creator(self, class_name, parcel_class, close=True, field="CREATOR"):
         # Simple parcelable creator that uses readFromParcel
-        self.printtab("public static final {0}<{1}> CREATOR = new {0}<{1}>() {{".format(
-                 parcel_class, class_name))
+        self.printtab("public static final {0}<{1}> {2} = new {0}<{1}>() {{".format(
+                 parcel_class, class_name, field))
         self.uptab()
         self.newline()
         self.printtab("public {0}[] newArray(int size) {{\n{1}return new {0}[size];\n\t\t}}".format(
@@ -169,6 +417,8 @@ class ParcelGen:
         if self.do_json:
             imports.extend(self.JSON_IMPORTS)
             imports.append("com.yelp.parcelgen.JsonParser.DualCreator")
+            if self.json_backend == "jsonreader":
+                imports.extend(["android.util.JsonReader", "java.io.IOException"])
         else:
             imports.append("android.os.Parcelable")
         for import_string in imports:
@@ -178,32 +428,77 @@ class ParcelGen:
         self.newline()
         self.uptab()
         if self.do_json:
-            self.print_creator(child_name, "DualCreator", False)
-            self.newline()
+            self.print_json_creator(child_name)
+        else:
+            self.print_creator(child_name, "Parcelable.Creator")
+        self.downtab()
+        self.printtab("}")
+
+    @staticmethod
+    def has_generated_creator(options):
+        """
+        Returns whether a class with options has GENERATED_CREATOR in its _X: a copy
+        of its CREATOR which the code reading it nested in other classes uses. The
+        editable subclass and its CREATOR are only written once, so they lack the
+        parse methods of reuse or jsonreader if those were enabled later.
+        """
+        return options["do_json"] and (options["reuse"] or options["json_backend"] == "jsonreader")
+
+    def nested_creator(self, typ):
+        """ Returns the field of the parcelgen type typ that its nested objects are read from json with. """
+        options = self.type_options.get(typ)
+        if options and self.has_generated_creator(options):
+            return "GENERATED_CREATOR"
+        return "CREATOR"
+
+    def print_json_creator(self, child_name, field="CREATOR"):
+        """ Prints the DualCreator with the parse methods of the json options. """
+        self.print_creator(child_name, "DualCreator", False, field)
+        self.newline()
+        self.printtab("@Override")
+        self.printtab("public %s parse(JSONObject obj) throws JSONException {" % child_name)
+        self.uptab()
+        self.printtab("{0} newInstance = new {0}();".format(child_name))
+        self.printtab("newInstance.readFromJson(obj);")
+        self.printtab("return newInstance;")
+        self.downtab()
+        if self.reuse:
+            self.printtab("}\n")
+            self.printtab("@Override")
+            self.printtab("public {0} parse(JSONObject obj, {0} reuse) throws JSONException {{".format(child_name))
+            self.uptab()
+            self.printtab("{0} instance = reuse != null ? reuse : new {0}();".format(child_name))
+            self.printtab("instance.readFromJson(obj);")
+            self.printtab("return instance;")
+            self.downtab()
+        if self.json_backend == "jsonreader":
+            self.printtab("}\n")
             self.printtab("@Override")
-            self.printtab("public %s parse(JSONObject obj) throws JSONException {" % child_name)
+            self.printtab("public %s parse(JsonReader reader) throws IOException {" % child_name)
             self.uptab()
             self.printtab("{0} newInstance = new {0}();".format(child_name))
-            self.printtab("newInstance.readFromJson(obj);")
+            self.printtab("newInstance.readFromJson(reader);")
             self.printtab("return newInstance;")
             self.downtab()
-            self.printtab("}\n\t};\n")
-            self.downtab()
-        else:
-            self.print_creator(child_name, "Parcelable.Creator")
+        self.printtab("}\n\t};\n")
         self.downtab()
-        self.printtab("}")
 
     def needs_jsonutil(self):
         if "Date" in self.props:
             return True
         for key in self.props.keys():
-            if "List" in key:
+            if "List" in key or self.array_type(key):
                 return True
         return False
 
     def print_gen(self, class_name):
         self.tablevel = 0
+        members = [member for typ, member in self.member_map()]
+        for member in self.intern:
+            if member not in members:
+                raise Exception("Can't intern %s, it isn't a property of %s" % (member, class_name))
+        if self.codegen == "table" and self.table_conflicts():
+            raise Exception("%s can't use codegen table with %s" % (class_name, ", ".join(self.table_conflicts())))
         # Imports and open class definition
         self.printtab("package %s;\n" % self.package)
         imports = set(tuple(self.imports) + self.BASE_IMPORTS)
@@ -219,10 +514,37 @@ class ParcelGen:
 
         if self.do_json:
             imports.update(self.JSON_IMPORTS)
+            if self.json_backend == "jsonreader":
+                imports.update(self.JSON_READER_IMPORTS)
             if self.needs_jsonutil():
                 imports.add("com.yelp.parcelgen.JsonUtil")
         if 'Serializable' in self.implements:
             imports.add("java.io.Serializable")
+        if self.instrument:
+            imports.add("com.yelp.parcelgen.ParcelgenStats")
+        if self.reuse and any(self.list_type(typ) for typ in self.props):
+            imports.add("com.yelp.parcelgen.ParcelUtil")
+        if self.intern:
+            imports.add("com.yelp.parcelgen.StringPool")
+        if self.equals and any(self.array_type(typ) for typ in self.props):
+            imports.add("java.util.Arrays")
+        if self.projections or self.has_generated_creator(vars(self)):
+            imports.add("com.yelp.parcelgen.JsonParser.DualCreator")
+        if self.codegen == "table":
+            imports.update(["com.yelp.parcelgen.FieldTable", "com.yelp.parcelgen.TableParcelable"])
+        if self.data_stream:
+            imports.update(["java.io.DataInput", "java.io.DataOutput", "java.io.IOException",
+                            "com.yelp.parcelgen.DataStreamable", "com.yelp.parcelgen.DataStreamUtil"])
+            if any(typ.startswith("List<") and self.list_type(typ) != "String" for typ in self.props):
+                imports.add("java.util.ArrayList")
+            if self.reuse and any(self.stream_kind(typ, member) == "list" for typ, member in self.stream_members()):
+                imports.add("com.yelp.parcelgen.JsonUtil")
+        if self.do_json_writer and any(self.list_type(typ) for typ in self.props):
+            imports.add("org.json.JSONArray")
+        if self.has_json_stream_writer():
+            imports.update(["android.util.JsonWriter", "java.io.IOException", "com.yelp.parcelgen.JsonWritable"])
+            if self.needs_jsonutil():
+                imports.add("com.yelp.parcelgen.JsonUtil")
         imports = list(imports)
         imports.sort()
 
@@ -235,8 +557,14 @@ class ParcelGen:
         self.printtab(" *    %s's PARCELABLE DESCRIPTION IS CHANGED." % class_name)
         self.printtab(" */")
 
-        implements = ", ".join(['Parcelable'] + self.implements)
-        self.printtab((self.CLASS_STR % (class_name, implements)) + "\n")
+        implements = ['Parcelable'] + self.implements
+        if self.has_json_stream_writer():
+            implements.insert(1, 'JsonWritable')
+        if self.data_stream:
+            implements.insert(1, 'DataStreamable')
+        implements = ", ".join(implements)
+        class_str = self.TABLE_CLASS_STR if self.codegen == "table" else self.CLASS_STR
+        self.printtab((class_str % (class_name, implements)) + "\n")
 
         # Protected member variables
         self.uptab()
@@ -244,6 +572,13 @@ class ParcelGen:
             if member in self.transient:
                 typ = "transient " + typ
             self.printtab("protected %s %s;" % (typ, self.memberize(member)))
+        lazy_members = self.lazy_members()
+        if lazy_members:
+            self.printtab("private transient JSONObject mJsonSource;")
+            for mask in xrange((len(lazy_members) + 31) / 32):
+                self.printtab("private transient volatile int mJsonPending%d;" % mask)
+        if self.equals:
+            self.printtab("private transient int mHashCode;")
         self.output("")
 
         # Parameterized Constructor
@@ -269,129 +604,814 @@ class ParcelGen:
     
         # Getters for member variables
         for typ, member in self.member_map():
-            self.output(self.gen_getter(typ, member))
+            if member in lazy_members:
+                self.output(self.gen_lazy_getter(typ, member))
+            else:
+                self.output(self.gen_getter(typ, member))
         self.output("\n")
 
-        # Parcelable writeToParcel
-        self.printtab("public int describeContents() {\n\t\treturn 0;\n\t}")
-        self.output("")
-        self.printtab("public void writeToParcel(Parcel parcel, int flags) {")
-        self.uptab()
-        self.output(self.gen_parcelable())
-        self.downtab()
-        self.printtab("}\n")
+        if self.codegen == "table":
+            # The methods inherited from TableParcelable parcel and read json through the table
+            self.output(self.generate_field_table(class_name))
+        else:
+            # Parcelable writeToParcel
+            self.printtab("public int describeContents() {\n\t\treturn 0;\n\t}")
+            self.output("")
+            self.printtab("public void writeToParcel(Parcel parcel, int flags) {")
+            self.uptab()
+            if lazy_members:
+                self.printtab("materializeJson();")
+            self.buffer.extend(self.gen_stats_start("parcel"))
+            self.output(self.gen_parcelable())
+            self.buffer.extend(self.gen_stats_end("WRITE_PARCEL", "parcel"))
+            self.downtab()
+            self.printtab("}\n")
 
-        # readFromParcel that allows subclasses to use parcelable-ness of their superclass
-        self.printtab("public void readFromParcel(Parcel source) {")
-        self.tablevel += 1
-        i = 0
-        all_members = []
-        for typ in self.get_types():
-            if typ == "boolean":
-                self.printtab("boolean[] bools = source.createBooleanArray();")
-                for j in xrange(len(self.props[typ])):
-                    self.printtab("%s = bools[%d];" % (self.memberize(self.props[typ][j]), j))
-            else:
-                for member in self.props[typ]:
-                    memberized = self.memberize(member)
-                    list_gen = self.gen_list_unparcel(typ, memberized)
-                    if list_gen:
-                        self.output(list_gen)
-                    elif typ == "Date":
-                        self.printtab("long date%d = source.readLong();" % i)
-                        self.printtab("if (date%d != Integer.MIN_VALUE) {" % i)
-                        self.uptab()
-                        self.printtab("%s = new Date(date%d);" % (memberized, i))
-                        self.downtab()
-                        self.printtab("}")
-                        i += 1
-                    elif typ.lower() in self.NATIVE_TYPES:
-                        self.printtab("%s = source.read%s();" % (memberized, typ.capitalize()))
-                    elif typ in self.serializables:
-                        self.printtab("%s = (%s)source.readSerializable();" % (memberized, typ))
-                    else:
-                        self.printtab("%s = source.readParcelable(%s.class.getClassLoader());" % (memberized, typ))
-        self.tablevel -= 1
-        self.printtab("}\n")
+            # readFromParcel that allows subclasses to use parcelable-ness of their superclass
+            self.printtab("public void readFromParcel(Parcel source) {")
+            self.tablevel += 1
+            self.buffer.extend(self.gen_stats_start("source"))
+            if self.equals:
+                self.printtab("mHashCode = 0;")
+            if lazy_members:
+                self.output("\n".join(self.gen_forget_json()))
+            unparcel = self.gen_unparcel()
+            if unparcel:
+                self.output(unparcel)
+            self.buffer.extend(self.gen_stats_end("READ_PARCEL", "source"))
+            self.tablevel -= 1
+            self.printtab("}\n")
 #       self.print_creator(class_name, "Parcelable.Creator")
 
         if self.do_json:
-            self.output(self.generate_json_reader(self.props))
+            if self.codegen != "table":
+                self.output(self.generate_json_reader(self.props))
+            if self.json_backend == "jsonreader":
+                self.output(self.generate_json_stream_reader())
+            if lazy_members:
+                self.output(self.generate_lazy_json(class_name))
+            for projection in sorted(self.projections):
+                self.output(self.generate_projection_reader(class_name, projection))
+                self.print_projection_creator(class_name[1:], projection)
+            if self.has_generated_creator(vars(self)):
+                self.print_json_creator(class_name[1:], "GENERATED_CREATOR")
+        elif self.projections:
+            raise Exception("%s has projections, which need do_json" % class_name)
         if self.do_json_writer:
             self.output(self.generate_json_writer(self.props))
+            if self.has_json_stream_writer():
+                self.output(self.generate_json_stream_writer())
+        if self.data_stream:
+            self.output(self.generate_data_stream(class_name))
+        if self.equals:
+            self.output(self.generate_equals(class_name))
         self.downtab()
         self.printtab("}")
 
+    def table_conflicts(self):
+        """ Returns the enabled options the table codegen mode doesn't support. """
+        conflicts = []
+        if self.parcel_layout != "standard":
+            conflicts.append("parcel_layout %s" % self.parcel_layout)
+        if self.lazy_members():
+            conflicts.append("lazy_json")
+        for option in ("reuse", "instrument", "intern", "equals"):
+            if getattr(self, option):
+                conflicts.append(option)
+        return conflicts
+
+    def table_type(self, typ):
+        """ Returns the FieldTable type code of members of type typ, in the order gen_parcelable_line tests them. """
+        list_type = self.list_type(typ)
+        if typ.lower() in self.NATIVE_TYPES or typ in ("boolean", "Date", "Uri"):
+            return typ.upper()
+        elif list_type:
+            return "%s_%s" % ("STRING" if list_type == "String" else "TYPED",
+                              "ARRAY_LIST" if typ.startswith("ArrayList") else "LIST")
+        elif self.array_type(typ):
+            return self.array_type(typ).upper() + "_ARRAY"
+        elif typ in self.parcelgen_types:
+            return "PARCELGEN"
+        elif typ in self.serializables:
+            return "SERIALIZABLE"
+        return "PARCELABLE"
+
+    def table_key(self, member):
+        """ Returns the json key of member as a Java literal, or null if it isn't read from json. """
+        if not self.do_json or member in self.json_blacklist:
+            return "null"
+        return "\"%s\"" % self.json_key(member)
+
+    def table_creator(self, typ, member):
+        """
+        Returns the creator FieldTable parcels or reads members of type typ with,
+        or None if it doesn't need one. FieldTable expects the same members to
+        have one.
+        """
+        code = self.table_type(typ)
+        if code in ("TYPED_LIST", "TYPED_ARRAY_LIST"):
+            return "%s.CREATOR" % self.list_type(typ)
+        elif code == "PARCELGEN" or (code in ("SERIALIZABLE", "PARCELABLE") and self.table_key(member) != "null"):
+            return "%s.CREATOR" % typ
+        return None
+
+    def table_default(self, typ, member):
+        """ Returns the value member takes when it's missing from json, boxed as typ, or null. """
+        # Like gen_json_read, missing lists are read as empty ones even if they have a default
+        if member not in self.default_values or self.table_key(member) == "null" or \
+                self.empty_list(typ) is not None:
+            return "null"
+        if typ in self.PRIMITIVE_TYPES:
+            return "(%s) (%s)" % (typ, self.default_values[member])
+        return str(self.default_values[member])
+
+    def table_array(self, element_type, values, suffix):
+        """ Returns the lines of an array creation expression of values, followed by suffix. """
+        if element_type == "Object" and all(value == "null" for value in values):
+            return [self.tabify("null%s\n" % suffix)]
+        if not values:
+            return [self.tabify("new %s[0]%s\n" % (element_type, suffix))]
+        lines = [self.tabify("new %s[] {\n" % element_type)]
+        self.uptab()
+        row = []
+        for value in values:
+            if row and len(", ".join(row + [value])) > 80:
+                lines.append(self.tabify("%s,\n" % ", ".join(row)))
+                row = []
+            row.append(value)
+        if row:
+            lines.append(self.tabify("%s\n" % ", ".join(row)))
+        self.downtab()
+        lines.append(self.tabify("}%s\n" % suffix))
+        return lines
+
+    def generate_field_table(self, class_name):
+        """
+        Generates the FieldTable which the table codegen mode's inherited methods
+        parcel and read json with, and the accessors they reach members through.
+        """
+        members = list(self.member_map())
+        fun = [self.tabify("private static FieldTable sFieldTable;\n\n")]
+        fun.append(self.tabify("protected FieldTable getFieldTable() {\n"))
+        self.uptab()
+        # Built on first use rather than when the class loads, which also
+        # makes sure the creators of mutually referring classes are set
+        fun.append(self.tabify("if (sFieldTable == null) {\n"))
+        self.uptab()
+        fun.append(self.tabify("sFieldTable = new FieldTable(\n"))
+        self.uptab()
+        fun.extend(self.table_array("byte", ["FieldTable." + self.table_type(typ) for typ, _ in members], ","))
+        fun.extend(self.table_array("String", [self.table_key(member) for _, member in members], ","))
+        creators = [self.table_creator(typ, member) for typ, member in members]
+        fun.extend(self.table_array("Object", [creator for creator in creators if creator], ","))
+        fun.extend(self.table_array("Object", [self.table_default(typ, member) for typ, member in members], ");"))
+        self.downtab()
+        self.downtab()
+        fun.append(self.tabify("}\n"))
+        fun.append(self.tabify("return sFieldTable;\n"))
+        self.downtab()
+        fun.append(self.tabify("}\n\n"))
+
+        fun.append(self.tabify("protected Object getField(int field) {\n"))
+        fun.extend(self.gen_field_switch(class_name, [
+            "return %s;" % self.memberize(member) for _, member in members]))
+        fun.append("\n")
+        fun.append(self.tabify("@SuppressWarnings(\"unchecked\")\n"))
+        fun.append(self.tabify("protected void setField(int field, Object value) {\n"))
+        fun.extend(self.gen_field_switch(class_name, [
+            "%s = (%s) value; break;" % (self.memberize(member), self.BOXED_TYPES.get(typ, typ))
+            for typ, member in members]))
+        return "".join(fun)
+
+    def gen_field_switch(self, class_name, cases):
+        """ Returns the body of an accessor running the statement cases[field], and its closing brace. """
+        self.uptab()
+        fun = [self.tabify("switch (field) {\n")]
+        self.uptab()
+        for index, statement in enumerate(cases):
+            fun.append(self.tabify("case %d: %s\n" % (index, statement)))
+        fun.append(self.tabify("default:\n"))
+        fun.append(self.tabify("\tthrow new IllegalArgumentException(\"%s has no field \" + field);\n" % class_name))
+        self.downtab()
+        fun.append(self.tabify("}\n"))
+        self.downtab()
+        fun.append(self.tabify("}\n"))
+        return fun
+
     def generate_json_reader(self, props):
         self.props = props
-        fun = self.tabify("public void readFromJson(JSONObject json) throws JSONException {\n")
+        fun = [self.tabify("public void readFromJson(JSONObject json) throws JSONException {\n")]
         self.uptab()
+        fun.extend(line + "\n" for line in self.gen_stats_start())
+        if self.equals:
+            fun.append(self.tabify("mHashCode = 0;\n"))
         # Parcelable doesn't support boolean without help, JSON does
         NATIVES = self.NATIVE_TYPES + ["boolean"]
+        lazy_members = self.lazy_members()
         for typ in self.get_types():
-            list_type = self.list_type(typ)
             # Always protect strings with isNull check because JSONObject.optString()
             # returns the string "null" for null strings.    AWESOME.
             protect = typ not in [native for native in NATIVES if native != "String"]
             for member in props[typ]:
                 # Some object members are derived and not stored in JSON
-                if member in self.json_blacklist:
+                if member in self.json_blacklist or member in lazy_members:
                     continue
-                # Some members have different names in JSON
-                if member in self.json_map:
-                    key = self.json_map[member]
-                else:
-                    key = camel_to_under(member)
                 # Need to check if key is defined if we have a default value too
                 if member in self.default_values:
                     protect = True
-                if protect:
-                    fun += self.tabify("if (!json.isNull(\"%s\")) {\n" % key)
-                    self.uptab()
-                fun += self.tabify("%s = " % self.memberize(member))
-                if typ.lower() == "float":
-                    fun += "(float)json.optDouble(\"%s\")" % key
-                elif typ.lower() in NATIVES:
-                    fun += "json.opt%s(\"%s\")" % (typ.capitalize(), key)
-                elif typ == "List<String>":
-                    fun += "JsonUtil.getStringList(json.optJSONArray(\"%s\"))" % key
-                elif typ == "Date":
-                    fun += "JsonUtil.parseTimestamp(json, \"%s\")" % key
-                elif typ == "Uri":
-                    fun += "Uri.parse(json.getString(\"%s\"))" % key
-                elif list_type:
-                    fun += "JsonUtil.parseJsonList(json.optJSONArray(\"%s\"), %s.CREATOR)" % (key, list_type)
-                else:
-                    fun += "%s.CREATOR.parse(json.getJSONObject(\"%s\"))" % (typ, key)
-                fun += ";\n"
-                if protect:
-                    self.downtab()
-                    listmatcher = re.match(r"(?P<list_type>Array)?List(?P<content_type>[<>a-zA-Z0-9_]*)", typ)
-                    if listmatcher is not None:
-                        match_dict = listmatcher.groupdict()
-                        fun += self.tabify("} else {\n")
-                        self.uptab()
-                        fun += self.tabify(("%s = " % self.memberize(member)))
-                        if match_dict['list_type'] is not None and match_dict['content_type'] is not None:
-                            fun += ("new %sList%s()" % (match_dict['list_type'], match_dict['content_type']))
-                        else:
-                            fun += "java.util.Collections.emptyList()"
-                        fun += ";\n"
-                        self.downtab()
-                    elif member in self.default_values:
-                        fun += self.tabify("} else {\n")
-                        self.uptab()
-                        fun += self.tabify(("%s = %s;\n" % (self.memberize(member), self.default_values[member])))
-                        self.downtab()
-                    fun += self.tabify("}\n")
+                fun.extend(self.gen_json_read(typ, member, protect))
+        if lazy_members:
+            # The rest are decoded from the source object by their getters
+            fun.append(self.tabify("mJsonSource = json;\n"))
+            for mask in xrange((len(lazy_members) + 31) / 32):
+                bits = min(len(lazy_members) - mask * 32, 32)
+                fun.append(self.tabify("mJsonPending%d = %s;\n" % (mask, "-1" if bits == 32 else hex((1 << bits) - 1))))
+        fun.extend(line + "\n" for line in self.gen_stats_end("READ_JSON"))
         self.downtab()
-        fun += self.tabify("}\n")
+        fun.append(self.tabify("}\n"))
+        return "".join(fun)
+
+    def gen_json_read(self, typ, member, protect, creator=None):
+        """
+        Returns the statements reading member from the JSONObject json, parsing
+        objects of parcelgen types with their static field creator.
+        """
+        NATIVES = self.NATIVE_TYPES + ["boolean"]
+        list_type = self.list_type(typ)
+        key = self.json_key(member)
+        creator = creator or self.nested_creator(list_type or typ)
+        fun = []
+        if protect:
+            fun.append(self.tabify("if (!json.isNull(\"%s\")) {\n" % key))
+            self.uptab()
+        fun.append(self.tabify("%s = " % self.memberize(member)))
+        if typ.lower() == "float":
+            value = "(float)json.optDouble(\"%s\")" % key
+        elif typ.lower() in NATIVES:
+            value = "json.opt%s(\"%s\")" % (typ.capitalize(), key)
+        elif list_type == "String" and (self.reuse or typ == "ArrayList<String>"):
+            # Without a list to reuse, a null destination gets a new ArrayList
+            destination = self.memberize(member) if self.reuse else "null"
+            value = "JsonUtil.getStringList(json.optJSONArray(\"%s\"), %s)" % (key, destination)
+        elif typ == "List<String>":
+            value = "JsonUtil.getStringList(json.optJSONArray(\"%s\"))" % key
+        elif self.array_type(typ):
+            value = "JsonUtil.get%sArray(json.optJSONArray(\"%s\"))" % (self.array_type(typ), key)
+        elif typ == "Date":
+            value = "JsonUtil.parseTimestamp(json, \"%s\")" % key
+        elif typ == "Uri":
+            value = "Uri.parse(json.getString(\"%s\"))" % key
+        elif list_type and self.reuse:
+            value = "JsonUtil.parseJsonList(json.optJSONArray(\"%s\"), %s.%s, %s)" % (
+                key, list_type, creator, self.memberize(member))
+        elif list_type:
+            value = "JsonUtil.parseJsonList(json.optJSONArray(\"%s\"), %s.%s)" % (key, list_type, creator)
+        elif self.reuse:
+            value = "%s.%s.parse(json.getJSONObject(\"%s\"), %s)" % (typ, creator, key, self.memberize(member))
+        else:
+            value = "%s.%s.parse(json.getJSONObject(\"%s\"))" % (typ, creator, key)
+        fun.append(self.intern_value(typ, member, value))
+        fun.append(";\n")
+        if protect:
+            self.downtab()
+            empty_list = self.empty_list(typ)
+            if empty_list is not None and self.reuse:
+                empty_list = "JsonUtil.reuseList(%s)" % self.memberize(member)
+            if empty_list is None and member not in self.default_values and self.reuse:
+                # A reused object mustn't keep the value of a member its new json lacks
+                fun.append(self.tabify("} else {\n"))
+                fun.append(self.tabify("\t%s = %s;\n" % (self.memberize(member), self.java_default(typ))))
+            if empty_list is not None:
+                fun.append(self.tabify("} else {\n"))
+                self.uptab()
+                fun.append(self.tabify(("%s = %s;\n" % (self.memberize(member), empty_list))))
+                self.downtab()
+            elif member in self.default_values:
+                fun.append(self.tabify("} else {\n"))
+                self.uptab()
+                fun.append(self.tabify(("%s = %s;\n" % (self.memberize(member), self.default_values[member]))))
+                self.downtab()
+            fun.append(self.tabify("}\n"))
         return fun
 
+    def projection_reader(self, projection):
+        """ Returns the name of the method reading the projection from a JSONObject. """
+        return "readFromJson%s%s" % (projection[0].upper(), projection[1:])
+
+    def projection_creator(self, projection):
+        """ Returns the name of the static DualCreator parsing the projection. """
+        return camel_to_under(projection).upper() + "_CREATOR"
+
+    def projection_members(self, class_name, projection):
+        """
+        Returns the (type, member, nested) triples the projection reads, in member
+        order. nested is True if member is only read with its type's projection
+        of the same name rather than in full.
+        """
+        if not re.match(r"[A-Za-z][A-Za-z0-9]*$", projection):
+            raise Exception("Projection name %s of %s isn't a Java identifier" % (projection, class_name))
+        paths = self.projections[projection]
+        if not isinstance(paths, list):
+            raise Exception("Projection %s of %s must be a list of properties" % (projection, class_name))
+        types = dict((member, typ) for typ, member in self.member_map())
+        nested = {}
+        for path in paths:
+            member, _, rest = path.partition(".")
+            if member not in types:
+                raise Exception("Projection %s of %s selects %s, which isn't a property" % (
+                    projection, class_name, path))
+            if member in self.json_blacklist:
+                raise Exception("Projection %s of %s selects %s, which isn't read from json" % (
+                    projection, class_name, path))
+            if rest and TypeRegistry.referenced_type(types[member]) not in self.parcelgen_types:
+                raise Exception("Projection %s of %s selects %s, but %s isn't generated by parcelgen "
+                                "in this project" % (projection, class_name, path, types[member]))
+            # Selecting the member itself reads it in full
+            nested[member] = nested.get(member, True) and bool(rest)
+        return [(typ, member, nested[member]) for typ, member in self.member_map() if member in nested]
+
+    def generate_projection_reader(self, class_name, projection):
+        """ Generates the method reading only the projection's members from a JSONObject. """
+        NATIVES = self.NATIVE_TYPES + ["boolean"]
+        members = self.projection_members(class_name[1:], projection)
+        fun = [self.tabify("public void %s(JSONObject json) throws JSONException {\n" % self.projection_reader(projection))]
+        self.uptab()
+        fun.extend(line + "\n" for line in self.gen_stats_start())
+        if self.equals:
+            fun.append(self.tabify("mHashCode = 0;\n"))
+        if self.lazy_members():
+            # Projected members are read right away
+            fun.extend(line + "\n" for line in self.gen_forget_json())
+        for typ, member, nested in members:
+            protect = typ not in [native for native in NATIVES if native != "String"] or \
+                member in self.default_values
+            creator = self.projection_creator(projection) if nested else None
+            fun.extend(self.gen_json_read(typ, member, protect, creator))
+        fun.extend(line + "\n" for line in self.gen_stats_end("READ_JSON"))
+        self.downtab()
+        fun.append(self.tabify("}\n"))
+        return "".join(fun)
+
+    def print_projection_creator(self, child_name, projection):
+        """ Prints the DualCreator whose parse methods read only the projection. """
+        self.print_creator(child_name, "DualCreator", False, self.projection_creator(projection))
+        self.newline()
+        self.printtab("@Override")
+        self.printtab("public %s parse(JSONObject obj) throws JSONException {" % child_name)
+        self.uptab()
+        self.printtab("{0} newInstance = new {0}();".format(child_name))
+        self.printtab("newInstance.%s(obj);" % self.projection_reader(projection))
+        self.printtab("return newInstance;")
+        self.downtab()
+        if self.reuse:
+            self.printtab("}\n")
+            self.printtab("@Override")
+            self.printtab("public {0} parse(JSONObject obj, {0} reuse) throws JSONException {{".format(child_name))
+            self.uptab()
+            self.printtab("{0} instance = reuse != null ? reuse : new {0}();".format(child_name))
+            self.printtab("instance.%s(obj);" % self.projection_reader(projection))
+            self.printtab("return instance;")
+            self.downtab()
+        self.printtab("}\n\t};\n")
+        self.downtab()
+
+    def java_default(self, typ):
+        """ Returns the value a field of type typ starts out with. """
+        if typ == "boolean":
+            return "false"
+        elif typ in self.PRIMITIVE_TYPES:
+            return "0"
+        return "null"
+
+    def lazy_members(self):
+        """
+        Returns the members readFromJson(JSONObject) leaves to their getters with
+        lazy_json, in the order of their pending bits: everything read from json
+        except primitives and Strings, which cost no more to read than to defer.
+        """
+        if not (self.do_json and self.lazy_json):
+            return []
+        return [member for typ, member in self.member_map()
+                if typ not in self.PRIMITIVE_TYPES and typ != "String" and member not in self.json_blacklist]
+
+    def pending_bit(self, member):
+        """ Returns the test of member's pending bit and the statement clearing it. """
+        mask, bit = self.bit(self.lazy_members().index(member))
+        return ("(mJsonPending%d & %s) != 0" % (mask, bit),
+                "mJsonPending%d &= ~(%s);" % (mask, bit))
+
+    def generate_lazy_json(self, class_name):
+        """
+        Generates the fields and methods lazy_json getters decode their member
+        from the json source with, releasing the source once nothing is pending.
+        Decoding is synchronized, and the pending bits are volatile so a getter
+        that finds its bit clear also sees the member another thread decoded.
+        """
+        lazy_members = self.lazy_members()
+        masks = ["mJsonPending%d" % mask for mask in xrange((len(lazy_members) + 31) / 32)]
+        types = dict((member, typ) for typ, member in self.member_map())
+        fun = [self.tabify("private synchronized void decodeJson(int field) {\n")]
+        self.uptab()
+        fun.append(self.tabify("JSONObject json = mJsonSource;\n"))
+        fun.append(self.tabify("try {\n"))
+        self.uptab()
+        fun.append(self.tabify("switch (field) {\n"))
+        self.uptab()
+        for index, member in enumerate(lazy_members):
+            fun.append(self.tabify("case %d:\n" % index))
+            self.uptab()
+            # Another thread may have decoded it while this one waited for the lock
+            fun.append(self.tabify("if (!(%s)) break;\n" % self.pending_bit(member)[0]))
+            fun.extend(self.gen_json_read(types[member], member, True))
+            fun.append(self.tabify("%s\n" % self.pending_bit(member)[1]))
+            fun.append(self.tabify("break;\n"))
+            self.downtab()
+        self.downtab()
+        fun.append(self.tabify("}\n"))
+        self.downtab()
+        fun.append(self.tabify("} catch (JSONException e) {\n"))
+        fun.append(self.tabify("\tthrow new IllegalStateException(\"Malformed json for %s field \" + field, e);\n" % class_name))
+        fun.append(self.tabify("}\n"))
+        fun.append(self.tabify("if ((%s) == 0) {\n" % " | ".join(masks)))
+        fun.append(self.tabify("\tmJsonSource = null;\n"))
+        fun.append(self.tabify("}\n"))
+        self.downtab()
+        fun.append(self.tabify("}\n\n"))
+        fun.append(self.tabify("/** Decodes every member still pending from the json this object was read from. */\n"))
+        fun.append(self.tabify("protected void materializeJson() {\n"))
+        self.uptab()
+        fun.append(self.tabify("if ((%s) == 0) {\n" % " | ".join(masks)))
+        fun.append(self.tabify("\treturn;\n"))
+        fun.append(self.tabify("}\n"))
+        for index, member in enumerate(lazy_members):
+            fun.append(self.tabify("if (%s) decodeJson(%d);\n" % (self.pending_bit(member)[0], index)))
+        self.downtab()
+        fun.append(self.tabify("}\n"))
+        if 'Serializable' in self.implements:
+            fun.append("\n")
+            fun.append(self.tabify("private void writeObject(java.io.ObjectOutputStream out) throws java.io.IOException {\n"))
+            fun.append(self.tabify("\tmaterializeJson();\n"))
+            fun.append(self.tabify("\tout.defaultWriteObject();\n"))
+            fun.append(self.tabify("}\n"))
+        return "".join(fun)
+
+    def gen_forget_json(self):
+        """ Returns the statements dropping a pending json source, for when members are overwritten. """
+        lazy_members = self.lazy_members()
+        lines = [self.tabify("mJsonSource = null;")]
+        for mask in xrange((len(lazy_members) + 31) / 32):
+            lines.append(self.tabify("mJsonPending%d = 0;" % mask))
+        return lines
+
+    def equality_members(self):
+        """
+        Returns the (type, member) pairs equals() compares, cheapest first:
+        primitives, then other values, then parcelgen objects and lists, whose
+        comparisons recurse.
+        """
+        def cost(pair):
+            typ = pair[0]
+            if typ in self.PRIMITIVE_TYPES:
+                return 0
+            if self.list_type(typ) or typ in self.parcelgen_types:
+                return 2
+            return 1
+        return sorted(self.member_map(), key=cost)
+
+    def gen_equals_test(self, typ, member):
+        """ Returns the expression testing member of this and that for equality. """
+        memberized = self.memberize(member)
+        if typ == "float" or typ == "double":
+            return "%s.compare(%s, that.%s) == 0" % (typ.capitalize(), memberized, memberized)
+        elif typ in self.PRIMITIVE_TYPES:
+            return "{0} == that.{0}".format(memberized)
+        elif self.array_type(typ):
+            return "Arrays.equals({0}, that.{0})".format(memberized)
+        return "({0} == null ? that.{0} == null : {0}.equals(that.{0}))".format(memberized)
+
+    def gen_hash(self, typ, member):
+        """ Returns the expression member contributes to hashCode(), as java.util.Arrays would hash it. """
+        memberized = self.memberize(member)
+        if typ == "boolean":
+            return "(%s ? 1231 : 1237)" % memberized
+        elif typ == "long":
+            return "(int) ({0} ^ ({0} >>> 32))".format(memberized)
+        elif typ == "float":
+            return "Float.floatToIntBits(%s)" % memberized
+        elif typ == "double":
+            return "(int) (Double.doubleToLongBits({0}) ^ (Double.doubleToLongBits({0}) >>> 32))".format(memberized)
+        elif typ in self.PRIMITIVE_TYPES:
+            return memberized
+        elif self.array_type(typ):
+            return "Arrays.hashCode(%s)" % memberized
+        return "({0} == null ? 0 : {0}.hashCode())".format(memberized)
+
+    def generate_equals(self, class_name):
+        """
+        Generates equals() comparing every member, and hashCode(), which is
+        computed once and kept until the object is read again.
+        """
+        members = self.equality_members()
+        lazy = bool(self.lazy_members())
+        fun = [self.tabify("@Override\n")]
+        fun.append(self.tabify("public boolean equals(Object object) {\n"))
+        self.uptab()
+        fun.append(self.tabify("if (this == object) {\n"))
+        fun.append(self.tabify("\treturn true;\n"))
+        fun.append(self.tabify("}\n"))
+        fun.append(self.tabify("if (object == null || getClass() != object.getClass()) {\n"))
+        fun.append(self.tabify("\treturn false;\n"))
+        fun.append(self.tabify("}\n"))
+        fun.append(self.tabify("%s that = (%s) object;\n" % (class_name, class_name)))
+        # Objects whose hashes are already known rarely need comparing field by field
+        fun.append(self.tabify("if (mHashCode != 0 && that.mHashCode != 0 && mHashCode != that.mHashCode) {\n"))
+        fun.append(self.tabify("\treturn false;\n"))
+        fun.append(self.tabify("}\n"))
+        if lazy:
+            fun.append(self.tabify("materializeJson();\n"))
+            fun.append(self.tabify("that.materializeJson();\n"))
+        if members:
+            tests = [self.gen_equals_test(typ, member) for typ, member in members]
+            fun.append(self.tabify("return %s;\n" % ("\n" + self.tabify("\t\t&& ")).join(tests)))
+        else:
+            fun.append(self.tabify("return true;\n"))
+        self.downtab()
+        fun.append(self.tabify("}\n\n"))
+        fun.append(self.tabify("@Override\n"))
+        fun.append(self.tabify("public int hashCode() {\n"))
+        self.uptab()
+        fun.append(self.tabify("int result = mHashCode;\n"))
+        fun.append(self.tabify("if (result == 0) {\n"))
+        self.uptab()
+        if lazy:
+            fun.append(self.tabify("materializeJson();\n"))
+        fun.append(self.tabify("result = 1;\n"))
+        for typ, member in members:
+            fun.append(self.tabify("result = 31 * result + %s;\n" % self.gen_hash(typ, member)))
+        fun.append(self.tabify("mHashCode = result;\n"))
+        self.downtab()
+        fun.append(self.tabify("}\n"))
+        fun.append(self.tabify("return result;\n"))
+        self.downtab()
+        fun.append(self.tabify("}\n\n"))
+        fun.append(self.tabify("/** Forgets the cached hashCode(), for subclasses which change members themselves. */\n"))
+        fun.append(self.tabify("protected void invalidateHashCode() {\n"))
+        fun.append(self.tabify("\tmHashCode = 0;\n"))
+        fun.append(self.tabify("}\n"))
+        return "".join(fun)
+
+    def stream_members(self):
+        """ Returns the (type, member) pairs writeTo(DataOutput) writes, in order: all but transient ones. """
+        return [(typ, member) for typ, member in self.member_map() if member not in self.transient]
+
+    def schema_fingerprint(self):
+        """
+        Returns a Java long literal identifying the members writeTo(DataOutput)
+        writes and how, so data written by another version of the class is detected.
+        Each member's kind is included, since a type can change between being written
+        as a serializable, a parcelgen object or otherwise without being renamed.
+        """
+        schema = ["data_stream 1"] + ["%s %s %s" % (typ, member, self.stream_kind(typ, member))
+                                      for typ, member in self.stream_members()]
+        return "0x%sL" % hashlib.sha1("\n".join(schema)).hexdigest()[:16]
+
+    def nested_option(self, typ, option, default):
+        """ Returns option of the parcelgen type typ, or default if its options aren't known. """
+        return self.type_options.get(typ, {}).get(option, default)
+
+    def stream_kind(self, typ, member):
+        """ Returns how member is written to a DataOutput, raising an Exception if it can't be. """
+        list_type = self.list_type(typ)
+        nested = list_type or typ
+        if nested in self.parcelgen_types and not self.nested_option(nested, "data_stream", True):
+            raise Exception("Can't write %s %s with data_stream: %s doesn't have data_stream itself, "
+                            "add it there or mark %s transient to skip it" % (typ, member, nested, member))
+        if typ in self.PRIMITIVE_TYPES or typ in ("String", "Date", "Uri") or self.array_type(typ):
+            return typ
+        elif list_type == "String":
+            return "List<String>"
+        elif list_type in self.parcelgen_types:
+            return "list"
+        elif list_type is None and typ in self.parcelgen_types:
+            return "object"
+        elif list_type is None and typ in self.serializables:
+            return "serializable"
+        raise Exception("Can't write %s %s with data_stream: only types parcelgen generates, serializables "
+                        "and the built in types can be, mark it transient to skip it" % (typ, member))
+
+    def gen_stream_write(self, typ, member):
+        """ Returns the statement writing member to the DataOutput out. """
+        memberized = self.memberize(member)
+        kind = self.stream_kind(typ, member)
+        if typ in self.PRIMITIVE_TYPES:
+            return "out.write%s(%s);" % (typ.capitalize(), memberized)
+        elif self.array_type(typ):
+            return "DataStreamUtil.writeArray(out, %s);" % memberized
+        elif kind == "List<String>":
+            return "DataStreamUtil.writeStringList(out, %s);" % memberized
+        method = {"list": "List", "object": "Object", "serializable": "Serializable"}.get(kind, typ)
+        return "DataStreamUtil.write%s(out, %s);" % (method, memberized)
+
+    def gen_stream_read(self, typ, member):
+        """ Returns the statements reading member from the DataInput in. """
+        memberized = self.memberize(member)
+        kind = self.stream_kind(typ, member)
+        if typ in self.PRIMITIVE_TYPES:
+            return [self.tabify("%s = in.read%s();" % (memberized, typ.capitalize()))]
+        elif kind == "object":
+            lines = [self.tabify("if (in.readBoolean()) {")]
+            if self.reuse:
+                lines.append(self.tabify("\tif (%s == null) {" % memberized))
+                lines.append(self.tabify("\t\t%s = new %s();" % (memberized, typ)))
+                lines.append(self.tabify("\t}"))
+            else:
+                lines.append(self.tabify("\t%s = new %s();" % (memberized, typ)))
+            lines.append(self.tabify("\t%s.readFrom(in);" % memberized))
+            lines.append(self.tabify("} else {"))
+            lines.append(self.tabify("\t%s = null;" % memberized))
+            lines.append(self.tabify("}"))
+            return lines
+        elif kind == "list":
+            list_type = self.list_type(typ)
+            size = "%sSize" % member
+            lines = [self.tabify("int %s = in.readInt();" % size)]
+            lines.append(self.tabify("if (%s < 0) {" % size))
+            lines.append(self.tabify("\t%s = null;" % memberized))
+            lines.append(self.tabify("} else {"))
+            self.uptab()
+            if self.reuse:
+                lines.append(self.tabify("%s = JsonUtil.reuseList(%s);" % (memberized, memberized)))
+            else:
+                lines.append(self.tabify("%s = new ArrayList<%s>(%s);" % (memberized, list_type, size)))
+            lines.append(self.tabify("for (int i = 0; i < %s; i++) {" % size))
+            lines.append(self.tabify("\t%s element = null;" % list_type))
+            lines.append(self.tabify("\tif (in.readBoolean()) {"))
+            lines.append(self.tabify("\t\telement = new %s();" % list_type))
+            lines.append(self.tabify("\t\telement.readFrom(in);"))
+            lines.append(self.tabify("\t}"))
+            lines.append(self.tabify("\t%s.add(element);" % memberized))
+            lines.append(self.tabify("}"))
+            self.downtab()
+            lines.append(self.tabify("}"))
+            return lines
+        elif self.array_type(typ):
+            value = "DataStreamUtil.read%sArray(in)" % self.array_type(typ)
+        elif kind == "List<String>":
+            value = "DataStreamUtil.readStringList(in)"
+        elif kind == "serializable":
+            value = "(%s) DataStreamUtil.readSerializable(in)" % typ
+        else:
+            value = "DataStreamUtil.read%s(in)" % typ
+        return [self.tabify("%s = %s;" % (memberized, self.intern_value(typ, member, value)))]
+
+    def generate_data_stream(self, class_name):
+        """
+        Generates writeTo(DataOutput) and readFrom(DataInput), a binary format
+        for disk caches which starts with the schema fingerprint and skips
+        transient members like Java serialization does.
+        """
+        lines = [self.tabify("/** Identifies the members writeTo() writes, so stale data is rejected by readFrom(). */")]
+        lines.append(self.tabify("public static final long SCHEMA_FINGERPRINT = %s;" % self.schema_fingerprint()))
+        lines.append("")
+        lines.append(self.tabify("public void writeTo(DataOutput out) throws IOException {"))
+        self.uptab()
+        if self.lazy_members():
+            lines.append(self.tabify("materializeJson();"))
+        lines.append(self.tabify("out.writeLong(SCHEMA_FINGERPRINT);"))
+        for typ, member in self.stream_members():
+            lines.append(self.tabify(self.gen_stream_write(typ, member)))
+        self.downtab()
+        lines.append(self.tabify("}"))
+        lines.append("")
+        lines.append(self.tabify("public void readFrom(DataInput in) throws IOException {"))
+        self.uptab()
+        lines.append(self.tabify("DataStreamUtil.readFingerprint(in, getClass(), SCHEMA_FINGERPRINT);"))
+        if self.equals:
+            lines.append(self.tabify("mHashCode = 0;"))
+        if self.lazy_members():
+            lines.extend(self.gen_forget_json())
+        for typ, member in self.member_map():
+            if member in self.transient:
+                lines.append(self.tabify("%s = %s;" % (self.memberize(member), self.java_default(typ))))
+            else:
+                lines.extend(self.gen_stream_read(typ, member))
+        self.downtab()
+        lines.append(self.tabify("}"))
+        lines.append("")
+        return "\n".join(lines)
+
+    def empty_list(self, typ):
+        """ Returns the expression a missing json list is read as, or None if typ isn't a list. """
+        listmatcher = re.match(r"(?P<list_type>Array)?List(?P<content_type>[<>a-zA-Z0-9_]*)", typ)
+        if listmatcher is None:
+            return None
+        match_dict = listmatcher.groupdict()
+        if match_dict['list_type'] is not None and match_dict['content_type'] is not None:
+            return "new %sList%s()" % (match_dict['list_type'], match_dict['content_type'])
+        return "java.util.Collections.emptyList()"
+
+    def json_key(self, member):
+        # Some members have different names in JSON
+        if member in self.json_map:
+            return self.json_map[member]
+        return camel_to_under(member)
+
+    def gen_json_stream_value(self, typ, member=None):
+        """ Returns the expression reading a value of type typ from a JsonReader into member. """
+        list_type = self.list_type(typ)
+        nested = list_type or typ
+        if self.type_options.get(nested, {}).get("json_backend", "jsonreader") != "jsonreader":
+            raise Exception("Can't read %s %s with json_backend jsonreader: %s doesn't use the jsonreader "
+                            "json_backend itself, set it there too" % (typ, member, nested))
+        creator = "%s.%s" % (nested, self.nested_creator(nested))
+        if list_type and self.reuse and member:
+            # The list was already reused and cleared before the object was read
+            if list_type == "String":
+                return "JsonUtil.getStringList(reader, %s)" % self.memberize(member)
+            return "JsonUtil.parseJsonList(reader, %s, %s)" % (creator, self.memberize(member))
+        if typ in ("boolean", "int", "long", "double"):
+            return "reader.next%s()" % typ.capitalize()
+        elif typ == "float":
+            return "(float)reader.nextDouble()"
+        elif typ == "byte":
+            return "(byte)reader.nextInt()"
+        elif typ == "String":
+            return "reader.nextString()"
+        elif typ == "List<String>":
+            return "JsonUtil.getStringList(reader)"
+        elif typ == "ArrayList<String>":
+            return "JsonUtil.getStringList(reader, null)"
+        elif self.array_type(typ):
+            return "JsonUtil.get%sArray(reader)" % self.array_type(typ)
+        elif typ == "Date":
+            return "JsonUtil.parseTimestamp(reader)"
+        elif typ == "Uri":
+            return "Uri.parse(reader.nextString())"
+        elif list_type:
+            return "JsonUtil.parseJsonList(reader, %s)" % creator
+        return "%s.parse(reader)" % creator
+
+    def generate_json_stream_reader(self):
+        """
+        Generates readFromJson(JsonReader), which reads the object from a token
+        stream with a switch over the field names, skipping unknown fields.
+        Lists and default values are assigned up front, so a field that is
+        missing or null ends up as it would from readFromJson(JSONObject).
+        """
+        fun = [self.tabify("public void readFromJson(JsonReader reader) throws IOException {\n")]
+        self.uptab()
+        fun.extend(line + "\n" for line in self.gen_stats_start())
+        if self.equals:
+            fun.append(self.tabify("mHashCode = 0;\n"))
+        if self.lazy_members():
+            fun.append("\n".join(self.gen_forget_json()) + "\n")
+        cases = []
+        for typ, member in self.member_map():
+            if member in self.json_blacklist:
+                continue
+            if member in self.default_values:
+                fun.append(self.tabify("%s = %s;\n" % (self.memberize(member), self.default_values[member])))
+            elif self.empty_list(typ) is not None and self.reuse:
+                fun.append(self.tabify("{0} = JsonUtil.reuseList({0});\n".format(self.memberize(member))))
+            elif self.empty_list(typ) is not None:
+                fun.append(self.tabify("%s = %s;\n" % (self.memberize(member), self.empty_list(typ))))
+            elif self.reuse:
+                fun.append(self.tabify("%s = %s;\n" % (self.memberize(member), self.java_default(typ))))
+            cases.append((self.json_key(member), typ, member))
+        fun.append(self.tabify("reader.beginObject();\n"))
+        fun.append(self.tabify("while (reader.hasNext()) {\n"))
+        self.uptab()
+        fun.append(self.tabify("String name = reader.nextName();\n"))
+        fun.append(self.tabify("if (reader.peek() == JsonToken.NULL) {\n"))
+        fun.append(self.tabify("\treader.skipValue();\n"))
+        fun.append(self.tabify("\tcontinue;\n"))
+        fun.append(self.tabify("}\n"))
+        fun.append(self.tabify("switch (name) {\n"))
+        self.uptab()
+        for key, typ, member in cases:
+            fun.append(self.tabify("case \"%s\":\n" % key))
+            fun.append(self.tabify("\t%s = %s;\n" % (self.memberize(member),
+                                                    self.intern_value(typ, member, self.gen_json_stream_value(typ, member)))))
+            fun.append(self.tabify("\tbreak;\n"))
+        fun.append(self.tabify("default:\n"))
+        fun.append(self.tabify("\treader.skipValue();\n"))
+        self.downtab()
+        fun.append(self.tabify("}\n"))
+        self.downtab()
+        fun.append(self.tabify("}\n"))
+        fun.append(self.tabify("reader.endObject();\n"))
+        fun.extend(line + "\n" for line in self.gen_stats_end("READ_JSON"))
+        self.downtab()
+        fun.append(self.tabify("}\n"))
+        return "".join(fun)
+
     def generate_json_writer(self, foo):
-        fun = self.tabify("public JSONObject writeJSON() throws JSONException {\n")
+        fun = [self.tabify("public JSONObject writeJSON() throws JSONException {\n")]
         self.uptab()
-        fun += self.tabify("JSONObject json = new JSONObject();\n")
+        if self.lazy_members():
+            fun.append(self.tabify("materializeJson();\n"))
+        fun.extend(line + "\n" for line in self.gen_stats_start())
+        fun.append(self.tabify("JSONObject json = new JSONObject();\n"))
         # Parcelable doesn't support boolean without help, JSON does
         NATIVES = self.NATIVE_TYPES + ["boolean", "String"]
         for typ in self.get_types():
@@ -403,33 +1423,91 @@ class ParcelGen:
                 # Some object members are derived and not stored in JSON
                 if member in self.json_blacklist:
                     continue
-                # Some members have different names in JSON
-                if member in self.json_map:
-                    key = self.json_map[member]
-                else:
-                    key = camel_to_under(member)
+                key = self.json_key(member)
                 if protect:
-                    fun += self.tabify("if (%s != null) {\n" % self.memberize(member))
+                    fun.append(self.tabify("if (%s != null) {\n" % self.memberize(member)))
                     self.uptab()
-                if typ == "List<String>":
-                    fun += self.tabify("// TODO list writing %s\n" % self.memberize(member))
+                if list_type == "String":
+                    fun.append(self.tabify("json.put(\"%s\", new JSONArray(%s));\n" % (key, self.memberize(member))))
                 elif typ == "Date":
-                    fun += self.tabify("json.put(\"%s\", %s.getTime() / 1000);\n" % (key, self.memberize(member)))
+                    fun.append(self.tabify("json.put(\"%s\", %s.getTime() / 1000);\n" % (key, self.memberize(member))))
                 elif typ == "Uri":
-                    fun += self.tabify("json.put(\"%s\", String.valueOf(%s));\n" % (key, self.memberize(member)))
+                    fun.append(self.tabify("json.put(\"%s\", String.valueOf(%s));\n" % (key, self.memberize(member))))
                 elif list_type:
-                    fun += self.tabify("// TODO LIST writing %s \n" % self.memberize(member))
+                    fun.append(self.tabify("JSONArray array = new JSONArray();\n"))
+                    fun.append(self.tabify("for (%s element : %s) {\n" % (list_type, self.memberize(member))))
+                    fun.append(self.tabify("\tarray.put(element == null ? JSONObject.NULL : element.writeJSON());\n"))
+                    fun.append(self.tabify("}\n"))
+                    fun.append(self.tabify("json.put(\"%s\", array);\n" % key))
+                elif self.array_type(typ):
+                    fun.append(self.tabify("json.put(\"%s\", JsonUtil.toJsonArray(%s));\n" % (key, self.memberize(member))))
                 elif typ in NATIVES:
-                    fun += self.tabify("json.put(\"%s\", %s);\n" % (key, self.memberize(member)))
+                    fun.append(self.tabify("json.put(\"%s\", %s);\n" % (key, self.memberize(member))))
                 else:
-                    fun += self.tabify("json.put(\"%s\", %s.writeJSON());\n" % (key, self.memberize(member)))
+                    fun.append(self.tabify("json.put(\"%s\", %s.writeJSON());\n" % (key, self.memberize(member))))
                 if protect:
                     self.downtab()
-                    fun += self.tabify("}\n")
-        fun += self.tabify("return json;\n")
+                    fun.append(self.tabify("}\n"))
+        fun.extend(line + "\n" for line in self.gen_stats_end("WRITE_JSON"))
+        fun.append(self.tabify("return json;\n"))
         self.downtab()
-        fun += self.tabify("}\n")
-        return fun
+        fun.append(self.tabify("}\n"))
+        return "".join(fun)
+
+    def has_json_stream_writer(self):
+        return self.do_json_writer and self.json_stream_writer
+
+    def gen_json_stream_write(self, typ, member):
+        """ Returns the statement writing member, known not to be null, as the value of a JsonWriter's current name. """
+        memberized = self.memberize(member)
+        list_type = self.list_type(typ)
+        nested = self.type_options.get(list_type or typ)
+        if nested and not (nested["do_json_writer"] and nested["json_stream_writer"]):
+            raise Exception("Can't write %s %s with writeJson(JsonWriter): %s isn't JsonWritable, give it "
+                            "do_json_writer and json_stream_writer too, or add %s to json_blacklist" % (
+                                typ, member, list_type or typ, member))
+        if typ in ("String", "boolean", "double", "float", "int", "long", "byte"):
+            return "writer.value(%s);" % memberized
+        elif typ == "Date":
+            return "writer.value(%s.getTime() / 1000);" % memberized
+        elif typ == "Uri":
+            return "writer.value(String.valueOf(%s));" % memberized
+        elif list_type == "String":
+            return "JsonUtil.writeStringList(writer, %s);" % memberized
+        elif list_type:
+            return "JsonUtil.writeJsonList(writer, %s);" % memberized
+        elif self.array_type(typ):
+            return "JsonUtil.writeJsonArray(writer, %s);" % memberized
+        return "%s.writeJson(writer);" % memberized
+
+    def generate_json_stream_writer(self):
+        """
+        Generates writeJson(JsonWriter), which writes the same json as writeJSON()
+        straight to a token stream, without building a JSONObject first.
+        """
+        fun = [self.tabify("public void writeJson(JsonWriter writer) throws IOException {\n")]
+        self.uptab()
+        if self.lazy_members():
+            fun.append(self.tabify("materializeJson();\n"))
+        fun.extend(line + "\n" for line in self.gen_stats_start())
+        fun.append(self.tabify("writer.beginObject();\n"))
+        for typ, member in self.member_map():
+            if member in self.json_blacklist:
+                continue
+            protect = typ not in self.PRIMITIVE_TYPES
+            if protect:
+                fun.append(self.tabify("if (%s != null) {\n" % self.memberize(member)))
+                self.uptab()
+            fun.append(self.tabify("writer.name(\"%s\");\n" % self.json_key(member)))
+            fun.append(self.tabify(self.gen_json_stream_write(typ, member) + "\n"))
+            if protect:
+                self.downtab()
+                fun.append(self.tabify("}\n"))
+        fun.append(self.tabify("writer.endObject();\n"))
+        fun.extend(line + "\n" for line in self.gen_stats_end("WRITE_JSON"))
+        self.downtab()
+        fun.append(self.tabify("}\n"))
+        return "".join(fun)
 
 
 def camel_to_under(member):
@@ -452,14 +1530,23 @@ def config_prop(dic, keypath, default=''):
             return default
     return dic
 
-def read_json(file_path):
+def read_json(file_path, project=None):
     """
     Returns a ParcelGen generator configured for the
     the object described by the json file at file_path.
     """
     with open(file_path, 'rU') as json_file:
         description = json.load(json_file)
+    return json_generator(description, project, file_path)
+
+def json_generator(description, project=None, where=None):
+    """
+    Returns a ParcelGen generator for the parsed json description of an object,
+    which was read from where.
+    """
     generator = ParcelGen()
+    if project:
+        project.apply_settings(generator)
     generator.props = description.get("props") or {}
     generator.package = description.get("package") or None
     imports = description.get("imports") or ()
@@ -478,6 +1565,7 @@ def read_json(file_path):
     # for type_, values in generator.props.iteritems():
     #     for name in values:
     #         object_properties.append(ObjectProperty(name, type_))
+    generator.imports = list(imports)
     generator.json_map = json_map
     generator.json_blacklist = json_blacklist
     generator.serializables = serializables
@@ -488,10 +1576,169 @@ def read_json(file_path):
     else:
         generator.implements = []
     generator.default_values = default_values
+    generator.transient = list(transient)
+    generator.lazy_json = bool(description.get("lazy_json"))
+    generator.list_sizes = description.get("list_sizes") or {}
+    generator.intern = list(description.get("intern") or [])
+    projections = description.get("projections") or {}
+    if not isinstance(projections, dict):
+        raise Exception("projections in %s must map names to lists of properties" % where)
+    generator.projections = projections
+    for option, choices in OPTION_CHOICES.iteritems():
+        if option in description:
+            if description[option] not in choices:
+                raise Exception("Unsupported %s %s in %s" % (option, description[option], where))
+            setattr(generator, option, description[option])
+    return generator
+
+
+class ConfigError(Exception):
+    """ Raised when a parcelgen.yaml config file is malformed. """
+    pass
+
+
+# Types of the settings allowed in a class's entry in the Config section
+CONFIG_KEYS = {
+    'implement': list,
+    'rename': dict,
+    'transient': list,
+    'do_json_writer': bool,
+    'serializables': list,
+    'json_blacklist': list,
+    'default_values': dict,
+    'imports': list,
+    'package': basestring,
+    'json_backend': basestring,
+    'parcel_layout': basestring,
+    'lazy_json': bool,
+    'instrument': bool,
+    'list_sizes': dict,
+    'reuse': bool,
+    'intern': list,
+    'equals': bool,
+    'data_stream': bool,
+    'json_stream_writer': bool,
+    'projections': dict,
+    'codegen': basestring,
+}
+
+# Generation options that can be set in a description, in a class's Config
+# entry or for every class in the Target section, with their allowed values
+OPTION_CHOICES = {
+    'json_backend': ParcelGen.JSON_BACKENDS,
+    'parcel_layout': ParcelGen.PARCEL_LAYOUTS,
+    'instrument': [False, True],
+    'reuse': [False, True],
+    'equals': [False, True],
+    'data_stream': [False, True],
+    'json_stream_writer': [False, True],
+    'codegen': ParcelGen.CODEGEN_MODES,
+}
+
+def load_config(config_file):
+    """ Returns the parsed contents of a parcelgen.yaml config file. """
+    with open(config_file, 'rU') as yaml_config:
+        return yaml.safe_load(yaml_config) or {}
+
+def validate_config(config, config_file=None):
+    """ Raises a ConfigError if the parsed config isn't laid out as parcelgen expects. """
+    where = config_file or "config"
+    if not isinstance(config, dict):
+        raise ConfigError("%s: must be a mapping" % where)
+    for section in ('Target', 'Config'):
+        if not isinstance(config.get(section) or {}, dict):
+            raise ConfigError("%s: %s must be a mapping" % (where, section))
+    for name, obj_config in (config.get('Config') or {}).iteritems():
+        validate_class_config(where, name, obj_config)
+    for option, choices in OPTION_CHOICES.iteritems():
+        value = config_prop(config, 'Target.' + option, default=None)
+        if value is not None and value not in choices:
+            raise ConfigError("%s: Target.%s must be one of %s" % (where, option, ", ".join(map(str, choices))))
+
+def validate_class_config(where, name, obj_config):
+    """ Raises a ConfigError if the Config entry obj_config for the class name is malformed. """
+    if not isinstance(obj_config or {}, dict):
+        raise ConfigError("%s: Config.%s must be a mapping" % (where, name))
+    for key, value in (obj_config or {}).iteritems():
+        if key not in CONFIG_KEYS:
+            raise ConfigError("%s: unknown setting Config.%s.%s" % (where, name, key))
+        if not isinstance(value, CONFIG_KEYS[key]):
+            raise ConfigError("%s: Config.%s.%s must be a %s" % (
+                where, name, key, CONFIG_KEYS[key].__name__))
+        if key in OPTION_CHOICES and value not in OPTION_CHOICES[key]:
+            raise ConfigError("%s: Config.%s.%s must be one of %s" % (
+                where, name, key, ", ".join(map(str, OPTION_CHOICES[key]))))
+
+# Descriptions of several classes in one file, see load_bundle
+BUNDLE_SUFFIXES = ('.bundle.json', '.bundle.yaml')
+
+def is_bundle(file_name):
+    return file_name.endswith(BUNDLE_SUFFIXES)
+
+def load_bundle(file_path):
+    """
+    Returns the classes described by the bundle at file_path as a dictionary
+    with each class's description under 'classes' and their Config entries
+    under 'config'. A json bundle maps class names to json descriptions in
+    its "classes" object; a yaml bundle does the same in its Classes section
+    and may have a Config section laid out like parcelgen.yaml's, whose
+    entries override the project's.
+    """
+    with open(file_path, 'rU') as bundle_file:
+        if file_path.endswith('.json'):
+            document = json.load(bundle_file)
+            sections = ('classes',)
+        else:
+            document = yaml.safe_load(bundle_file)
+            sections = ('Classes', 'Config')
+    if not isinstance(document, dict):
+        raise ConfigError("%s: must be a mapping" % file_path)
+    for section in document:
+        if section not in sections:
+            raise ConfigError("%s: unknown section %s, expected %s" % (file_path, section, " or ".join(sections)))
+    classes = document.get(sections[0])
+    if not classes or not isinstance(classes, dict):
+        raise ConfigError("%s: %s must map class names to descriptions" % (file_path, sections[0]))
+    for name, description in classes.iteritems():
+        if not isinstance(description, dict):
+            raise ConfigError("%s: %s.%s must be a mapping" % (file_path, sections[0], name))
+    config = document.get('Config') or {}
+    if not isinstance(config, dict):
+        raise ConfigError("%s: Config must be a mapping" % file_path)
+    for name, obj_config in config.iteritems():
+        if name not in classes:
+            raise ConfigError("%s: Config.%s is not a class in this bundle" % (file_path, name))
+        validate_class_config(file_path, name, obj_config)
+    return {'classes': classes, 'config': config}
+
+def read_description(file_path, project=None):
+    """
+    Returns a ParcelGen generator for the json or yaml description at file_path,
+    with the types it uses resolved against project's other classes.
+    """
+    generator = parse_description(file_path, project)
+    if project:
+        project.resolve_types(generator, os.path.basename(file_path).split(".")[0])
     return generator
 
+def parse_description(file_path, project=None):
+    """ Returns a ParcelGen generator for the json or yaml description at file_path alone. """
+    if file_path.endswith('json'):
+        return read_json(file_path, project)
+    elif file_path.endswith('yaml'):
+        return read_yaml(file_path, None, project)
+    raise Exception("Unsupported file type: %s" % file_path)
 
-def read_yaml(file_path, config_file):
+def read_yaml(file_path, config_file, project=None):
+    with open(file_path, 'rU') as yaml_file:
+        description = yaml.safe_load(yaml_file)
+    object_name = os.path.basename(file_path).split(".")[0]
+    if project is None and config_file:
+        project = Project(config_file)
+    return yaml_generator(description, object_name, project)
+
+def yaml_generator(description, object_name, project=None):
+    """ Returns a ParcelGen generator for the parsed yaml description of the class object_name. """
     yaml_to_java_types = {
         'Integer': 'int',
         'Boolean': 'boolean',
@@ -507,11 +1754,10 @@ def read_yaml(file_path, config_file):
                 if isinstance(meta, basestring):
                     yield ObjectProperty(name, typ, description=meta)
                 else:
-                    yield ObjectProperty(name, typ, description=meta.get('desc'), example=meta.get('ex'))
+                    yield ObjectProperty(name, typ, description=meta.get('desc'), example=meta.get('ex'),
+                                         intern=meta.get('intern', False))
         else:
             yield ObjectProperty(name, typ)
-    with open(file_path, 'rU') as yaml_file:
-        description = yaml.safe_load(yaml_file)
     object_properties = []
     for type_, values in description.iteritems():
         if isinstance(values, dict):
@@ -519,23 +1765,21 @@ def read_yaml(file_path, config_file):
         else:
             for value in values:
                 object_properties.extend(process_yaml_node(type_, value))
-    object_name = os.path.basename(file_path).split(".")[0]
     generator = ParcelGen()
     generator.from_yaml = True
     rename = {}
-    if (config_file):
-        with open(config_file, 'rU') as yaml_config:
-            config = yaml.safe_load(yaml_config)
-        generator.package = config_prop(
-            config,
-            'Target.default_package',
-            default=generator.package)
-        obj_config = config.get('Config', {}).get(object_name, None)
+    if project:
+        generator.package = project.default_package or generator.package
+        project.apply_settings(generator)
+        obj_config = project.class_config(object_name)
         if obj_config:
             rename = obj_config.get('rename', rename)
             generator.implements = obj_config.get('implement', [])
             generator.transient.extend(obj_config.get('transient', []))
-            for prop in ['do_json_writer', 'serializables', 'json_blacklist', 'default_values', 'imports', 'package']:
+            generator.intern.extend(obj_config.get('intern', []))
+            for prop in ['do_json_writer', 'serializables', 'json_blacklist', 'default_values', 'imports', 'package',
+                         'json_backend', 'parcel_layout', 'lazy_json', 'instrument', 'list_sizes', 'reuse',
+                         'equals', 'data_stream', 'json_stream_writer', 'projections', 'codegen']:
                 if prop in obj_config:
                     setattr(generator, prop, obj_config[prop])
     # TODO: invert this and pass object properties into generator
@@ -544,48 +1788,1280 @@ def read_yaml(file_path, config_file):
     for object_prop in object_properties:
         type_ = object_prop.type_
         if type_.endswith('[]'):
-            type_ = "ArrayList<%s>" % type_[:-2]
+            element_type = yaml_to_java_types.get(type_[:-2], type_[:-2])
+            if element_type in ParcelGen.PRIMITIVE_TYPES + ["String"]:
+                type_ = element_type + "[]"
+            else:
+                type_ = "ArrayList<%s>" % type_[:-2]
         if object_prop.name in rename:
             name = rename[object_prop.name]
         else:
             name = under_to_camel(object_prop.name)
         json_map[name] = object_prop.name
         props[type_].append(name)
+        if object_prop.example not in (None, ''):
+            generator.examples[name] = object_prop.example
+        if object_prop.intern and name not in generator.intern:
+            generator.intern.append(name)
     # For compatibility, json_map contains every ivar->json mapping
     generator.json_map = json_map
     generator.props = props
     return generator
 
 
-def generate_class(filePath, output, config=None):
-    # Read parcelable description json
-    if filePath.endswith('json'):
-        generator = read_json(filePath)
-    elif filePath.endswith('yaml'):
-        generator = read_yaml(filePath, config)
+class Project(object):
+    """
+    A directory of parcelable descriptions sharing a parcelgen.yaml config,
+    which is parsed, validated and indexed by class name once. Build tools can
+    use it to generate classes in-process:
+
+        project = Project('parcelgen.yaml', 'parcelables')
+        sources = project.generate_all()
+    """
+    def __init__(self, config_file=None, source=None, index_file=None):
+        self.config_file = config_file
+        self.config = load_config(config_file) if config_file else {}
+        validate_config(self.config, config_file)
+        if source is None:
+            source = os.path.join(os.path.dirname(config_file or ''), 'parcelables')
+        self.source = source
+        self.default_package = config_prop(self.config, 'Target.default_package', default=None)
+        self.options = {}
+        for option in OPTION_CHOICES:
+            value = config_prop(self.config, 'Target.' + option, default=None)
+            if value is not None:
+                self.options[option] = value
+        self.class_configs = self.config.get('Config') or {}
+        self.bundles = {}
+        self.bundle_index = None
+        # The classes in the source directory, listed once until refresh()
+        self.class_names = None
+        self.described = None
+        # The projections of every class, resolved once until refresh()
+        self.projection_closure = None
+        self.registry = TypeRegistry(self, index_file)
+
+    def class_config(self, name):
+        """
+        Returns the Config entry for the class name, or None. The Config section
+        of the bundle describing the class overrides settings in parcelgen.yaml.
+        """
+        config = self.class_configs.get(name)
+        file_name = self.bundle_of(name)
+        if file_name:
+            bundle_config = self.bundle(file_name)['config'].get(name)
+            if bundle_config:
+                config = dict(config or {}, **bundle_config)
+        return config
+
+    def apply_settings(self, generator):
+        """ Sets the generation options given for every class in the Target section on generator. """
+        for option, value in self.options.iteritems():
+            setattr(generator, option, value)
+
+    def resolve_types(self, generator, name):
+        """
+        Tells generator which of the types used by the class name are generated
+        by this project and with which options, and imports those that live in
+        other packages.
+        """
+        generator.parcelgen_types = set()
+        generator.type_options = {}
+        for ref, package in self.registry.dependencies(name, generator).iteritems():
+            if package is None:
+                continue
+            generator.parcelgen_types.add(ref)
+            generator.type_options[ref] = self.registry.entry(ref)['options']
+            if package and package != generator.package:
+                import_string = "%s.%s" % (package, ref)
+                if import_string not in generator.imports:
+                    generator.imports = list(generator.imports) + [import_string]
+        # Classes outside the source directory only have the projections they declare
+        generator.projections = self.projections(name) or generator.projections
+
+    def config_entry(self, name):
+        """ Returns everything in the project that affects the class name, for comparing and hashing. """
+        return {
+            'default_package': self.default_package,
+            'options': self.options,
+            'config': self.class_config(name),
+            'types': self.registry.dependencies(name),
+            'type_options': dict((ref, self.registry.entry(ref)['options'])
+                                 for ref, package in self.registry.dependencies(name).iteritems()
+                                 if package is not None),
+            'projections': self.projections(name)
+        }
+
+    def projections(self, name):
+        """
+        Returns the projections of the class name: those declared for it, followed
+        by the paths other classes' projections select through members of its type.
+        Business.summary: [location.city] adds city to Location's summary projection.
+        The projections of the whole project are resolved on the first call.
+        """
+        if self.projection_closure is None:
+            self.projection_closure = self.resolve_projections()
+        return self.projection_closure.get(name, {})
+
+    def resolve_projections(self):
+        """ Returns a dictionary of each class with projections to the paths each one selects. """
+        pending = []
+        for owner in sorted(self.names()):
+            for projection, paths in sorted(self.registry.entry(owner)['projections'].iteritems()):
+                pending.extend((owner, projection, path) for path in paths)
+        selected = {}
+        index = 0
+        while index < len(pending):
+            owner, projection, path = pending[index]
+            index += 1
+            paths = selected.setdefault(owner, {}).setdefault(projection, [])
+            if path in paths:
+                continue
+            paths.append(path)
+            member, _, rest = path.partition(".")
+            ref = self.registry.entry(owner)['members'].get(member)
+            if rest and self.describes(ref):
+                pending.append((ref, projection, rest))
+        return selected
+
+    def description_files(self):
+        """ Returns the file names of the descriptions in the source directory, sorted. """
+        if not os.path.isdir(self.source):
+            return []
+        config_path = self.config_file and os.path.abspath(self.config_file)
+        return [name for name in description_files(self.source)
+                if os.path.abspath(os.path.join(self.source, name)) != config_path]
+
+    def bundle(self, file_name):
+        """ Returns load_bundle's result for the bundle file_name, which is only parsed again once it changes. """
+        file_path = os.path.join(self.source, file_name)
+        stamp = file_stamp(file_path)
+        cached = self.bundles.get(file_name)
+        if cached is None or cached[0] != stamp:
+            cached = self.bundles[file_name] = (stamp, load_bundle(file_path))
+        return cached[1]
+
+    def classes_in(self, file_name):
+        """ Returns the names of the classes described by the file file_name in the source directory. """
+        if is_bundle(file_name):
+            return sorted(self.bundle(file_name)['classes'])
+        return [file_name.split(".")[0]]
+
+    def names(self):
+        """
+        Returns the names of the classes described in the source directory, which
+        is only listed again after refresh().
+        Raises a ConfigError if a class in a bundle is also described elsewhere.
+        """
+        if self.class_names is not None:
+            return self.class_names
+        names = []
+        owners = {}
+        for file_name in self.description_files():
+            for name in self.classes_in(file_name):
+                owner = owners.setdefault(name, file_name)
+                if owner != file_name and (is_bundle(owner) or is_bundle(file_name)):
+                    raise ConfigError("%s: %s is already described by %s" % (file_name, name, owner))
+                if name not in names:
+                    names.append(name)
+        self.bundle_index = dict((name, owner) for name, owner in owners.iteritems() if is_bundle(owner))
+        self.class_names = names
+        self.described = set(names)
+        return names
+
+    def describes(self, name):
+        """ Returns whether the class name is described in the source directory. """
+        if self.described is None:
+            self.names()
+        return name in self.described
+
+    def refresh(self):
+        """ Forgets what was listed and derived from the source directory, for when its files change. """
+        self.class_names = None
+        self.described = None
+        self.bundle_index = None
+        self.projection_closure = None
+        self.registry.forget()
+
+    def bundle_of(self, name):
+        """ Returns the file name of the bundle describing the class name, or None. """
+        if self.bundle_index is None:
+            self.names()
+        return self.bundle_index.get(name)
+
+    def description_path(self, name):
+        file_name = self.bundle_of(name)
+        if file_name:
+            return os.path.join(self.source, file_name)
+        for extension in ('.json', '.yaml'):
+            file_path = os.path.join(self.source, name + extension)
+            if os.path.exists(file_path):
+                return file_path
+        raise KeyError("No description for %s in %s" % (name, self.source))
+
+    def diagnostics(self, name):
+        """ Returns warnings about how the types used by the class name resolve. """
+        return self.registry.diagnostics(name)
+
+    def bundled_description(self, name):
+        """ Returns the parsed description of the class name from its bundle. """
+        return self.bundle(self.bundle_of(name))['classes'][name]
+
+    def parse(self, name):
+        """ Returns a ParcelGen generator for the class name's description alone. """
+        file_name = self.bundle_of(name)
+        if file_name is None:
+            return parse_description(self.description_path(name), self)
+        if file_name.endswith('.json'):
+            return json_generator(self.bundled_description(name), self,
+                                  "%s:%s" % (os.path.join(self.source, file_name), name))
+        return yaml_generator(self.bundled_description(name), name, self)
+
+    def generator(self, name):
+        """ Returns a ParcelGen generator configured for the class name. """
+        generator = self.parse(name)
+        self.resolve_types(generator, name)
+        return generator
+
+    def generate(self, name):
+        """ Returns the generated source of _name.java for the class name. """
+        return render(self.generator(name), 'print_gen', "_" + name)
+
+    def generate_child(self, name):
+        """ Returns the source of the editable subclass name.java for the class name. """
+        generator = self.generator(name)
+        return render(generator, 'print_child', name, generator.package)
+
+    def generate_all(self):
+        """ Returns a dictionary of class name to generated source for every class. """
+        return dict((name, self.generate(name)) for name in self.names())
+
+
+class TypeRegistry(object):
+    """
+    An index of the classes described in a project: for each class, its package
+    and the types its properties refer to. Entries are read as they're needed
+    and checked against their description's mtime, and can be kept in an index
+    file so that unchanged descriptions never need to be parsed again.
+    """
+    BUILTIN_TYPES = set(["boolean", "byte", "double", "float", "int", "long", "String", "Date", "Uri"])
+    # Options of a class which the code generated for classes nesting it depends on
+    NESTED_OPTIONS = ["do_json", "do_json_writer", "json_stream_writer", "json_backend", "reuse", "data_stream"]
+
+    def __init__(self, project, index_file=None):
+        self.project = project
+        self.index_file = index_file
+        self.entries = {}
+        # Classes whose entries were checked against their descriptions since the last forget()
+        self.checked = set()
+        # The strongly connected component of each class whose references have been walked
+        self.components = {}
+        self.dirty = False
+        if index_file and os.path.exists(index_file):
+            try:
+                with open(index_file, 'rU') as index:
+                    saved = json.load(index)
+            except ValueError:
+                saved = {}
+            if saved.get('generator') == generator_fingerprint():
+                self.entries = saved.get('entries', {})
+
+    def __getstate__(self):
+        # Worker processes only need the entries
+        state = dict(self.__dict__)
+        state['index_file'] = None
+        return state
+
+    @staticmethod
+    def referenced_type(typ):
+        match = re.match(r"(List|ArrayList)<(.*)>$", typ)
+        if match:
+            typ = match.group(2)
+        if typ.endswith("[]"):
+            typ = typ[:-2]
+        return typ
+
+    def entry(self, name, generator=None):
+        """
+        Returns the index entry for the class name, or None if there's no description
+        for it. generator may be given if the description has already been parsed.
+        """
+        if name in self.checked:
+            return self.entries[name]
+        try:
+            file_path = self.project.description_path(name)
+        except KeyError:
+            return None
+        stamp = file_stamp(file_path)
+        settings = hashlib.sha1(json.dumps([self.project.default_package, self.project.options,
+                                            self.project.class_config(name)], sort_keys=True)).hexdigest()
+        entry = self.entries.get(name)
+        if entry and entry['file'] == file_path and entry['stamp'] == stamp and entry['settings'] == settings:
+            self.checked.add(name)
+            return entry
+        if generator is None:
+            generator = self.project.parse(name)
+        refs = set()
+        for typ in generator.props:
+            ref = self.referenced_type(typ)
+            if ref not in self.BUILTIN_TYPES:
+                refs.add(ref)
+        entry = {
+            'file': file_path,
+            'stamp': stamp,
+            'settings': settings,
+            'package': generator.package,
+            'refs': sorted(refs),
+            # Members of types other than the built in ones, for resolving projections
+            'members': dict((member, self.referenced_type(typ)) for typ, member in generator.member_map()
+                            if self.referenced_type(typ) not in self.BUILTIN_TYPES),
+            'projections': generator.projections,
+            'options': dict((option, getattr(generator, option)) for option in self.NESTED_OPTIONS),
+            'serializables': sorted(generator.serializables),
+            'imports': sorted(generator.imports),
+        }
+        self.entries[name] = entry
+        self.checked.add(name)
+        self.dirty = True
+        return entry
+
+    def forget(self):
+        """ Makes entries be checked against their descriptions again, and cycles be found again. """
+        self.checked = set()
+        self.components = {}
+
+    def scan(self):
+        """ Loads the entry of every class in the project, removing stale ones. """
+        names = self.project.names()
+        for name in list(self.entries):
+            if name not in names:
+                del self.entries[name]
+                self.checked.discard(name)
+                self.dirty = True
+        for name in names:
+            self.entry(name)
+
+    def dependencies(self, name, generator=None):
+        """
+        Returns a dictionary of each type the class name refers to, to that type's
+        package (or "" if it has none) if it's generated by this project, or None
+        if it isn't.
+        """
+        entry = self.entry(name, generator)
+        if entry is None:
+            return {}
+        dependencies = {}
+        for ref in entry['refs']:
+            ref_entry = self.entry(ref) if self.project.describes(ref) else None
+            dependencies[ref] = (ref_entry['package'] or "") if ref_entry else None
+        return dependencies
+
+    def diagnostics(self, name):
+        """
+        Returns warnings about the class name: types that are neither built in,
+        generated by this project, serializable nor imported, and cycles of
+        and recursive references between parcelgen classes.
+        """
+        entry = self.entry(name)
+        if entry is None:
+            return []
+        warnings = []
+        for ref, package in sorted(self.dependencies(name).iteritems()):
+            if package is None and ref not in entry['serializables'] and \
+                    not any(imp.endswith("." + ref) for imp in entry['imports']):
+                warnings.append("%s: type %s is not described in this project, serializable " \
+                                "or imported; assuming it is a Parcelable in package %s" % (
+                                    name, ref, entry['package']))
+        cycle = self.find_cycle(name)
+        if cycle:
+            warnings.append("%s: recursive type %s; parcelling won't terminate if the objects "
+                            "themselves form a cycle" % (name, " -> ".join(cycle)))
+        return warnings
+
+    def references(self, name):
+        """ Returns the parcelgen classes the class name refers to, sorted. """
+        return sorted(ref for ref, package in self.dependencies(name).iteritems() if package is not None)
+
+    def component(self, name):
+        """
+        Returns the strongly connected component of the class name in the graph
+        of references between parcelgen classes: the classes it can reach that
+        can also reach it. The components of every class reachable from name are
+        found in one pass with Tarjan's algorithm, iteratively so long chains of
+        classes don't overflow the stack, and kept until the project is refreshed.
+        """
+        if name in self.components:
+            return self.components[name]
+        index = {name: 0}
+        lowlink = {name: 0}
+        stack = [name]
+        on_stack = set(stack)
+        walk = [(name, iter(self.references(name)))]
+        while walk:
+            node, refs = walk[-1]
+            for ref in refs:
+                if ref in self.components:
+                    continue
+                if ref not in index:
+                    index[ref] = lowlink[ref] = len(index)
+                    stack.append(ref)
+                    on_stack.add(ref)
+                    walk.append((ref, iter(self.references(ref))))
+                    break
+                if ref in on_stack:
+                    lowlink[node] = min(lowlink[node], index[ref])
+            else:
+                walk.pop()
+                if walk:
+                    parent = walk[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = set()
+                    while node not in component:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.add(member)
+                    component = frozenset(component)
+                    for member in component:
+                        self.components[member] = component
+        return self.components[name]
+
+    def find_cycle(self, name):
+        """ Returns a shortest path of parcelgen classes from name back to itself, or None. """
+        component = self.component(name)
+        parents = {}
+        queue = [name]
+        for node in queue:
+            for ref in self.references(node):
+                if ref not in component or ref in parents:
+                    continue
+                parents[ref] = node
+                if ref == name:
+                    path = [name]
+                    node = parents[name]
+                    while node != name:
+                        path.append(node)
+                        node = parents[node]
+                    path.append(name)
+                    path.reverse()
+                    return path
+                queue.append(ref)
+        return None
+
+    def save(self):
+        if not self.index_file or not self.dirty:
+            return
+        index = {'generator': generator_fingerprint(), 'entries': self.entries}
+        write_if_changed(self.index_file, json.dumps(index, indent=1, sort_keys=True))
+        self.dirty = False
+
+
+
+class SizeEstimator(object):
+    """
+    Estimates how many bytes a typical instance of each class in a project
+    takes up in a Parcel, from its property types. Strings are as long as
+    their yaml examples (or string_length), lists and arrays hold as many
+    elements as their list_sizes setting, their example or list_size says,
+    and every reference is assumed to be set.
+    """
+    # Binder's transaction buffer, which is shared by every transaction in flight
+    BINDER_LIMIT = 1024 * 1024
+    VALUE_SIZES = {"boolean": 4, "byte": 4, "double": 8, "float": 4, "int": 4, "long": 8}
+    ARRAY_ELEMENT_SIZES = {"boolean": 4, "byte": 1, "double": 8, "float": 4, "int": 4, "long": 8}
+
+    def __init__(self, project, list_size=10, string_length=16):
+        self.project = project
+        self.list_size = list_size
+        self.string_length = string_length
+        self.generators = {}
+        self.estimates = {}
+        self.notes = defaultdict(set)
+
+    @staticmethod
+    def string_size(length):
+        """ Parcel.writeString writes the length, then UTF-16 with a terminator padded to 4 bytes. """
+        return 4 + (((length + 1) * 2 + 3) & ~3)
+
+    def generator(self, name):
+        if name not in self.generators:
+            self.generators[name] = self.project.generator(name)
+        return self.generators[name]
+
+    def example_length(self, generator, member):
+        example = generator.examples.get(member)
+        if isinstance(example, list):
+            if not example:
+                return self.string_length
+            return sum(len(unicode(value)) for value in example) / len(example)
+        if example is not None:
+            return len(unicode(example))
+        return self.string_length
+
+    def cardinality(self, generator, member):
+        if member in generator.list_sizes:
+            return int(generator.list_sizes[member])
+        if isinstance(generator.examples.get(member), list):
+            return len(generator.examples[member])
+        return self.list_size
+
+    def estimate(self, name, path=()):
+        """
+        Returns the bytes taken by the members of the class name itself, and by
+        it together with every parcelgen object it refers to.
+        """
+        if name in self.estimates:
+            return self.estimates[name]
+        generator = self.generator(name)
+        path = path + (name,)
+        own = graph = 0
+        if generator.parcel_layout == "compact":
+            nullables, booleans, _ = generator.compact_layout()
+            own += 4 * ((len(nullables) + 31) / 32 + (len(booleans) + 31) / 32)
+        elif "boolean" in generator.props:
+            own += 4 + 4 * len(generator.props["boolean"])
+        for typ, member in generator.member_map():
+            if typ == "boolean":
+                continue
+            value_own, value_graph = self.value_size(generator, name, path, typ, member)
+            own += value_own
+            graph += value_graph
+        self.estimates[name] = own, own + graph
+        return self.estimates[name]
+
+    def value_size(self, generator, name, path, typ, member):
+        """ Returns the bytes member takes in the class name's parcel, and those its objects take. """
+        compact = generator.parcel_layout == "compact"
+        list_type = generator.list_type(typ)
+        array_type = typ[:-2] if generator.array_type(typ) else None
+        if typ in self.VALUE_SIZES:
+            return self.VALUE_SIZES[typ], 0
+        elif typ == "String":
+            return self.string_size(self.example_length(generator, member)), 0
+        elif typ == "Date":
+            return 8, 0
+        elif typ == "Uri":
+            # writeParcelable's class name, then Uri's type and string
+            return (self.string_size(len("android.net.Uri$StringUri")) + 4 +
+                    self.string_size(self.example_length(generator, member))), 0
+        elif array_type == "String" or list_type == "String":
+            count = self.cardinality(generator, member)
+            return 4 + count * self.string_size(self.example_length(generator, member)), 0
+        elif array_type:
+            count = self.cardinality(generator, member)
+            return 4 + ((count * self.ARRAY_ELEMENT_SIZES[array_type] + 3) & ~3), 0
+        elif list_type:
+            # writeTypedList writes a non-null marker before each element
+            count = self.cardinality(generator, member)
+            return 4 + 4 * count, count * self.object_size(generator, name, path, list_type)
+        elif typ in generator.parcelgen_types:
+            return (0 if compact else 4), self.object_size(generator, name, path, typ)
+        # writeParcelable and writeSerializable both start with the class name
+        self.notes[name].add("%s is %s, whose contents aren't estimated" % (
+            member, "Serializable" if typ in generator.serializables else "Parcelable"))
+        return self.string_size(len(typ)), 0
+
+    def object_size(self, generator, name, path, typ):
+        """ Returns the bytes a typ object referred to from the class name takes, with its references. """
+        if typ not in generator.parcelgen_types:
+            self.notes[name].add("%s isn't described in this project, so its contents aren't estimated" % typ)
+            return 0
+        if typ in path:
+            self.notes[name].add("recursive type %s is counted once" % " -> ".join(path + (typ,)))
+            return 0
+        return self.estimate(typ, path)[1]
+
+    def report(self, names, warn_ratio=0.5):
+        """
+        Prints each class's own and total estimated parcel size, warning about
+        those near Binder's limit. Returns 1 if any is over it, otherwise 0.
+        """
+        status = 0
+        print "%-32s %12s %12s" % ("class", "own bytes", "total bytes")
+        warnings = []
+        for name in names:
+            own, total = self.estimate(name)
+            print "%-32s %12d %12d" % (name, own, total)
+            if total >= self.BINDER_LIMIT:
+                warnings.append("%s: a typical %s takes %d bytes, over Binder's %d byte transaction limit" % (
+                    name, name, total, self.BINDER_LIMIT))
+                status = 1
+            elif total >= self.BINDER_LIMIT * warn_ratio:
+                warnings.append("%s: a typical %s takes %d bytes, %d%% of Binder's %d byte transaction limit" % (
+                    name, name, total, 100 * total / self.BINDER_LIMIT, self.BINDER_LIMIT))
+        sys.stdout.flush()
+        for name in names:
+            for note in sorted(self.notes[name]):
+                sys.stderr.write("note: %s: %s\n" % (name, note))
+        for warning in warnings:
+            sys.stderr.write("warning: %s\n" % warning)
+        return status
+
+
+class BenchmarkWriter(object):
+    """
+    Generates a standalone JVM microbenchmark for each class in a project,
+    timing its generated json and parcel code on a typical instance. The
+    instance is built from the examples in yaml descriptions, or synthesized:
+    strings are string_length characters long and lists hold as many elements
+    as their list_sizes setting, their example or list_size says. Benchmarks
+    run against the plain JVM stand-ins and harness in parcelgen-benchmark.
+    """
+    SAMPLE_VALUES = {"boolean": True, "byte": 7, "int": 4242, "long": 1300000000123,
+                     "float": 0.5, "double": 37.7749}
+    # Nested objects deeper than this are left out, so payloads of recursive
+    # and deeply nested classes stay a manageable size
+    MAX_DEPTH = 3
+    # Longest string literal put in the generated source, well under the class file limit
+    CHUNK = 4096
+
+    def __init__(self, project, list_size=10, string_length=16):
+        self.project = project
+        self.list_size = list_size
+        self.string_length = string_length
+        self.generators = {}
+
+    def generator(self, name):
+        if name not in self.generators:
+            self.generators[name] = self.project.generator(name)
+        return self.generators[name]
+
+    def cardinality(self, generator, member):
+        if member in generator.list_sizes:
+            return int(generator.list_sizes[member])
+        if isinstance(generator.examples.get(member), list):
+            return len(generator.examples[member])
+        return self.list_size
+
+    def sample(self, generator, typ, member, example, path):
+        """ Returns the json value of one typ for member, or None to leave it out. """
+        if typ in generator.parcelgen_types:
+            if typ in path or len(path) >= self.MAX_DEPTH:
+                return None
+            return self.payload(typ, path)
+        elif typ == "boolean":
+            return example if isinstance(example, bool) else self.SAMPLE_VALUES[typ]
+        elif typ in self.SAMPLE_VALUES:
+            if isinstance(example, (int, long, float)) and not isinstance(example, bool):
+                return example if typ in ("float", "double") else int(example)
+            return self.SAMPLE_VALUES[typ]
+        elif typ == "String":
+            if example is not None and not isinstance(example, (list, dict)):
+                return unicode(example)
+            return (member * (self.string_length / max(len(member), 1) + 1))[:self.string_length]
+        elif typ == "Date":
+            return example if isinstance(example, (int, long)) else 1300000000
+        elif typ == "Uri":
+            if isinstance(example, basestring):
+                return example
+            return "http://example.com/%s" % member
+        # Parcelables and serializables can't be made up
+        return None
+
+    def value(self, generator, typ, member, path):
+        """ Returns the json value of member, of type typ, or None to leave it out. """
+        example = generator.examples.get(member)
+        element = typ[:-2] if generator.array_type(typ) else generator.list_type(typ)
+        if element is None:
+            return self.sample(generator, typ, member, example, path)
+        if isinstance(example, list) and example and element not in generator.parcelgen_types:
+            return example
+        values = [self.sample(generator, element, member, None if isinstance(example, list) else example, path)
+                  for _ in xrange(self.cardinality(generator, member))]
+        return [value for value in values if value is not None]
+
+    def payload(self, name, path=()):
+        """ Returns a dictionary holding the json a typical instance of the class name is read from. """
+        generator = self.generator(name)
+        path = path + (name,)
+        payload = {}
+        for typ, member in generator.member_map():
+            if member in generator.json_blacklist:
+                continue
+            value = self.value(generator, typ, member, path)
+            if value is not None:
+                payload[generator.json_key(member)] = value
+        return payload
+
+    @staticmethod
+    def java_string(value):
+        return '"%s"' % value.replace("\\", "\\\\").replace('"', '\\"')
+
+    def source(self, name):
+        """ Returns the source of the benchmark for the class name. """
+        generator = self.generator(name)
+        benchmark = name + "Benchmark"
+        payload = json.dumps(self.payload(name), sort_keys=True, separators=(",", ":"))
+        imports = ["android.os.Parcel", "com.yelp.parcelgen.bench.Bench"]
+        # (operation, elements, statements run and result returned by each iteration)
+        tasks = []
+        if generator.do_json:
+            imports.extend(["com.yelp.parcelgen.JsonUtil", "org.json.JSONArray", "org.json.JSONObject"])
+            tasks.append(("readFromJson(JSONObject)", "1", [
+                "%s result = new %s();" % (name, name),
+                "result.readFromJson(json);",
+                "return result;"]))
+            tasks.append(("parseJsonList(JSONArray)", "elements", [
+                "return JsonUtil.parseJsonList(array, %s.CREATOR);" % name]))
+            for projection in sorted(generator.projections):
+                tasks.append(("parseJsonList(JSONArray) %s" % projection, "elements", [
+                    "return JsonUtil.parseJsonList(array, %s.%s);" % (
+                        name, generator.projection_creator(projection))]))
+            if generator.json_backend == "jsonreader":
+                imports.extend(["android.util.JsonReader", "java.io.StringReader"])
+                tasks.append(("readFromJson(JsonReader)", "1", [
+                    "%s result = new %s();" % (name, name),
+                    "result.readFromJson(new JsonReader(new StringReader(text)));",
+                    "return result;"]))
+                tasks.append(("parseJsonList(JsonReader)", "elements", [
+                    "return JsonUtil.parseJsonList(new JsonReader(new StringReader(arrayText)), "
+                    "%s.GENERATED_CREATOR);" % name]))
+        if generator.do_json_writer:
+            tasks.append(("writeJSON()", "1", ["return object.writeJSON();"]))
+        if generator.has_json_stream_writer():
+            imports.extend(["android.util.JsonWriter", "java.io.StringWriter"])
+            tasks.append(("writeJson(JsonWriter)", "1", [
+                "StringWriter out = new StringWriter();",
+                "object.writeJson(new JsonWriter(out));",
+                "return out;"]))
+        tasks.append(("parcel round trip", "1", [
+            "parcel.setDataPosition(0);",
+            "object.writeToParcel(parcel, 0);",
+            "parcel.setDataPosition(0);",
+            "return %s.CREATOR.createFromParcel(parcel);" % name]))
+        if generator.data_stream:
+            imports.extend(["java.io.ByteArrayInputStream", "java.io.ByteArrayOutputStream",
+                            "java.io.DataInputStream", "java.io.DataOutputStream"])
+            tasks.append(("data stream round trip", "1", [
+                "ByteArrayOutputStream bytes = new ByteArrayOutputStream();",
+                "object.writeTo(new DataOutputStream(bytes));",
+                "%s result = new %s();" % (name, name),
+                "result.readFrom(new DataInputStream(new ByteArrayInputStream(bytes.toByteArray())));",
+                "return result;"]))
+
+        lines = ["package %s;" % generator.package, ""]
+        lines.extend("import %s;" % imp for imp in sorted(set(imports)))
+        lines.append("")
+        lines.append("/** Automatically generated benchmark of the code parcelgen generated for %s." % name)
+        lines.append(" *    DO NOT MODIFY THIS FILE MANUALLY! IT WILL BE OVERWRITTEN THE NEXT TIME")
+        lines.append(" *    BENCHMARKS ARE GENERATED.")
+        lines.append(" */")
+        lines.append("public class %s {" % benchmark)
+        lines.append("")
+        lines.append("\t/** A typical %s as json, built from its description's examples. */" % name)
+        lines.append("\tprivate static final String[] PAYLOAD = {")
+        for start in xrange(0, len(payload), self.CHUNK):
+            lines.append("\t\t%s," % self.java_string(payload[start:start + self.CHUNK]))
+        lines.append("\t};")
+        lines.append("")
+        lines.append("\t/** Pass the number of elements to parse lists of as the first argument. */")
+        lines.append("\tpublic static void main(String[] args) throws Exception {")
+        lines.append("\t\tfinal int elements = args.length > 0 ? Integer.parseInt(args[0]) : 1000;")
+        lines.append("\t\tStringBuilder payload = new StringBuilder();")
+        lines.append("\t\tfor (String chunk : PAYLOAD) {")
+        lines.append("\t\t\tpayload.append(chunk);")
+        lines.append("\t\t}")
+        lines.append("\t\tfinal String text = payload.toString();")
+        if generator.do_json:
+            lines.append("\t\tfinal JSONObject json = new JSONObject(text);")
+            lines.append("\t\tfinal JSONArray array = new JSONArray();")
+            lines.append("\t\tfor (int i = 0; i < elements; i++) {")
+            lines.append("\t\t\tarray.put(new JSONObject(text));")
+            lines.append("\t\t}")
+            if generator.json_backend == "jsonreader":
+                lines.append("\t\tfinal String arrayText = array.toString();")
+            lines.append("\t\tfinal %s object = %s.CREATOR.parse(json);" % (name, name))
+        else:
+            lines.append("\t\t// Without do_json, the object is left empty")
+            lines.append("\t\tfinal %s object = new %s();" % (name, name))
+        lines.append("\t\tfinal Parcel parcel = Parcel.obtain();")
+        for operation, elements, statements in tasks:
+            lines.append("")
+            lines.append("\t\tBench.run(\"%s\", \"%s\", %s, new Bench.Task() {" % (name, operation, elements))
+            lines.append("\t\t\tpublic Object run() throws Exception {")
+            lines.extend("\t\t\t\t" + statement for statement in statements)
+            lines.append("\t\t\t}")
+            lines.append("\t\t});")
+        lines.append("\t}")
+        lines.append("}")
+        lines.append("")
+        return "\n".join(lines)
+
+    def write(self, name, directory):
+        """ Writes the benchmark for the class name into the source directory directory, returning its path. """
+        generator = self.generator(name)
+        target = source_path(directory, generator.package, name + "Benchmark")
+        if not os.path.isdir(os.path.dirname(target)):
+            os.makedirs(os.path.dirname(target))
+        write_if_changed(target, self.source(name))
+        return target
+
+
+class CodegenReport(object):
+    """
+    Compares the _Class.java generated for each class of a project in the
+    unrolled and table codegen modes: its size in bytes and how many methods
+    it declares, counting those of its creators.
+    """
+    METHOD = re.compile(r"^\t+(public|protected|private)\b[^=;]*\)( throws [\w., ]+)? \{$", re.M)
+
+    def __init__(self, project):
+        self.project = project
+
+    def measure(self, name, codegen):
+        """ Returns the size and number of methods of _name.java generated in the codegen mode. """
+        generator = self.project.generator(name)
+        generator.codegen = codegen
+        source = render(generator, 'print_gen', "_" + name)
+        return len(source), len(self.METHOD.findall(source))
+
+    def report(self, names):
+        """ Prints each class's measurements in both modes and their totals. Returns 0. """
+        print "%-32s %14s %12s %16s %13s" % ("class", "unrolled bytes", "table bytes",
+                                             "unrolled methods", "table methods")
+        totals = [0, 0, 0, 0]
+        notes = []
+        for name in names:
+            unrolled_size, unrolled_methods = self.measure(name, "unrolled")
+            try:
+                table_size, table_methods = self.measure(name, "table")
+            except Exception as error:
+                print "%-32s %14d %12s %16d %13s" % (name, unrolled_size, "-", unrolled_methods, "-")
+                notes.append("%s: %s" % (name, error))
+                continue
+            print "%-32s %14d %12d %16d %13d" % (name, unrolled_size, table_size,
+                                                 unrolled_methods, table_methods)
+            for index, value in enumerate((unrolled_size, table_size, unrolled_methods, table_methods)):
+                totals[index] += value
+        print "%-32s %14d %12d %16d %13d" % tuple(["total"] + totals)
+        sys.stdout.flush()
+        for note in notes:
+            sys.stderr.write("note: %s\n" % note)
+        return 0
+
+
+def generator_fingerprint():
+    """
+    Identifies the generator that produced a file: its version plus the
+    contents of this script, so local edits also invalidate cached output.
+    """
+    digest = hashlib.sha1(GENERATOR_VERSION)
+    source = os.path.splitext(os.path.abspath(__file__))[0] + ".py"
+    if os.path.exists(source):
+        with open(source, 'rb') as script:
+            digest.update(script.read())
+    return digest.hexdigest()
+
+def file_stamp(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime]
+
+def write_if_changed(path, content):
+    """
+    Writes content to path unless the file already holds exactly those bytes,
+    so unchanged classes keep their mtime and aren't recompiled.
+    The content is written to a temporary file which is then renamed over path,
+    so an interrupted run never leaves a truncated file behind.
+    Returns True if the file was written.
+    """
+    if isinstance(content, unicode):
+        content = content.encode('utf-8')
+    if os.path.exists(path):
+        with open(path, 'rb') as existing:
+            if existing.read() == content:
+                return False
+        mode = os.stat(path).st_mode & 0o777
     else:
-        raise Exception("Unsupported file type: %s" % filePath)
-    class_name = "_" + os.path.basename(filePath).split(".")[0]
-
-    if output:
-        package = generator.package
-        if (os.path.isdir(output)): # Resolve file location based on package + path
-            dirs = package.split(".")
-            dirs.append(class_name + ".java")
-            targetFile = os.path.join(output, *dirs)
-            # Generate child subclass if it doesn't exist
-            if class_name.startswith("_"):
-                child = class_name[1:]
-                new_dirs = package.split(".")
-                new_dirs.append(child + ".java")
-                child_file = os.path.join(output, *new_dirs)
-                if not os.path.exists(child_file):
-                    generator.outfile = open(child_file, 'w')
-                    generator.print_child(child, package)
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    directory, name = os.path.split(path)
+    fd, temp_path = tempfile.mkstemp(prefix="." + name, suffix=".tmp", dir=directory or ".")
+    try:
+        with os.fdopen(fd, 'wb') as outfile:
+            outfile.write(content)
+        os.chmod(temp_path, mode)
+        if os.name == 'nt' and os.path.exists(path):
+            os.remove(path)
+        os.rename(temp_path, path)
+    except:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return True
+
+
+class BuildCache(object):
+    """
+    A persistent manifest of generated classes. Each entry maps a description
+    file to a hash of its inputs (the description itself and the class's config
+    entry) and the file it was generated into; the whole manifest is discarded
+    if the generator changes. Classes in a bundle each have their own entry,
+    keyed by the bundle's path and the class name, and only hash their own
+    section of it so editing one class doesn't regenerate the rest.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.fingerprint = generator_fingerprint()
+        self.entries = {}
+        self.dirty = False
+        if os.path.exists(path):
+            try:
+                with open(path, 'rU') as manifest_file:
+                    manifest = json.load(manifest_file)
+            except ValueError:
+                manifest = {}
+            if manifest.get('generator') == self.fingerprint:
+                self.entries = manifest.get('entries', {})
+
+    @staticmethod
+    def key(file_path, name=None):
+        return file_path if name is None else "%s:%s" % (file_path, name)
+
+    def input_hash(self, file_path, project, name=None):
+        digest = hashlib.sha1()
+        if name is None:
+            with open(file_path, 'rb') as description:
+                digest.update(description.read())
+            name = os.path.basename(file_path).split(".")[0]
         else:
-            targetFile = output
-        generator.outfile = open(targetFile, 'w')
-    generator.print_gen(class_name)
+            digest.update(json.dumps(project.bundled_description(name), sort_keys=True))
+        if project:
+            digest.update(json.dumps(project.config_entry(name), sort_keys=True))
+        return digest.hexdigest()
+
+    def check(self, file_path, output, project, name=None):
+        """
+        Returns a tuple of whether the class generated from file_path (or the
+        class name in the bundle file_path) into output is up to date, and the
+        input hash to record once it has been regenerated.
+        """
+        inputs = self.input_hash(file_path, project, name)
+        return self.is_fresh(self.key(file_path, name), output, inputs), inputs
+
+    def is_fresh(self, key, output, inputs):
+        entry = self.entries.get(key)
+        if not entry or entry['inputs'] != inputs or entry['output'] != output:
+            return False
+        target = entry['target']
+        # Regenerate if the generated file was removed or touched by hand
+        return os.path.exists(target) and entry['stamp'] == file_stamp(target)
+
+    def update(self, file_path, output, inputs, target, name=None):
+        self.entries[self.key(file_path, name)] = {
+            'inputs': inputs,
+            'output': output,
+            'target': target,
+            'stamp': file_stamp(target)
+        }
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        manifest = {'generator': self.fingerprint, 'entries': self.entries}
+        write_if_changed(self.path, json.dumps(manifest, indent=1, sort_keys=True))
+        self.dirty = False
+
+
+def render(generator, method, *args):
+    """
+    Runs one of generator's print methods and returns the resulting source,
+    which is collected in memory rather than written out line by line.
+    """
+    generator.buffer = []
+    getattr(generator, method)(*args)
+    generator.buffer.append("")
+    return "\n".join(generator.buffer)
+
+def source_path(output, package, class_name):
+    """ Resolves a class's file location in a source directory based on its package. """
+    dirs = package.split(".")
+    dirs.append(class_name + ".java")
+    return os.path.join(output, *dirs)
+
+def write_class(filePath, output, project=None, name=None):
+    """
+    Reads the description at filePath and writes its generated class into output,
+    a file or a source directory. If filePath is a bundle, name is the class in
+    it to write, and project is required. Returns the path of the generated file.
+    """
+    if name is None:
+        generator = read_description(filePath, project)
+        class_name = "_" + os.path.basename(filePath).split(".")[0]
+    else:
+        generator = project.generator(name)
+        class_name = "_" + name
+
+    if not output:
+        sys.stdout.write(render(generator, 'print_gen', class_name))
+        return None
+
+    package = generator.package
+    if os.path.isdir(output):
+        targetFile = source_path(output, package, class_name)
+        # Generate child subclass if it doesn't exist
+        child = class_name[1:]
+        child_file = source_path(output, package, child)
+        if not os.path.exists(child_file):
+            write_if_changed(child_file, render(generator, 'print_child', child, package))
+    else:
+        targetFile = output
+    write_if_changed(targetFile, render(generator, 'print_gen', class_name))
+    return targetFile
+
+def generate_class(filePath, output, config=None, cache=None, index=None):
+    """
+    Generates the class described by filePath into output (a file, a source
+    directory or stdout if None), or every class if filePath is a bundle.
+    config is the path to a parcelgen.yaml.
+    If a BuildCache is given, descriptions whose inputs are unchanged since
+    the last run are skipped. index is the path of a type registry index file
+    for the description's directory. Returns False if every class was skipped.
+    """
+    project = Project(config, os.path.dirname(filePath) or os.curdir, index)
+    try:
+        file_name = os.path.basename(filePath)
+        names = project.classes_in(file_name) if is_bundle(file_name) else [None]
+        if len(names) > 1 and output and not os.path.isdir(output):
+            raise Exception("%s describes several classes, so its destination must be a directory" % filePath)
+        generated = False
+        for name in names:
+            if cache and output:
+                fresh, inputs = cache.check(filePath, output, project, name)
+                if fresh:
+                    continue
+            targetFile = write_class(filePath, output, project, name)
+            for warning in project.diagnostics(name or file_name.split(".")[0]):
+                sys.stderr.write("warning: %s\n" % warning)
+            if cache and output:
+                cache.update(filePath, output, inputs, targetFile, name)
+            generated = True
+        return generated
+    finally:
+        project.registry.save()
+
+def description_files(directory):
+    """ Returns the names of the parcelable descriptions in directory, sorted. """
+    return sorted(name for name in os.listdir(directory)
+                  if name.endswith('.json') or name.endswith('.yaml'))
+
+def _batch_job(job):
+    file_path, output, project, name = job
+    try:
+        return write_class(file_path, output, project, name), None
+    except Exception:
+        return None, traceback.format_exc()
+
+def batch_generate(source, output, config=None, jobs=1, cache=None, names=None,
+                   project=None, index=None):
+    """
+    Generates a class for every json and yaml description in the directory
+    source (or only those in names) into the source directory output, loading
+    config only once and spreading the work across jobs processes.
+    Returns a list of (file name, status, message) tuples in file name order,
+    where status is one of 'generated', 'unchanged' or 'failed', and message
+    holds the error or any warnings. Each class in a bundle gets its own tuple,
+    named "file name:class name".
+    """
+    if project is None:
+        project = Project(config, source, index)
+    # Index every class up front so workers don't each parse the descriptions they refer to
+    project.registry.scan()
+    available = project.description_files()
+    if names is None:
+        names = available
+    else:
+        names = [name for name in available if name in names]
+    pending = []
+    results = {}
+    labels = []
+    for file_name in names:
+        file_path = os.path.join(source, file_name)
+        for name in project.classes_in(file_name) if is_bundle(file_name) else [None]:
+            label = file_name if name is None else "%s:%s" % (file_name, name)
+            labels.append(label)
+            inputs = None
+            if cache:
+                fresh, inputs = cache.check(file_path, output, project, name)
+                if fresh:
+                    results[label] = ('unchanged', None)
+                    continue
+            pending.append((label, inputs, (file_path, output, project, name)))
+
+    batch = [job for _, _, job in pending]
+    if jobs > 1 and len(batch) > 1:
+        pool = multiprocessing.Pool(min(jobs, len(batch)))
+        try:
+            outcomes = pool.map(_batch_job, batch)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        outcomes = map(_batch_job, batch)
+
+    for (label, inputs, job), (target, error) in zip(pending, outcomes):
+        name = job[3] or label.split(".")[0]
+        if error:
+            results[label] = ('failed', error)
+        else:
+            warnings = project.diagnostics(name)
+            results[label] = ('generated', "".join("warning: %s\n" % warning for warning in warnings) or None)
+            if cache:
+                cache.update(job[0], output, inputs, target, job[3])
+    project.registry.save()
+    return [(label,) + results[label] for label in labels]
+
+
+def report(results):
+    """
+    Prints the results returned by batch_generate, one line per file.
+    Returns the exit status for the run.
+    """
+    status = 0
+    for sourcefile, result, message in results:
+        print "%-9s %s" % (result, sourcefile)
+        if message:
+            sys.stdout.flush()
+            sys.stderr.write(message)
+        if result == 'failed':
+            status = 1
+    sys.stdout.flush()
+    return status
+
+
+class InotifyWatcher(object):
+    """
+    Reports changed files in a set of directories using Linux's inotify
+    through ctypes. Raises OSError if inotify isn't available.
+    """
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT = struct.Struct('iIII')
+
+    def __init__(self, directories):
+        library = ctypes.util.find_library('c')
+        if not library or not sys.platform.startswith('linux'):
+            raise OSError("inotify is not available")
+        libc = ctypes.CDLL(library, use_errno=True)
+        self.fd = libc.inotify_init()
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init failed")
+        self.directories = {}
+        for directory in directories:
+            wd = libc.inotify_add_watch(self.fd, directory, self.MASK)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), "inotify_add_watch failed for %s" % directory)
+            self.directories[wd] = directory
+
+    def read_events(self):
+        changed = set()
+        data = os.read(self.fd, 64 * 1024)
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = self.EVENT.unpack_from(data, offset)
+            offset += self.EVENT.size
+            name = data[offset:offset + length].rstrip('\0')
+            offset += length
+            if name and wd in self.directories:
+                changed.add(os.path.join(self.directories[wd], name))
+        return changed
+
+    def wait(self, settle=0.05):
+        """ Blocks until files change, and returns the set of their paths. """
+        select.select([self.fd], [], [])
+        changed = self.read_events()
+        # Editors often write a file in several steps, collect them all
+        while select.select([self.fd], [], [], settle)[0]:
+            changed.update(self.read_events())
+        return changed
+
+
+class PollingWatcher(object):
+    """ Reports changed files in a set of directories by polling their mtimes. """
+    def __init__(self, directories, interval=0.5):
+        self.directories = directories
+        self.interval = interval
+        self.stamps = self.snapshot()
+
+    def snapshot(self):
+        stamps = {}
+        for directory in self.directories:
+            for name in os.listdir(directory):
+                path = os.path.join(directory, name)
+                if os.path.isfile(path):
+                    stamps[path] = file_stamp(path)
+        return stamps
+
+    def wait(self):
+        """ Blocks until files change, and returns the set of their paths. """
+        while True:
+            time.sleep(self.interval)
+            stamps = self.snapshot()
+            changed = set(path for path in set(stamps) | set(self.stamps)
+                          if stamps.get(path) != self.stamps.get(path))
+            self.stamps = stamps
+            if changed:
+                return changed
+
+
+def watch(source, output, config=None, jobs=1, cache=None, poll=False, index=None):
+    """
+    Generates every description in source, then stays resident watching source
+    and the config file and regenerates only the classes affected by each change.
+    A config change only regenerates the classes whose config entry changed.
+    """
+    project = Project(config, source, index)
+    report(batch_generate(source, output, jobs=jobs, cache=cache, project=project))
+    if cache:
+        cache.save()
+    directories = [os.path.abspath(source)]
+    if config:
+        config = os.path.abspath(config)
+        if os.path.dirname(config) not in directories:
+            directories.append(os.path.dirname(config))
+    watcher = None
+    if not poll:
+        try:
+            watcher = InotifyWatcher(directories)
+        except OSError:
+            pass
+    if watcher is None:
+        watcher = PollingWatcher(directories)
+    print "watching %s for changes" % ", ".join(directories)
+    sys.stdout.flush()
+
+    types = project.names()
+    while True:
+        changed = watcher.wait()
+        names = set(os.path.basename(path) for path in changed
+                    if os.path.dirname(path) == directories[0])
+        project.refresh()
+        # Adding or removing a class can change how other classes refer to it
+        current = project.names()
+        if current != types:
+            types = current
+            names.update(project.description_files())
+        if config and config in changed and os.path.exists(config):
+            try:
+                new_project = Project(config, source, index)
+            except (yaml.YAMLError, ConfigError):
+                sys.stderr.write(traceback.format_exc())
+                continue
+            for name in new_project.description_files():
+                for object_name in new_project.classes_in(name):
+                    if new_project.config_entry(object_name) != project.config_entry(object_name):
+                        names.add(name)
+            project = new_project
+        report(batch_generate(source, output, jobs=jobs, cache=cache, names=names, project=project))
+        if cache:
+            cache.save()
 
 
 if __name__ == "__main__":
@@ -602,16 +3078,69 @@ If destination is a file, your class will be written to that file."""
     parser.add_argument('-c', '--config', help='Yaml config file to use while generating source code')
     parser.add_argument('destination', nargs='?', help='Output file or directory for ' + 
         'generated files, outputs to stdout if unspecified')
+    parser.add_argument('--cache', help='Manifest file used to skip descriptions that ' +
+        'have not changed since the last run')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Number of processes ' +
+        'to generate with when both source and destination are directories')
+    parser.add_argument('--watch', action='store_true', help='Keep running after generating ' +
+        'a directory of descriptions and regenerate classes as they or the config change')
+    parser.add_argument('--poll', action='store_true', help='Poll for changes in --watch mode ' +
+        'instead of using inotify')
+    parser.add_argument('--index', help='File to keep the index of described types in, ' +
+        'defaults to the --cache file with .types appended')
+    parser.add_argument('--size-report', action='store_true', help='Print the estimated ' +
+        'parcel size of each described class instead of generating source')
+    parser.add_argument('--emit-benchmarks', metavar='DIRECTORY', help='Write a JVM ' +
+        'microbenchmark of the generated code of each described class into this source directory ' +
+        'instead of generating source')
+    parser.add_argument('--codegen-report', action='store_true', help='Compare the size ' +
+        'and method count of each described class generated in the unrolled and table codegen ' +
+        'modes instead of generating source')
+    parser.add_argument('--list-size', type=int, default=10, help='Elements in each list ' +
+        'or array for --size-report and --emit-benchmarks, unless its list_sizes setting or ' +
+        'example says otherwise')
+    parser.add_argument('--string-length', type=int, default=16, help='Length of strings ' +
+        'without an example for --size-report and --emit-benchmarks')
     args = parser.parse_args()
     source = args.parcelfile
     destination = args.destination
+    cache = BuildCache(args.cache) if args.cache and destination else None
+    index = args.index or (args.cache and args.cache + ".types")
 
     # If both source and destination are directories, run in
     # fake make mode
-    if (os.path.isdir(source) and os.path.isdir(destination)):
-        for sourcefile in [sourcefile for sourcefile in os.listdir(source) if sourcefile.endswith(".json")]:
-            print "decoding ", sourcefile
-            generate_class(os.path.join(source, sourcefile), destination)
+    status = 0
+    if args.size_report or args.emit_benchmarks or args.codegen_report:
+        if os.path.isdir(source):
+            project = Project(args.config, source, index)
+            names = project.names()
+        else:
+            project = Project(args.config, os.path.dirname(source) or os.curdir, index)
+            names = project.classes_in(os.path.basename(source))
+        if args.size_report:
+            estimator = SizeEstimator(project, args.list_size, args.string_length)
+            status = estimator.report(names)
+        elif args.codegen_report:
+            status = CodegenReport(project).report(names)
+        else:
+            writer = BenchmarkWriter(project, args.list_size, args.string_length)
+            for name in names:
+                print "generated %s" % writer.write(name, args.emit_benchmarks)
+    elif (os.path.isdir(source) and destination and os.path.isdir(destination)):
+        if args.watch:
+            try:
+                watch(source, destination, config=args.config, jobs=args.jobs, cache=cache,
+                      poll=args.poll, index=index)
+            except KeyboardInterrupt:
+                pass
+        else:
+            status = report(batch_generate(source, destination, config=args.config,
+                                           jobs=args.jobs, cache=cache, index=index))
+    elif args.watch:
+        parser.error("--watch requires a source directory and a destination directory")
     else:
-        generate_class(source, destination, config=args.config)
+        generate_class(source, destination, config=args.config, cache=cache, index=index)
+    if cache:
+        cache.save()
+    sys.exit(status)
 